@@ -118,8 +118,8 @@ def main():
     print(f"[완료] 총 {total_updated}건 업체분류 업데이트됨")
     print(f"[백업] {BACKUP_DIR} 폴더에 원본 파일 백업됨")
     print("=" * 60)
-    print("\n다음 단계: SQLite DB를 업데이트하려면 서버를 재시작하세요")
-    print("  python flask_dashboard.py")
+    print("\n다음 단계: 실행 중인 서버가 변경된 파일을 자동으로 감지해 SQLite DB와 캐시를 갱신합니다")
+    print("  (서버가 꺼져 있으면 python flask_dashboard.py 로 시작)")
 
 if __name__ == '__main__':
     main()
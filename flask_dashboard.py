@@ -5,17 +5,22 @@
 - 연도 비교, 검사목적 필터, 업체별 분석, 부적합항목 분석
 - AI 분석 (Google Gemini API)
 """
-from flask import Flask, render_template_string, jsonify, request, redirect, make_response
+from flask import Flask, render_template_string, jsonify, request, redirect, make_response, g
 import os
 import time
 import sqlite3
+import threading
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 import json
 import subprocess
 import secrets
 import hashlib
+import heapq
 from functools import wraps
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from bisect import bisect_left, bisect_right
 
 app = Flask(__name__)
 
@@ -577,49 +582,681 @@ USE_CLAUDE = bool(CLAUDE_API_KEY)  # API 키가 있으면 Claude 사용
 # 경로 설정 - 절대 경로 사용
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"  # 상대 경로로 변경
-CACHE_FILE = BASE_DIR / "data_cache.pkl"  # 파일 캐시 경로
+CACHE_FILE = BASE_DIR / "data_cache.json"  # 파일 캐시 경로 (파일 서명/AI 요약 - 데이터는 컬럼 스냅샷)
 SQLITE_DB = DATA_DIR / "business_data.db"  # SQLite 데이터베이스 경로
 
 # 데이터 캐시 (메모리에 저장)
-DATA_CACHE = {}
-CACHE_TIME = {}
-FILE_MTIME = {}  # 파일 수정 시간 추적
+DATA_CACHE = {}  # 캐시 키 → (로드 당시 데이터 세대, 데이터) - 세대가 바뀔 때까지 유효, 항목/전체 교체는 한 번에
+LOAD_LOCKS = {}  # 캐시 키 → 로드 잠금 (같은 키는 한 요청만 로드하고 나머지는 결과를 기다림)
+LOAD_LOCKS_GUARD = threading.Lock()
+DATA_GENERATIONS = {}  # 캐시 키 → 현재 데이터 세대 (수집/업로드 때만 바뀜, '*'는 메타데이터 없는 키)
+_DB_IDENTITY = None  # 세대 계산 당시 DB 파일 (inode, mtime, size) - 외부 변경 감지용
+FILE_MTIME = {}  # 파일 내용 해시 추적 (연도별 {경로: 해시})
+FILE_SIGNATURES = {}  # 파일 경로 → (mtime, size, 내용 해시) - 같은 파일 재해시 방지
 AI_SUMMARY_CACHE = {}  # AI용 데이터 요약 캐시
+CLIENT_INDEX_CACHE = {}  # (테이블, 연도) → (데이터 세대, 거래처 인덱스)
+AI_SUMMARY_PARTIALS = {}  # 연도 → 원본 파일 → {'signature', 'summary'} (파일별 AI 요약 부분합, 바뀐 파일만 재계산)
+# API 결과 캐시 (직렬화된 JSON 응답, LRU) - 키: 엔드포인트 + 정규화된 쿼리 + 데이터 세대
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_MB', '64')) * 1024 * 1024
+RESULT_CACHE = OrderedDict()  # 키 → JSON 바이트 (앞쪽이 가장 오래 안 쓴 항목)
+RESULT_CACHE_STATS = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+RESULT_CACHE_LOCK = threading.Lock()
+# process_data 집계 엔진 - python: 행 루프, numpy: 공유 컬럼 데이터의 group-by만 numpy (numpy 필요, 결과 동일)
+# check: 두 엔진을 모두 실행해 group-by 결과를 비교 (불일치는 로그, 응답은 python 결과)
+AGGREGATION_ENGINE = os.environ.get('AGGREGATION_ENGINE', 'python').lower()
+# numpy 설치 여부 (시작 시 한 번만 확인 - 없으면 numpy/check 설정이어도 python 실행만 사용, 설정값은 그대로)
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    if AGGREGATION_ENGINE in ('numpy', 'check'):
+        print(f"[ENGINE] numpy 없음 - AGGREGATION_ENGINE={AGGREGATION_ENGINE} 설정이지만 파이썬 루프로 집계")
+# /api/food_item 집계 실행 - auto: 연도가 이미 현재 세대로 캐시되어 있으면 python, 아니면 sql
+# sql: SQLite에서 GROUP BY (연도 행을 메모리에 올리지 않음), python: 행 로드 후 집계
+FOOD_ITEM_ENGINE = os.environ.get('FOOD_ITEM_ENGINE', 'auto').lower()
+# 연도별 데이터셋 공유 스냅샷 (컬럼별 파일을 mmap - 여러 워커 프로세스가 같은 페이지를 읽기 전용으로 공유)
+USE_SHARED_DATASETS = os.environ.get('SHARED_DATASETS', '1') != '0'
+SHARED_DATA_DIR = Path(os.environ.get('SHARED_DATA_DIR', str(DATA_DIR / 'shared')))
 USE_SQLITE = True  # SQLite 사용 여부
+# Excel → SQLite 변환 시 워크북 병렬 파싱 프로세스 수 (1이면 순차 처리) - 요청을 받는 서버 프로세스와
+# CPU를 나눠 쓰므로 기본은 작게 둔다
+INGEST_WORKERS = max(1, int(os.environ.get('INGEST_WORKERS', '2')))
+# Excel → SQLite 변환 시 한 번에 INSERT하는 행 수 (메모리 사용량 상한)
+INGEST_BATCH_SIZE = int(os.environ.get('INGEST_BATCH_SIZE', '5000'))
+# 데이터 폴더 감시 주기(초) - 0이면 감시 안 함 (재시작해야 반영)
+WATCH_INTERVAL = float(os.environ.get('WATCH_INTERVAL', '30'))
+# 마지막 파일 변경 후 이 시간(초) 동안 추가 변경이 없을 때 변환 (복사 중인 파일 제외)
+WATCH_DEBOUNCE = float(os.environ.get('WATCH_DEBOUNCE', '10'))
+INGEST_LOCK = threading.Lock()  # Excel → SQLite 변환은 한 번에 하나만
+# 서버 시작 후 백그라운드 워밍업 상태 (lazy: 워밍업 없이 요청 시 로드)
+# 워밍업 중 요청은 전체 완료가 아니라 같은 캐시 키의 진행 중인 로드만 기다림 (cached_dataset single-flight)
+WARMUP_STATE = {'status': 'lazy', 'step': None, 'completed': [], 'started_at': None, 'finished_at': None,
+                'error': None}
+WARMUP_DONE = threading.Event()
+WARMUP_THREAD = None
+# 워밍업 마지막에 미리 만들어 둘 API 응답 (로그인 없이 열리는 기본 화면 요청)
+WARMUP_PRERENDER = ['/api/data/summary?year=2025', '/api/data/summary?year=2024', '/api/food_item?year=2025']
+
+# SQLite 스키마 버전 (PRAGMA user_version) - 올라가면 init_sqlite_db가 기존 행을 다시 정규화
+SQLITE_SCHEMA_VERSION = 1
+# 영업담당이 비어있을 때 영업담당별 집계/목록에 쓰는 값 - 저장은 ''로 하고, 기준 구현이 '미지정'으로
+# 묶던 곳(검사항목 분석, AI 요약, 손익/수금, 목표 분석)에서만 읽을 때 바꾼다
+DEFAULT_MANAGER = '미지정'
+# 접수일자에서 미리 나눠 저장하는 연/월/일 정수 컬럼 (날짜 없으면 0)
+RECV_DATE_COLUMNS = [('recv_year', 'INTEGER'), ('recv_month', 'INTEGER'), ('recv_day', 'INTEGER')]
+# 수집 시 미리 계산해 저장하는 파생 차원 컬럼 (값 없으면 '', is_urgent는 0/1)
+# - branch/department: MANAGER_TO_BRANCH/MANAGER_TO_DEPARTMENT 매핑 (없으면 '기타')
+# - sido/sigungu: ADDRESS_COLUMNS 중 처음 값이 있는 주소의 extract_region 결과
+# - season: 접수월 기준 계절, is_urgent: 긴급여부가 '일반'이 아닌 값
+DIMENSION_COLUMNS = [('branch', 'TEXT'), ('department', 'TEXT'), ('sido', 'TEXT'), ('sigungu', 'TEXT'),
+                     ('season', 'TEXT'), ('is_urgent', 'INTEGER')]
+# 지역/계절/긴급 파생 규칙 버전 - 규칙(extract_region 등)을 바꾸면 올려서 저장된 차원 전체를 다시 계산
+DIMENSION_RULES_VERSION = 1
+# 집계 큐브 (excel_cube) - process_data가 읽는 차원이 모두 같은 행을 (건수, 공급가액 합계) 한 셀로 묶음
+# 차원을 바꾸면 CUBE_VERSION을 올려서 다시 만든다
+CUBE_VERSION = 1
+CUBE_DIMENSIONS = [('recv_year', 'INTEGER'), ('recv_month', 'INTEGER'), ('recv_day', 'INTEGER'),
+                   ('영업담당', 'TEXT'), ('검사목적', 'TEXT'), ('거래처', 'TEXT'), ('부적합항목', 'TEXT'),
+                   ('검체유형', 'TEXT'), ('시험분야', 'TEXT'), ('업체분류', 'TEXT'),
+                   ('branch', 'TEXT'), ('department', 'TEXT'), ('sido', 'TEXT'), ('sigungu', 'TEXT'),
+                   ('season', 'TEXT'), ('is_urgent', 'INTEGER'),
+                   ('client_address', 'TEXT')]  # ADDRESS_COLUMNS 중 처음 값이 있는 주소
+CUBE_COLUMN_NAMES = [name for name, _ in CUBE_DIMENSIONS] + ['row_count', '공급가액']
+
+# 주소 컬럼 후보 (앞에서부터 처음 값이 있는 컬럼 사용)
+ADDRESS_COLUMNS = ['거래처 주소', '채품지주소', '채품장소', '주소', '시료주소', '업체주소', '거래처주소', '검체주소', '시료채취장소']
+
+# excel_data 컬럼 정의 (컬럼명, SQLite 타입)
+# - process_data, 수금/손익/AI 분석에서 읽는 컬럼을 모두 타입 컬럼으로 저장 (raw_data JSON 없음)
+# - 날짜는 YYYYMMDD 정수 (정렬/범위 조회 가능), 금액은 REAL
+# - 수집 시 정규화: 텍스트는 앞뒤 공백 제거('' = 값 없음, 영업담당 포함), 접수일자 연/월/일 분리
+# - 원본 컬럼(EXCEL_SOURCE_COLUMNS) 뒤에 접수일 분리 컬럼과 파생 차원 컬럼이 붙는다
+EXCEL_SOURCE_COLUMNS = [
+    ('접수번호', 'TEXT'),
+    ('접수일자', 'INTEGER'),
+    ('발행일', 'INTEGER'),
+    ('검체유형', 'TEXT'),
+    ('업체명', 'TEXT'),
+    ('의뢰인명', 'TEXT'),
+    ('거래처', 'TEXT'),
+    ('영업담당', 'TEXT'),
+    ('검사목적', 'TEXT'),
+    ('시험분야', 'TEXT'),
+    ('업체분류', 'TEXT'),
+    ('검사구분', 'TEXT'),
+    ('부적합항목', 'TEXT'),
+    ('긴급여부', 'TEXT'),
+    ('항목명', 'TEXT'),
+    ('결과입력자', 'TEXT'),
+    ('지역', 'TEXT'),
+    ('총금액', 'REAL'),
+    ('공급가액', 'REAL'),
+    ('수수료', 'REAL'),
+    ('입금여부', 'TEXT'),
+    ('입금구분', 'TEXT'),
+    ('입금일', 'INTEGER'),
+] + [(col, 'TEXT') for col in ADDRESS_COLUMNS]
+EXCEL_DATA_COLUMNS = EXCEL_SOURCE_COLUMNS + RECV_DATE_COLUMNS + DIMENSION_COLUMNS
+EXCEL_DATA_COLUMN_NAMES = [name for name, _ in EXCEL_DATA_COLUMNS]
+EXCEL_DATE_COLUMNS = {'접수일자', '발행일', '입금일'}
+# excel_row_to_record 튜플(year, source_file 포함)에서의 컬럼 위치
+_EXCEL_RECORD_INDEX = {name: i + 2 for i, name in enumerate(EXCEL_DATA_COLUMN_NAMES)}
+_REGION_CACHE = {}  # 주소 → (시도, 시군구) - 같은 주소는 한 번만 파싱
+EXCEL_AMOUNT_COLUMNS = {'총금액', '공급가액', '수수료'}
+
+
+def _quote_col(name):
+    """SQLite 컬럼명 인용 (공백 포함 컬럼 대응)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_date_int(value):
+    """날짜 값(datetime/date/문자열)을 YYYYMMDD 정수로 변환 (변환 불가 시 None)"""
+    if value is None or value == '':
+        return None
+    if hasattr(value, 'year') and hasattr(value, 'month'):
+        return value.year * 10000 + value.month * 100 + value.day
+    text = str(value).strip()[:10]
+    for sep in ('-', '/', '.'):
+        if sep in text:
+            parts = text.split(sep)
+            break
+    else:
+        parts = [text[:4], text[4:6], text[6:8]] if len(text) == 8 and text.isdigit() else []
+    try:
+        y, m, d = int(parts[0]), int(parts[1]), int(parts[2][:2])
+        date(y, m, d)
+        return y * 10000 + m * 100 + d
+    except (ValueError, IndexError):
+        return None
 
 
-def init_sqlite_db():
-    """SQLite 데이터베이스 초기화"""
-    import sqlite3
+_DATE_FROM_INT = {}  # YYYYMMDD -> date 객체 (같은 날짜는 객체 공유)
 
-    conn = sqlite3.connect(str(SQLITE_DB))
-    cursor = conn.cursor()
 
-    # 기본 데이터 테이블 (연도별 Excel 데이터)
-    cursor.execute('''
+def _date_from_int(value):
+    """YYYYMMDD 정수를 date 객체로 변환"""
+    if not value:
+        return None
+    result = _DATE_FROM_INT.get(value)
+    if result is None:
+        try:
+            result = date(value // 10000, value // 100 % 100, value % 100)
+        except (TypeError, ValueError):
+            return None
+        _DATE_FROM_INT[value] = result
+    return result
+
+
+def _to_amount(value):
+    """금액 값을 float로 변환 ('1,000원' 같은 문자열 포함)"""
+    if value is None or value == '':
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(',', '').replace('원', '').strip() or 0)
+    except ValueError:
+        return 0.0
+
+
+def _to_text(value):
+    """텍스트 컬럼 값 정규화 (앞뒤 공백 제거, 값 없으면 '')"""
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _split_date_int(value):
+    """YYYYMMDD 정수를 (연, 월, 일) 정수로 분리 (날짜 없으면 0, 0, 0)"""
+    if not value:
+        return (0, 0, 0)
+    return (value // 10000, value // 100 % 100, value % 100)
+
+
+def _season_of(month):
+    """접수월의 계절 (월 없으면 '')"""
+    if not month:
+        return ''
+    return '봄' if month in (3, 4, 5) else '여름' if month in (6, 7, 8) else '가을' if month in (9, 10, 11) else '겨울'
+
+
+def manager_dimensions(manager):
+    """영업담당의 (지사, 부서) - 매핑에 없으면 '기타'"""
+    return MANAGER_TO_BRANCH.get(manager, '기타'), MANAGER_TO_DEPARTMENT.get(manager, '기타')
+
+
+def derive_dimensions(manager, urgent, month, addresses, region_cache=None):
+    """정규화된 값으로 DIMENSION_COLUMNS 순서의 파생 차원 튜플 계산
+
+    addresses는 ADDRESS_COLUMNS 순서의 주소 값, region_cache는 주소 → (시도, 시군구) 메모 dict
+    """
+    address = next((a for a in addresses if a), '')
+    region = region_cache.get(address) if region_cache is not None else None
+    if region is None:
+        sido, sigungu = extract_region(address)
+        region = (sido or '', sigungu or '')
+        if region_cache is not None:
+            region_cache[address] = region
+    return manager_dimensions(manager) + region + (_season_of(month), int(bool(urgent) and urgent != '일반'))
+
+
+def dimension_mapping_fingerprint():
+    """지사/부서 매핑 설정의 지문 (바뀌면 저장된 branch/department를 다시 계산)"""
+    payload = json.dumps([MANAGER_TO_BRANCH, MANAGER_TO_DEPARTMENT], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def excel_row_to_record(year, row_dict, source_file=None):
+    """Excel 행(dict)을 정규화된 excel_data INSERT용 튜플로 변환 (year, source_file + EXCEL_DATA_COLUMNS 순서)"""
+    record = [year, source_file]
+    for name, _ in EXCEL_SOURCE_COLUMNS:
+        value = row_dict.get(name)
+        if name in EXCEL_DATE_COLUMNS:
+            record.append(_to_date_int(value))
+        elif name in EXCEL_AMOUNT_COLUMNS:
+            record.append(_to_amount(value))
+        else:
+            record.append(_to_text(value))
+    recv = _split_date_int(record[_EXCEL_RECORD_INDEX['접수일자']])
+    record.extend(recv)
+    record.extend(derive_dimensions(
+        record[_EXCEL_RECORD_INDEX['영업담당']], record[_EXCEL_RECORD_INDEX['긴급여부']], recv[1],
+        [record[_EXCEL_RECORD_INDEX[col]] for col in ADDRESS_COLUMNS], _REGION_CACHE))
+    return tuple(record)
+
+
+def canonicalize_excel_row(row_dict):
+    """Excel 직접 로드(폴백) 행을 SQLite 로드 행과 같은 컬럼/정규화 값으로 변환 (날짜는 date 객체)"""
+    row = dict(zip(EXCEL_DATA_COLUMN_NAMES, excel_row_to_record(None, row_dict)[2:]))
+    for name in EXCEL_DATE_COLUMNS:
+        row[name] = _date_from_int(row[name])
+    return row
+
+
+EXCEL_DATA_INSERT_SQL = 'INSERT INTO excel_data (year, source_file, {}) VALUES ({})'.format(
+    ', '.join(_quote_col(c) for c in EXCEL_DATA_COLUMN_NAMES),
+    ', '.join('?' for _ in range(len(EXCEL_DATA_COLUMNS) + 2))
+)
+
+# food_item_data 컬럼 정의 (컬럼명, SQLite 타입)
+FOOD_ITEM_COLUMNS = [
+    ('접수일자', 'TEXT'), ('발행일', 'TEXT'), ('검체유형', 'TEXT'), ('업체명', 'TEXT'),
+    ('의뢰인명', 'TEXT'), ('업체주소', 'TEXT'), ('항목명', 'TEXT'), ('규격', 'TEXT'),
+    ('항목담당', 'TEXT'), ('결과입력자', 'TEXT'), ('입력일', 'TEXT'), ('분석일', 'TEXT'),
+    ('항목단위', 'TEXT'), ('시험결과', 'TEXT'), ('시험치', 'TEXT'), ('성적서결과', 'TEXT'),
+    ('판정', 'TEXT'), ('검사목적', 'TEXT'), ('긴급여부', 'TEXT'), ('항목수수료', 'REAL'),
+    ('영업담당', 'TEXT'),
+] + RECV_DATE_COLUMNS
+FOOD_ITEM_COLUMN_NAMES = [name for name, _ in FOOD_ITEM_COLUMNS]
+
+
+def food_item_row_to_record(year, row_dict, source_file=None):
+    """food_item Excel 행(dict)을 정규화된 food_item_data INSERT용 튜플로 변환
+
+    접수일자는 원본 텍스트를 유지하고 연/월/일 정수 컬럼을 따로 채운다.
+    """
+    record = [year, source_file]
+    for name, col_type in FOOD_ITEM_COLUMNS[:-len(RECV_DATE_COLUMNS)]:
+        value = row_dict.get(name)
+        if col_type == 'REAL':
+            record.append(_to_amount(value))
+        else:
+            record.append(_to_text(value))
+    record.extend(_split_date_int(_to_date_int(row_dict.get('접수일자'))))
+    return tuple(record)
+
+
+def canonicalize_food_item_row(row_dict):
+    """food_item Excel 직접 로드(폴백) 행을 SQLite 로드 행과 같은 컬럼/정규화 값으로 변환"""
+    return dict(zip(FOOD_ITEM_COLUMN_NAMES, food_item_row_to_record(None, row_dict)[2:]))
+
+
+FOOD_ITEM_INSERT_SQL = 'INSERT INTO food_item_data (year, source_file, {}) VALUES ({})'.format(
+    ', '.join(FOOD_ITEM_COLUMN_NAMES),
+    ', '.join('?' for _ in range(len(FOOD_ITEM_COLUMNS) + 2))
+)
+
+
+def _create_excel_data_table(cursor):
+    """타입 컬럼 기반 excel_data 테이블 생성"""
+    column_defs = ',\n            '.join(f'{_quote_col(name)} {col_type}' for name, col_type in EXCEL_DATA_COLUMNS)
+    cursor.execute(f'''
         CREATE TABLE IF NOT EXISTS excel_data (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             year TEXT,
-            접수번호 TEXT,
-            접수일자 TEXT,
-            발행일 TEXT,
-            검체유형 TEXT,
-            업체명 TEXT,
-            의뢰인명 TEXT,
-            업체주소 TEXT,
-            영업담당 TEXT,
-            검사목적 TEXT,
-            총금액 REAL,
-            시험분야 TEXT,
-            입금일 TEXT,
-            입금여부 TEXT,
-            검사구분 TEXT,
-            입금구분 TEXT,
-            업체분류 TEXT,
-            raw_data TEXT
+            source_file TEXT,
+            {column_defs}
+        )
+    ''')
+
+
+def _migrate_excel_data_table(cursor):
+    """구 스키마(raw_data JSON / TEXT 날짜) excel_data를 타입 컬럼 스키마로 변환
+
+    Colab에서 업로드된 구 DB도 원본 Excel 없이 그대로 변환된다.
+    """
+    cursor.execute("PRAGMA table_info(excel_data)")
+    info = {col[1]: (col[2] or '').upper() for col in cursor.fetchall()}
+    if not info:
+        _create_excel_data_table(cursor)
+        return False
+    if info.get('접수일자') == 'INTEGER' and 'raw_data' not in info:
+        # 타입 스키마 - 누락된 컬럼만 추가
+        for name, col_type in [('source_file', 'TEXT')] + EXCEL_DATA_COLUMNS:
+            if name not in info:
+                cursor.execute(f'ALTER TABLE excel_data ADD COLUMN {_quote_col(name)} {col_type}')
+                print(f"[SQLITE] excel_data 컬럼 추가: {name}")
+        return False
+
+    print("[SQLITE] excel_data 구 스키마 감지 - 타입 컬럼 스키마로 변환 중...")
+    start_time = time.time()
+    cursor.execute('DROP TABLE IF EXISTS excel_data_legacy')
+    cursor.execute('ALTER TABLE excel_data RENAME TO excel_data_legacy')
+    _create_excel_data_table(cursor)
+
+    legacy_columns = [c for c in info if c not in ('id', 'year', 'source_file', 'raw_data')]
+    select_cols = ['year'] + (['raw_data'] if 'raw_data' in info else []) + legacy_columns
+    read_cursor = cursor.connection.cursor()
+    read_cursor.execute('SELECT {} FROM excel_data_legacy ORDER BY id'.format(
+        ', '.join(_quote_col(c) for c in select_cols)))
+
+    migrated = 0
+    while True:
+        rows = read_cursor.fetchmany(5000)
+        if not rows:
+            break
+        batch = []
+        for row in rows:
+            values = dict(zip(select_cols, row))
+            row_dict = None
+            if values.get('raw_data'):
+                try:
+                    row_dict = json.loads(values['raw_data'])
+                except ValueError:
+                    row_dict = None
+            if row_dict is None:
+                row_dict = {c: values[c] for c in legacy_columns if values[c] not in (None, '', 'None')}
+            batch.append(excel_row_to_record(values['year'], row_dict))
+        cursor.executemany(EXCEL_DATA_INSERT_SQL, batch)
+        migrated += len(batch)
+
+    cursor.execute('DROP TABLE excel_data_legacy')
+    print(f"[SQLITE] excel_data 변환 완료: {migrated:,}건, {time.time() - start_time:.1f}초")
+    return True
+
+
+def _canonicalize_stored_rows(conn):
+    """저장된 excel_data/food_item_data 행을 수집 시 정규화 규칙으로 갱신 (excel_row_to_record와 같은 결과)"""
+    start_time = time.time()
+    conn.create_function('canon_text', 1, _to_text)
+    conn.create_function('canon_amount', 1, _to_amount)
+    conn.create_function('date_int', 1, _to_date_int)
+
+    def assignments(columns, date_expr):
+        parts = []
+        for name, col_type in columns:
+            col = _quote_col(name)
+            if col_type == 'TEXT':
+                parts.append(f'{col} = canon_text({col})')
+            elif col_type == 'REAL':
+                parts.append(f'{col} = canon_amount({col})')
+        parts.append(f'recv_year = COALESCE({date_expr} / 10000, 0)')
+        parts.append(f'recv_month = COALESCE({date_expr} / 100 % 100, 0)')
+        parts.append(f'recv_day = COALESCE({date_expr} % 100, 0)')
+        return ', '.join(parts)
+
+    conn.execute('UPDATE excel_data SET ' + assignments(EXCEL_SOURCE_COLUMNS, '접수일자'))
+    conn.execute('UPDATE food_item_data SET ' + assignments(FOOD_ITEM_COLUMNS, 'date_int(접수일자)'))
+    print(f"[SQLITE] 저장된 행 정규화 완료 ({time.time() - start_time:.1f}초)")
+
+
+def _stored_dimension_state(cursor):
+    """저장된 파생 차원 계산 상태 {'rules': ..., 'mapping': ...} (기록 없으면 빈 dict)"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='dimension_meta'")
+    if not cursor.fetchone():
+        return {}
+    return dict(cursor.execute('SELECT key, value FROM dimension_meta').fetchall())
+
+
+def dimensions_outdated(cursor):
+    """excel_data의 파생 차원이나 집계 큐브가 현재 규칙/매핑/큐브 버전과 다르면 True"""
+    state = _stored_dimension_state(cursor)
+    return (state.get('rules') != str(DIMENSION_RULES_VERSION)
+            or state.get('mapping') != dimension_mapping_fingerprint()
+            or state.get('cube') != str(CUBE_VERSION))
+
+
+def _derive_stored_dimensions(conn):
+    """저장된 excel_data 행의 파생 차원 재계산 (규칙/매핑이 바뀐 경우에만)
+
+    - 규칙 버전이 다르거나 기록이 없으면 (새 컬럼, 업로드된 DB) 모든 차원을 다시 계산
+    - 지사/부서 매핑만 바뀌었으면 branch/department만 영업담당 기준으로 UPDATE
+
+    Returns:
+        다시 계산했으면 True (집계 큐브도 다시 만들어야 함)
+    """
+    cursor = conn.cursor()
+    cursor.execute('CREATE TABLE IF NOT EXISTS dimension_meta (key TEXT PRIMARY KEY, value TEXT)')
+    state = _stored_dimension_state(cursor)
+    mapping = dimension_mapping_fingerprint()
+    start_time = time.time()
+
+    if state.get('rules') != str(DIMENSION_RULES_VERSION):
+        source_cols = ['영업담당', '긴급여부', 'recv_month'] + ADDRESS_COLUMNS
+        read_cursor = conn.cursor()
+        read_cursor.execute('SELECT id, {} FROM excel_data'.format(', '.join(_quote_col(c) for c in source_cols)))
+        update_sql = 'UPDATE excel_data SET {} WHERE id = ?'.format(
+            ', '.join(f'{_quote_col(name)} = ?' for name, _ in DIMENSION_COLUMNS))
+        updated = 0
+        while True:
+            rows = read_cursor.fetchmany(5000)
+            if not rows:
+                break
+            cursor.executemany(update_sql, [
+                derive_dimensions(row[1], row[2], row[3], row[4:], _REGION_CACHE) + (row[0],) for row in rows])
+            updated += len(rows)
+        print(f"[SQLITE] 파생 차원 전체 계산: {updated:,}건, {time.time() - start_time:.1f}초")
+    elif state.get('mapping') != mapping:
+        managers = [row[0] for row in cursor.execute('SELECT DISTINCT 영업담당 FROM excel_data')]
+        cursor.executemany('UPDATE excel_data SET branch = ?, department = ? WHERE 영업담당 IS ?',
+                           [manager_dimensions(m) + (m,) for m in managers])
+        print(f"[SQLITE] 지사/부서 매핑 변경 - branch/department 재계산: 담당자 {len(managers)}명, "
+              f"{time.time() - start_time:.1f}초")
+    else:
+        return False
+
+    cursor.executemany('INSERT OR REPLACE INTO dimension_meta (key, value) VALUES (?, ?)',
+                       [('rules', str(DIMENSION_RULES_VERSION)), ('mapping', mapping)])
+    return True
+
+
+def _create_cube_table(cursor):
+    """집계 큐브 테이블 생성 (파티션 = excel_data의 (year, source_file))"""
+    column_defs = ', '.join(f'{_quote_col(name)} {col_type}' for name, col_type in CUBE_DIMENSIONS)
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS excel_cube (
+            year TEXT,
+            source_file TEXT,
+            first_id INTEGER,
+            {column_defs},
+            row_count INTEGER,
+            공급가액 REAL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cube_source ON excel_cube(year, source_file)')
+
+
+def _refresh_cube(conn, year=None, source_file=None):
+    """excel_data 파티션의 집계 큐브 셀을 다시 만듦 (호출한 쪽 트랜잭션 안에서 실행)
+
+    year가 없으면 전체, source_file이 없으면 연도 전체. 셀은 그룹의 첫 행 id를 기록해
+    원본 행 순서(source_file, id)대로 읽을 수 있다.
+    """
+    where, params = '', ()
+    if year is not None:
+        where, params = 'WHERE year = ?', (year,)
+        if source_file is not None:
+            where, params = 'WHERE year = ? AND source_file = ?', (year, source_file)
+    conn.execute(f'DELETE FROM excel_cube {where}', params)
+
+    address = 'COALESCE({}, \'\')'.format(', '.join(f"NULLIF({_quote_col(c)}, '')" for c in ADDRESS_COLUMNS))
+    group_exprs = [_quote_col(name) for name, _ in CUBE_DIMENSIONS[:-1]] + [address]
+    conn.execute('''
+        INSERT INTO excel_cube (year, source_file, first_id, {columns})
+        SELECT year, source_file, MIN(id), {exprs}, COUNT(*), SUM(공급가액)
+        FROM excel_data {where}
+        GROUP BY year, source_file, {exprs}
+    '''.format(columns=', '.join(_quote_col(c) for c in CUBE_COLUMN_NAMES),
+               exprs=', '.join(group_exprs), where=where), params)
+
+
+def _create_client_index_table(cursor):
+    """거래처 인덱스 테이블 생성 (client_index_meta에 (테이블, 연도)별로 만든 당시 데이터 세대 기록)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS client_index (
+            table_name TEXT,
+            year TEXT,
+            client TEXT,
+            branch TEXT,
+            purpose TEXT,
+            first_month INTEGER,
+            row_count INTEGER,
+            fee REAL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_client_index ON client_index(table_name, year)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS client_index_meta (
+            table_name TEXT,
+            year TEXT,
+            generation TEXT,
+            PRIMARY KEY (table_name, year)
         )
     ''')
 
+
+# 거래처 인덱스 원본: 테이블 → (원본 테이블, 거래처 컬럼, 지사 식, 건수 식, 매출 컬럼)
+CLIENT_INDEX_SOURCES = {
+    'excel_data': ('excel_cube', '거래처', 'branch', 'SUM(row_count)', '공급가액'),
+    'food_item_data': ('food_item_data', '업체명', "''", 'COUNT(*)', '항목수수료'),
+}
+
+
+def _client_index_select(table):
+    """(테이블, 연도)의 거래처 인덱스 집계 SELECT - 거래처/지사/검사목적별 첫 거래월(0: 접수일 없음), 건수, 매출"""
+    source, client_col, branch_expr, count_expr, fee_col = CLIENT_INDEX_SOURCES[table]
+    return f'''
+        SELECT {client_col}, {branch_expr}, 검사목적, COALESCE(MIN(NULLIF(recv_month, 0)), 0),
+               {count_expr}, CAST(SUM({fee_col}) AS REAL)
+        FROM {source} WHERE year = ? AND {client_col} != ''
+        GROUP BY {client_col}, {branch_expr}, 검사목적
+    '''
+
+
+def _refresh_client_index(conn, table, year):
+    """(테이블, 연도)의 거래처 인덱스를 다시 만듦 (수집/업로드 경로에서 INGEST_LOCK을 잡고 호출)"""
+    conn.execute('DELETE FROM client_index WHERE table_name = ? AND year = ?', (table, year))
+    conn.execute(f'''
+        INSERT INTO client_index (table_name, year, client, branch, purpose, first_month, row_count, fee)
+        SELECT ?, ?, * FROM ({_client_index_select(table)})
+    ''', (table, year, year))
+
+
+def build_client_indexes():
+    """세대가 바뀐 모든 (테이블, 연도)의 거래처 인덱스를 DB에 다시 만듦 (호출자가 INGEST_LOCK 보유)
+
+    수집/병합/DB 교체 직후 호출한다. 요청 경로(load_client_index)는 저장된 인덱스를 읽기만 한다.
+    """
+    if not (USE_SQLITE and SQLITE_DB.exists()):
+        return []
+    conn = sqlite3.connect(str(SQLITE_DB))
+    try:
+        _create_client_index_table(conn.cursor())
+        stored = dict(((table, year), generation) for table, year, generation
+                      in conn.execute('SELECT table_name, year, generation FROM client_index_meta'))
+        partitions = conn.execute('''
+            SELECT DISTINCT table_name, year FROM file_metadata
+            WHERE table_name IN ('excel_data', 'food_item_data') ORDER BY table_name, year
+        ''').fetchall()
+        rebuilt = []
+        for table, year in partitions:
+            year = str(year)
+            generation = data_generation(f"food_item_{year}" if table == 'food_item_data' else year)
+            if stored.get((table, year)) == generation:
+                continue
+            _refresh_client_index(conn, table, year)
+            conn.execute('INSERT OR REPLACE INTO client_index_meta (table_name, year, generation) VALUES (?, ?, ?)',
+                         (table, year, generation))
+            rebuilt.append((table, year))
+        conn.commit()
+    finally:
+        conn.close()
+    if rebuilt:
+        print(f"[SQLITE] 거래처 인덱스 생성: {', '.join(f'{table} {year}' for table, year in rebuilt)}")
+    return rebuilt
+
+
+def _earlier_month(current, month):
+    """첫 거래월 갱신 (0은 접수일 없음 - 다른 월이 있으면 그 월)"""
+    return min(current, month) if current and month else current or month
+
+
+def _client_index_from_entries(entries):
+    """(거래처, 지사, 검사목적, 첫 거래월, 건수, 매출) 목록 → 거래처별 인덱스
+
+    {거래처: {'first_month', 'count', 'fee', 'branches': {지사: 첫 거래월}, 'purposes': {목적: 첫 거래월}}}
+    """
+    index = {}
+    for client, branch, purpose, first_month, count, fee in entries:
+        stats = index.get(client)
+        if stats is None:
+            stats = index[client] = {'first_month': 0, 'count': 0, 'fee': 0, 'branches': {}, 'purposes': {}}
+        stats['count'] += count
+        stats['fee'] += fee
+        stats['first_month'] = _earlier_month(stats['first_month'], first_month)
+        if branch:
+            stats['branches'][branch] = _earlier_month(stats['branches'].get(branch, 0), first_month)
+        if purpose:
+            stats['purposes'][purpose] = _earlier_month(stats['purposes'].get(purpose, 0), first_month)
+    return index
+
+
+def load_client_index(table, year):
+    """연도별 거래처 인덱스 (신규/기존/이탈 거래처 판단용) - 데이터 세대가 같으면 메모리 캐시 사용
+
+    SQLite 모드는 수집 시 build_client_indexes가 만든 client_index를 읽기만 하고 (아직 현재 세대로
+    만들어지지 않았으면 원본 테이블에서 같은 집계를 읽음), Excel 직접 로드 모드는 로드된 큐브 셀/food_item 행에서 만든다.
+    """
+    year = str(year)
+    cache_key = f"food_item_{year}" if table == 'food_item_data' else year
+    generation = data_generation(cache_key)
+    cached = CLIENT_INDEX_CACHE.get((table, year))
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    with load_lock(f"client_index_{table}_{year}"):  # 동시에 들어온 요청은 한 번만 조회
+        cached = CLIENT_INDEX_CACHE.get((table, year))
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        index = _read_client_index(table, year, generation)
+        CLIENT_INDEX_CACHE[(table, year)] = (generation, index)
+        return index
+
+
+def _read_client_index(table, year, generation):
+    """거래처 인덱스 조회 (load_client_index가 잠금을 잡고 호출, DB에 쓰지 않음)"""
+    if USE_SQLITE and SQLITE_DB.exists():
+        conn = sqlite3.connect(str(SQLITE_DB))
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='client_index_meta'")
+            stored = cursor.execute('SELECT generation FROM client_index_meta WHERE table_name = ? AND year = ?',
+                                    (table, year)).fetchone() if cursor.fetchone() else None
+            if stored is not None and stored[0] == generation:
+                entries = cursor.execute('''
+                    SELECT client, branch, purpose, first_month, row_count, fee FROM client_index
+                    WHERE table_name = ? AND year = ? ORDER BY client, branch, purpose
+                ''', (table, year)).fetchall()
+            else:
+                # 수집 직후 인덱스가 만들어지기 전 - 원본에서 같은 집계를 읽기만 함
+                entries = cursor.execute(f'{_client_index_select(table)} ORDER BY 1, 2, 3', (year,)).fetchall()
+        finally:
+            conn.close()
+    elif table == 'food_item_data':
+        entries = [(row['업체명'], '', row['검사목적'], row['recv_month'], 1, row['항목수수료'])
+                   for row in load_food_item_data(year) if row['업체명']]
+    else:
+        entries = [(row['거래처'], row['branch'], row['검사목적'], row['recv_month'], row['row_count'], row['공급가액'])
+                   for row in load_excel_cube(year) if row['거래처']]
+
+    return _client_index_from_entries(entries)
+
+
+def build_cube_cells(rows):
+    """정규화된 excel_data 행 목록을 집계 큐브 셀 목록으로 (Excel 직접 로드 모드용, 첫 등장 순서 유지)"""
+    dims = [name for name, _ in CUBE_DIMENSIONS[:-1]]
+    cells = {}
+    for row in rows:
+        key = tuple(row[name] for name in dims) + (next((row[c] for c in ADDRESS_COLUMNS if row[c]), ''),)
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = dict(zip(CUBE_COLUMN_NAMES, key + (0, 0.0)))
+        cell['row_count'] += 1
+        cell['공급가액'] += row['공급가액']
+    return list(cells.values())
+
+
+def init_sqlite_db(db_path=None):
+    """SQLite 데이터베이스 초기화 (db_path: 업로드 검증용 스테이징 파일 등, 기본은 SQLITE_DB)"""
+    import sqlite3
+
+    conn = sqlite3.connect(str(db_path or SQLITE_DB))
+    cursor = conn.cursor()
+
+    # 기본 데이터 테이블 (연도별 Excel 데이터, 구 스키마는 변환)
+    migrated = _migrate_excel_data_table(cursor)
+
     # food_item 데이터 테이블
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS food_item_data (
@@ -649,12 +1286,17 @@ def init_sqlite_db():
         )
     ''')
 
-    # 메타데이터 테이블 (파일 수정 시간 추적)
+    # 메타데이터 테이블 (파일 단위 변환 추적 - 파일 하나가 하나의 변환 단위)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS file_metadata (
             file_path TEXT PRIMARY KEY,
             mtime REAL,
-            row_count INTEGER
+            row_count INTEGER,
+            table_name TEXT,
+            year TEXT,
+            source_file TEXT,
+            size INTEGER,
+            content_hash TEXT
         )
     ''')
 
@@ -688,29 +1330,60 @@ def init_sqlite_db():
         pass
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_token_yearmonth ON token_usage(year_month)')
 
-    # 기존 DB에 새 컬럼 추가 (마이그레이션)
-    new_columns = ['시험분야', '입금일', '입금여부', '검사구분', '입금구분', '업체분류']
-    for col in new_columns:
+    # food_item_data 마이그레이션
+    for col, col_type in FOOD_ITEM_COLUMNS:
         try:
-            cursor.execute(f'ALTER TABLE excel_data ADD COLUMN {col} TEXT')
-            print(f"[SQLITE] excel_data 컬럼 추가: {col}")
+            cursor.execute(f'ALTER TABLE food_item_data ADD COLUMN {col} {col_type}')
+            print(f"[SQLITE] food_item_data 컬럼 추가: {col}")
         except:
             pass  # 이미 존재하면 무시
 
-    # food_item_data 마이그레이션
-    food_item_columns = ['접수일자', '발행일', '검체유형', '업체명', '의뢰인명', '업체주소',
-                         '항목명', '규격', '항목담당', '결과입력자', '입력일', '분석일',
-                         '항목단위', '시험결과', '시험치', '성적서결과', '판정', '검사목적',
-                         '긴급여부', '항목수수료', '영업담당']
-    for col in food_item_columns:
+    # 파일 단위 증분 변환용 컬럼/인덱스 (행별 원본 파일 태그)
+    for table, col, col_type in [('food_item_data', 'source_file', 'TEXT'),
+                                 ('file_metadata', 'table_name', 'TEXT'),
+                                 ('file_metadata', 'year', 'TEXT'),
+                                 ('file_metadata', 'source_file', 'TEXT'),
+                                 ('file_metadata', 'size', 'INTEGER'),
+                                 ('file_metadata', 'content_hash', 'TEXT')]:
         try:
-            col_type = 'REAL' if col == '항목수수료' else 'TEXT'
-            cursor.execute(f'ALTER TABLE food_item_data ADD COLUMN {col} {col_type}')
-            print(f"[SQLITE] food_item_data 컬럼 추가: {col}")
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {col} {col_type}')
+            print(f"[SQLITE] {table} 컬럼 추가: {col}")
         except:
             pass  # 이미 존재하면 무시
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_excel_source ON excel_data(year, source_file)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_food_source ON food_item_data(year, source_file)')
+    # /api/food_item SQL 집계용 복합 인덱스 (필터 WHERE, 필터 전 목록/매핑 조회)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_food_year_filters ON food_item_data(year, 검사목적, 검체유형, 항목명)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_food_year_item ON food_item_data(year, 항목명)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_food_year_manager ON food_item_data(year, 영업담당)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_food_year_analyzer ON food_item_data(year, 결과입력자)')
+
+    # 정규화 이전에 저장된 행 (구 서버/Colab DB) 한 번만 정규화
+    rebuild_cube = migrated
+    if cursor.execute('PRAGMA user_version').fetchone()[0] < SQLITE_SCHEMA_VERSION:
+        _canonicalize_stored_rows(conn)
+        cursor.execute(f'PRAGMA user_version = {SQLITE_SCHEMA_VERSION}')
+        rebuild_cube = True
+
+    # 파생 차원 (지사/부서/지역/계절/긴급) - 규칙이나 매핑 설정이 바뀌었을 때만 다시 계산
+    if _derive_stored_dimensions(conn):
+        rebuild_cube = True
+
+    # 집계 큐브 - 수집 시 파티션별로 갱신, 저장된 행이 바뀌었거나 큐브 버전이 다를 때만 전체 재생성
+    _create_cube_table(cursor)
+    if rebuild_cube or _stored_dimension_state(cursor).get('cube') != str(CUBE_VERSION):
+        start_time = time.time()
+        _refresh_cube(conn)
+        cursor.execute("INSERT OR REPLACE INTO dimension_meta (key, value) VALUES ('cube', ?)", (str(CUBE_VERSION),))
+        print(f"[SQLITE] 집계 큐브 생성 완료 ({time.time() - start_time:.1f}초)")
+
+    # 거래처 인덱스 (연도별 거래처 첫 거래월/건수/매출) - 데이터 세대가 바뀐 (테이블, 연도)만 다시 생성
+    _create_client_index_table(cursor)
 
     conn.commit()
+    if migrated:
+        # raw_data 제거로 비워진 공간 반환
+        conn.execute('VACUUM')
     conn.close()
     print("[SQLITE] 데이터베이스 초기화 완료")
 
@@ -868,7 +1541,7 @@ def get_token_usage_stats():
 
 
 def check_sqlite_needs_update():
-    """SQLite DB 업데이트 필요 여부 확인"""
+    """SQLite DB 업데이트 필요 여부 확인 (읽기만 함 - 갱신은 convert_excel_to_sqlite)"""
     import sqlite3
 
     if not SQLITE_DB.exists():
@@ -892,38 +1565,36 @@ def check_sqlite_needs_update():
                 print(f"[SQLITE] 업데이트 필요: {year}년 food_item_data 비어있음")
                 return True
 
-        # 모든 Excel 파일의 현재 mtime 확인
+        # 모든 Excel 파일 변경 확인 (size+mtime 같으면 통과, 다르면 내용 해시 비교)
         for year in ['2024', '2025']:
             # 기본 데이터
             data_path = DATA_DIR / str(year)
             if data_path.exists():
                 for f in sorted(data_path.glob("*.xlsx")):
-                    file_path = str(f)
-                    current_mtime = f.stat().st_mtime
-
-                    cursor.execute('SELECT mtime FROM file_metadata WHERE file_path = ?', (file_path,))
-                    row = cursor.fetchone()
-
-                    if not row or row[0] < current_mtime:
+                    unchanged, _, stale = _check_file_unchanged(conn, f)
+                    if not unchanged or stale:
                         conn.close()
-                        print(f"[SQLITE] 업데이트 필요: {f.name}")
+                        print(f"[SQLITE] 업데이트 필요: {f.name}" + (" (메타데이터 갱신)" if unchanged else ""))
                         return True
 
             # food_item 데이터
             food_path = DATA_DIR / "food_item" / str(year)
             if food_path.exists():
                 for f in sorted(food_path.glob("*.xlsx")):
-                    file_path = str(f)
-                    current_mtime = f.stat().st_mtime
-
-                    cursor.execute('SELECT mtime FROM file_metadata WHERE file_path = ?', (file_path,))
-                    row = cursor.fetchone()
-
-                    if not row or row[0] < current_mtime:
+                    unchanged, _, stale = _check_file_unchanged(conn, f)
+                    if not unchanged or stale:
                         conn.close()
-                        print(f"[SQLITE] 업데이트 필요: {f.name}")
+                        print(f"[SQLITE] 업데이트 필요: {f.name}" + (" (메타데이터 갱신)" if unchanged else ""))
                         return True
 
+        # 폴더에서 삭제된 파일 확인 (해당 파일의 행 제거 필요, Colab 업로드 파티션 제외)
+        cursor.execute('SELECT file_path, table_name, year FROM file_metadata WHERE table_name IS NOT NULL')
+        for file_path, table, year in cursor.fetchall():
+            if Path(file_path).parent == _data_source_dir(table, year) and not Path(file_path).exists():
+                conn.close()
+                print(f"[SQLITE] 업데이트 필요: {Path(file_path).name} 삭제됨")
+                return True
+
         conn.close()
         return False
 
@@ -932,11 +1603,232 @@ def check_sqlite_needs_update():
         return True
 
 
+def _file_content_hash(path):
+    """파일 내용 SHA-256 해시 (1MB 블록 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_file_signature(f):
+    """(mtime, size, 내용 해시) 반환 - size와 mtime이 기억된 값과 같으면 해시 재계산 생략"""
+    st = f.stat()
+    known = FILE_SIGNATURES.get(str(f))
+    if known and known[0] == st.st_mtime and known[1] == st.st_size:
+        return known
+    signature = (st.st_mtime, st.st_size, _file_content_hash(f))
+    FILE_SIGNATURES[str(f)] = signature
+    return signature
+
+
+def _check_file_unchanged(conn, f):
+    """file_metadata 기준 파일 변경 여부 확인 (읽기만 함)
+
+    size와 mtime이 기록과 같으면 해시 없이 통과하고, 다르면 내용 해시를 비교한다.
+    내용이 같아도 (Drive 복사/재저장으로 mtime만 바뀐 경우) 기록된 mtime/size/해시가 오래됐으면
+    stale로 알려준다 - 갱신은 convert_excel_to_sqlite가 INGEST_LOCK 안에서 한다.
+
+    Returns:
+        (변경 없음 여부, (mtime, size, 내용 해시 또는 None), 메타데이터 갱신 필요 여부)
+    """
+    st = f.stat()
+    row = conn.execute('SELECT mtime, size, content_hash FROM file_metadata WHERE file_path = ?',
+                       (str(f),)).fetchone()
+    if row and row[0] == st.st_mtime and row[1] == st.st_size:
+        return True, (st.st_mtime, st.st_size, row[2]), False
+
+    signature = get_file_signature(f)
+    if not row:
+        return False, signature, False
+    # 해시 기록 전 메타데이터: 기존 mtime 기준으로 최신이면 해시만 채움
+    unchanged = row[2] == signature[2] if row[2] else (row[0] or 0) >= st.st_mtime
+    return unchanged, signature, unchanged
+
+
+def _refresh_file_signature(conn, f, signature):
+    """내용이 같은 파일의 메타데이터 mtime/size/해시만 갱신 (INGEST_LOCK 안에서 호출)"""
+    with conn:
+        conn.execute('UPDATE file_metadata SET mtime = ?, size = ?, content_hash = ? WHERE file_path = ?',
+                     (signature[0], signature[1], signature[2], str(f)))
+
+
+def _data_source_dir(table, year):
+    """테이블별 원본 Excel 폴더"""
+    if table == 'food_item_data':
+        return DATA_DIR / "food_item" / str(year)
+    return DATA_DIR / str(year)
+
+
+def _iter_workbook_chunks(f, table, year, batch_size=None):
+    """Excel 파일을 batch_size 행 단위 레코드 청크로 스트리밍 (파일 크기와 무관한 메모리 사용)"""
+    from openpyxl import load_workbook
+
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    to_record = food_item_row_to_record if table == 'food_item_data' else excel_row_to_record
+    wb = load_workbook(f, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        headers = [cell.value for cell in ws[1]]
+        chunk = []
+        for row_data in ws.iter_rows(min_row=2, values_only=True):
+            chunk.append(to_record(year, dict(zip(headers, row_data)), f.name))
+            if len(chunk) >= batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        wb.close()
+
+
+def _spill_workbook_chunks(f, table, year, spill_dir):
+    """워커 프로세스: 워크북을 청크 단위로 임시 파일에 기록하고 경로 반환"""
+    import pickle
+    import tempfile
+
+    fd, spill_path = tempfile.mkstemp(dir=spill_dir, suffix='.chunks')
+    with os.fdopen(fd, 'wb') as out:
+        for chunk in _iter_workbook_chunks(f, table, year):
+            pickle.dump(chunk, out, protocol=pickle.HIGHEST_PROTOCOL)
+    return spill_path
+
+
+def _iter_spill_chunks(spill_path):
+    """워커가 기록한 임시 파일에서 청크를 하나씩 읽기 (읽은 뒤 삭제)"""
+    import pickle
+
+    try:
+        with open(spill_path, 'rb') as spill:
+            while True:
+                try:
+                    yield pickle.load(spill)
+                except EOFError:
+                    break
+    finally:
+        os.remove(spill_path)
+
+
+def _write_chunks(conn, table, chunks):
+    """레코드 청크를 순서대로 INSERT하고 행 수 반환"""
+    insert_sql = FOOD_ITEM_INSERT_SQL if table == 'food_item_data' else EXCEL_DATA_INSERT_SQL
+    count = 0
+    for chunk in chunks:
+        conn.executemany(insert_sql, chunk)
+        count += len(chunk)
+    return count
+
+
+def _save_file_metadata(conn, table, year, f, signature, row_count):
+    """파일 단위 메타데이터 저장 (signature: 변환 전에 잰 (mtime, size, 내용 해시))"""
+    mtime, size, content_hash = signature
+    conn.execute('''
+        INSERT OR REPLACE INTO file_metadata (file_path, mtime, row_count, table_name, year, source_file, size, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (str(f), mtime, row_count, table, year, f.name, size, content_hash))
+
+
+def _parse_workbooks(jobs, workers=None):
+    """(파일, 테이블, 연도) 작업을 파싱해 (파일, 레코드 청크 iterator, 오류)를 작업 순서대로 반환
+
+    workers가 2 이상이면 프로세스 풀에서 병렬 파싱하고(청크는 임시 파일로 전달),
+    쓰기는 호출한 프로세스 한 곳에서 한다. 결과 순서는 항상 jobs 순서와 같다 (행 순서 결정적).
+    워커는 spawn으로 시작한다 - 감시/요청 스레드가 도는 서버 프로세스를 fork하면 다른 스레드가 잡고 있던
+    락(로그, SQLite 등)이 자식에서 풀리지 않을 수 있다.
+    각 청크 iterator는 다음 결과를 받기 전에 끝까지 소비해야 한다.
+    """
+    workers = INGEST_WORKERS if workers is None else workers
+    if workers <= 1 or len(jobs) <= 1:
+        for f, table, year in jobs:
+            yield f, _iter_workbook_chunks(f, table, year), None
+        return
+
+    import multiprocessing
+    import shutil
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"[SQLITE] 워크북 {len(jobs)}개 병렬 파싱 (프로세스 {min(workers, len(jobs))}개)")
+    spill_dir = tempfile.mkdtemp(prefix='ingest_')
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(_spill_workbook_chunks, f, table, year, spill_dir) for f, table, year in jobs]
+            for (f, table, year), future in zip(jobs, futures):
+                try:
+                    spill_path = future.result()
+                except Exception as e:
+                    yield f, None, e
+                    continue
+                yield f, _iter_spill_chunks(spill_path), None
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def _ingest_file(conn, table, year, f, signature, chunks):
+    """파일 하나의 행만 교체 (한 트랜잭션 - 읽는 쪽은 이전/이후 상태만 본다)
+
+    청크 단위로 INSERT하므로 파이썬 메모리는 INGEST_BATCH_SIZE 행 이내로 유지되고,
+    커밋은 파일 경계에서 한다.
+    """
+    with conn:
+        conn.execute(f'DELETE FROM {table} WHERE year = ? AND source_file = ?', (year, f.name))
+        count = _write_chunks(conn, table, chunks)
+        _save_file_metadata(conn, table, year, f, signature, count)
+        if table == 'excel_data':
+            _refresh_cube(conn, year, f.name)
+    return count
+
+
+def _rebuild_year(conn, table, year, parsed):
+    """파일 태그가 없는 구 데이터가 있는 연도를 한 트랜잭션으로 전체 교체
+
+    Args:
+        parsed: (파일, (mtime, size, 해시), 레코드 청크 iterator, 오류) 목록 - 오류 난 파일은 SAVEPOINT로 건너뜀
+    """
+    total = 0
+    with conn:
+        conn.execute(f'DELETE FROM {table} WHERE year = ?', (year,))
+        for f, signature, chunks, error in parsed:
+            if error is not None:
+                print(f"[SQLITE ERROR] {f.name}: {error}")
+                continue
+            file_start = time.time()
+            conn.execute('SAVEPOINT ingest_file')
+            try:
+                count = _write_chunks(conn, table, chunks)
+                _save_file_metadata(conn, table, year, f, signature, count)
+            except Exception as e:
+                conn.execute('ROLLBACK TO ingest_file')
+                conn.execute('RELEASE ingest_file')
+                print(f"[SQLITE ERROR] {f.name}: {e}")
+                continue
+            conn.execute('RELEASE ingest_file')
+            total += count
+            print(f"[SQLITE] {f.name}: {count}건 변환 ({_rows_per_sec(count, file_start)})")
+        if table == 'excel_data':
+            _refresh_cube(conn, year)
+    return total
+
+
+def _rows_per_sec(count, start_time):
+    """처리 속도 문자열"""
+    elapsed = time.time() - start_time
+    return f"{count / elapsed:,.0f}행/초" if elapsed > 0 else "-"
+
+
 def convert_excel_to_sqlite():
-    """Excel 파일을 SQLite로 변환"""
+    """Excel 파일을 SQLite로 변환 (파일 단위 증분, INGEST_LOCK을 잡은 상태에서 호출)
+
+    변경/신규 파일의 행만 파일별 트랜잭션으로 교체하고, 삭제된 파일의 행은 제거한다.
+    내용은 같고 mtime/size만 바뀐 파일은 메타데이터만 갱신한다.
+
+    Returns:
+        변경된 (테이블, 연도) 목록
+    """
     import sqlite3
     import time
-    from openpyxl import load_workbook
 
     print("[SQLITE] Excel → SQLite 변환 시작...")
     start_time = time.time()
@@ -946,233 +1838,164 @@ def convert_excel_to_sqlite():
     cursor = conn.cursor()
 
     total_records = 0
+    changed = set()
+    plan = []  # (모드, 테이블, 연도, [(파일, (mtime, size, 해시))]) - 모드: 'rebuild' 또는 'file'
 
+    # 1단계: 변경 파일 확인 (삭제된 파일의 행은 바로 제거)
     for year in ['2024', '2025']:
-        # 기본 데이터 변환
-        data_path = DATA_DIR / str(year)
-        if data_path.exists():
-            # 해당 연도 데이터가 비어있는지 확인
-            cursor.execute('SELECT COUNT(*) FROM excel_data WHERE year = ?', (year,))
-            existing_count = cursor.fetchone()[0]
-            force_convert = existing_count == 0
+        for table in ('excel_data', 'food_item_data'):
+            label = 'food_item ' if table == 'food_item_data' else ''
+            data_path = _data_source_dir(table, year)
+            files = sorted(data_path.glob("*.xlsx")) if data_path.exists() else []
+
+            # 폴더에서 사라진 파일의 행 제거
+            current_paths = {str(f) for f in files}
+            cursor.execute('SELECT file_path, source_file FROM file_metadata WHERE table_name = ? AND year = ?',
+                           (table, year))
+            for file_path, source_file in cursor.fetchall():
+                # Colab에서 업로드된 파티션은 로컬 폴더와 무관하므로 유지
+                if Path(file_path).parent == data_path and file_path not in current_paths:
+                    with conn:
+                        conn.execute(f'DELETE FROM {table} WHERE year = ? AND source_file = ?', (year, source_file))
+                        conn.execute('DELETE FROM file_metadata WHERE file_path = ?', (file_path,))
+                        if table == 'excel_data':
+                            _refresh_cube(conn, year, source_file)
+                    changed.add((table, year))
+                    print(f"[SQLITE] {label}{source_file} 삭제됨 - 행 제거")
+
+            if not files:
+                continue
+
+            # 파일 태그가 없는 구 데이터(연도 전체 변환분)는 한 번만 연도 전체 재변환
+            cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE year = ? AND source_file IS NULL', (year,))
+            if cursor.fetchone()[0] > 0:
+                print(f"[SQLITE] {label}{year}년 파일 태그 없는 데이터 - 연도 전체 재변환")
+                plan.append(('rebuild', table, year, [(f, get_file_signature(f)) for f in files]))
+                continue
 
+            # 해당 연도 데이터가 비어있으면 모든 파일 변환
+            cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE year = ?', (year,))
+            force_convert = cursor.fetchone()[0] == 0
             if force_convert:
-                print(f"[SQLITE] {year}년 excel_data 비어있음 - 강제 변환")
-
-            # 먼저 변환이 필요한 파일 목록 확인
-            files_to_convert = []
-            for f in sorted(data_path.glob("*.xlsx")):
-                file_path = str(f)
-                current_mtime = f.stat().st_mtime
-
-                # 강제 변환 모드가 아닐 때만 스킵 체크
-                if not force_convert:
-                    cursor.execute('SELECT mtime FROM file_metadata WHERE file_path = ?', (file_path,))
-                    row = cursor.fetchone()
-                    if row and row[0] >= current_mtime:
-                        print(f"[SQLITE] {f.name} 스킵 (이미 최신)")
+                print(f"[SQLITE] {year}년 {table} 비어있음 - 강제 변환")
+
+            for f in files:
+                # 강제 변환 모드가 아닐 때만 스킵 체크 (size+mtime → 내용 해시)
+                if force_convert:
+                    signature = get_file_signature(f)
+                else:
+                    unchanged, signature, stale = _check_file_unchanged(conn, f)
+                    if unchanged:
+                        if stale:
+                            _refresh_file_signature(conn, f, signature)
+                        print(f"[SQLITE] {label}{f.name} 스킵 (내용 변경 없음)")
                         continue
-                files_to_convert.append((f, file_path, current_mtime))
+                plan.append(('file', table, year, [(f, signature)]))
+
+    # 2단계: 워크북 파싱 (병렬) → 이 프로세스에서 계획 순서대로 기록
+    results = _parse_workbooks([(f, table, year) for _, table, year, files in plan for f, _ in files])
+    for mode, table, year, files in plan:
+        label = 'food_item ' if table == 'food_item_data' else ''
+        parsed = []
+        for f, signature in files:
+            _, chunks, error = next(results)
+            parsed.append((f, signature, chunks, error))
+
+        if mode == 'rebuild':
+            total_records += _rebuild_year(conn, table, year, parsed)
+            changed.add((table, year))
+            continue
 
-            # 변환할 파일이 있으면 해당 연도 데이터 전체 삭제 후 재로드
-            if files_to_convert:
-                cursor.execute('DELETE FROM excel_data WHERE year = ?', (year,))
-                print(f"[SQLITE] {year}년 데이터 삭제 후 전체 재변환")
+        f, signature, chunks, error = parsed[0]
+        if error is not None:
+            print(f"[SQLITE ERROR] {label}{f.name}: {error}")
+            continue
+        file_start = time.time()
+        try:
+            count = _ingest_file(conn, table, year, f, signature, chunks)
+        except Exception as e:
+            print(f"[SQLITE ERROR] {label}{f.name}: {e}")
+            continue
+        total_records += count
+        changed.add((table, year))
+        print(f"[SQLITE] {label}{f.name}: {count}건 변환 ({_rows_per_sec(count, file_start)})")
 
-                # 모든 파일 처리 (변환 필요 여부와 관계없이 전체 로드)
-                for f in sorted(data_path.glob("*.xlsx")):
-                    file_path = str(f)
-                    current_mtime = f.stat().st_mtime
-
-                    try:
-                        wb = load_workbook(f, read_only=True, data_only=True)
-                        ws = wb.active
-                        headers = [cell.value for cell in ws[1]]
-
-                        batch = []
-                        for row_data in ws.iter_rows(min_row=2, values_only=True):
-                            row_dict = dict(zip(headers, row_data))
-                            batch.append((
-                                year,
-                                str(row_dict.get('접수번호', '')),
-                                str(row_dict.get('접수일자', '')),
-                                str(row_dict.get('발행일', '')),
-                                str(row_dict.get('검체유형', '')),
-                                str(row_dict.get('업체명', '')),
-                                str(row_dict.get('의뢰인명', '')),
-                                str(row_dict.get('업체주소', '')),
-                                str(row_dict.get('영업담당', '')),
-                                str(row_dict.get('검사목적', '')),
-                                float(row_dict.get('총금액', 0) or 0),
-                                str(row_dict.get('시험분야', '')),
-                                str(row_dict.get('입금일', '')),
-                                str(row_dict.get('입금여부', '')),
-                                str(row_dict.get('검사구분', '')),
-                                str(row_dict.get('입금구분', '')),
-                                str(row_dict.get('업체분류', '')),
-                                json.dumps(row_dict, ensure_ascii=False, default=str)
-                            ))
-
-                        cursor.executemany('''
-                            INSERT INTO excel_data
-                            (year, 접수번호, 접수일자, 발행일, 검체유형, 업체명, 의뢰인명, 업체주소, 영업담당, 검사목적, 총금액, 시험분야, 입금일, 입금여부, 검사구분, 입금구분, 업체분류, raw_data)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', batch)
-
-                        # 메타데이터 업데이트
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO file_metadata (file_path, mtime, row_count)
-                            VALUES (?, ?, ?)
-                        ''', (file_path, current_mtime, len(batch)))
-
-                        wb.close()
-                        total_records += len(batch)
-                        print(f"[SQLITE] {f.name}: {len(batch)}건 변환")
-
-                    except Exception as e:
-                        print(f"[SQLITE ERROR] {f.name}: {e}")
-
-        # food_item 데이터 변환
-        food_path = DATA_DIR / "food_item" / str(year)
-        if food_path.exists():
-            # 해당 연도 데이터가 비어있는지 확인
-            cursor.execute('SELECT COUNT(*) FROM food_item_data WHERE year = ?', (year,))
-            existing_count = cursor.fetchone()[0]
-            force_convert = existing_count == 0
+    conn.close()
 
-            if force_convert:
-                print(f"[SQLITE] {year}년 food_item_data 비어있음 - 강제 변환")
-
-            # 변환이 필요한 파일 목록 수집
-            files_to_convert = []
-            for f in sorted(food_path.glob("*.xlsx")):
-                file_path = str(f)
-                current_mtime = f.stat().st_mtime
-
-                # 강제 변환 모드가 아닐 때만 스킵 체크
-                if not force_convert:
-                    cursor.execute('SELECT mtime FROM file_metadata WHERE file_path = ?', (file_path,))
-                    row = cursor.fetchone()
-                    if row and row[0] >= current_mtime:
-                        print(f"[SQLITE] food_item {f.name} 스킵 (이미 최신)")
-                        continue
-                files_to_convert.append((f, file_path, current_mtime))
+    elapsed = time.time() - start_time
+    print(f"[SQLITE] 변환 완료! 총 {total_records:,}건, {elapsed:.1f}초 소요 ({_rows_per_sec(total_records, start_time)})")
+    return sorted(changed)
 
-            # 변환할 파일이 있으면 해당 연도 데이터 삭제 후 전체 재로드
-            if files_to_convert:
-                cursor.execute('DELETE FROM food_item_data WHERE year = ?', (year,))
-                print(f"[SQLITE] food_item {year}년 데이터 삭제 후 재변환")
 
-                # 모든 파일 처리 (변환 필요 여부와 관계없이 전체 로드)
-                for f in sorted(food_path.glob("*.xlsx")):
-                    file_path = str(f)
-                    current_mtime = f.stat().st_mtime
-
-                    try:
-                        wb = load_workbook(f, read_only=True, data_only=True)
-                        ws = wb.active
-                        headers = [cell.value for cell in ws[1]]
-
-                        required_columns = ['접수일자', '발행일', '검체유형', '업체명', '의뢰인명', '업체주소',
-                                           '항목명', '규격', '항목담당', '결과입력자', '입력일', '분석일',
-                                           '항목단위', '시험결과', '시험치', '성적서결과', '판정', '검사목적',
-                                           '긴급여부', '항목수수료', '영업담당']
-
-                        col_indices = {}
-                        for i, h in enumerate(headers):
-                            if h in required_columns:
-                                col_indices[h] = i
-
-                        batch = []
-                        for row_data in ws.iter_rows(min_row=2, values_only=True):
-                            row_dict = {}
-                            for col_name, idx in col_indices.items():
-                                row_dict[col_name] = row_data[idx] if idx < len(row_data) else None
-
-                            batch.append((
-                                year,
-                                str(row_dict.get('접수일자', '') or ''),
-                                str(row_dict.get('발행일', '') or ''),
-                                str(row_dict.get('검체유형', '') or ''),
-                                str(row_dict.get('업체명', '') or ''),
-                                str(row_dict.get('의뢰인명', '') or ''),
-                                str(row_dict.get('업체주소', '') or ''),
-                                str(row_dict.get('항목명', '') or ''),
-                                str(row_dict.get('규격', '') or ''),
-                                str(row_dict.get('항목담당', '') or ''),
-                                str(row_dict.get('결과입력자', '') or ''),
-                                str(row_dict.get('입력일', '') or ''),
-                                str(row_dict.get('분석일', '') or ''),
-                                str(row_dict.get('항목단위', '') or ''),
-                                str(row_dict.get('시험결과', '') or ''),
-                                str(row_dict.get('시험치', '') or ''),
-                                str(row_dict.get('성적서결과', '') or ''),
-                                str(row_dict.get('판정', '') or ''),
-                                str(row_dict.get('검사목적', '') or ''),
-                                str(row_dict.get('긴급여부', '') or ''),
-                                float(row_dict.get('항목수수료', 0) or 0),
-                                str(row_dict.get('영업담당', '') or '')
-                            ))
-
-                        cursor.executemany('''
-                            INSERT INTO food_item_data
-                            (year, 접수일자, 발행일, 검체유형, 업체명, 의뢰인명, 업체주소, 항목명, 규격,
-                             항목담당, 결과입력자, 입력일, 분석일, 항목단위, 시험결과, 시험치, 성적서결과,
-                             판정, 검사목적, 긴급여부, 항목수수료, 영업담당)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', batch)
-
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO file_metadata (file_path, mtime, row_count)
-                            VALUES (?, ?, ?)
-                        ''', (file_path, current_mtime, len(batch)))
-
-                        wb.close()
-                        total_records += len(batch)
-                        print(f"[SQLITE] food_item {f.name}: {len(batch)}건 변환")
-
-                    except Exception as e:
-                        print(f"[SQLITE ERROR] food_item {f.name}: {e}")
+def _excel_schema_outdated(cursor):
+    """excel_data가 구 스키마/정규화 이전이거나 파생 차원·집계 큐브가 오래됐으면 True (init_sqlite_db 필요)"""
+    cursor.execute("PRAGMA table_info(excel_data)")
+    types = {col[1]: (col[2] or '').upper() for col in cursor.fetchall()}
+    schema_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+    return (types.get('접수일자') != 'INTEGER' or 'raw_data' in types or schema_version < SQLITE_SCHEMA_VERSION
+            or dimensions_outdated(cursor))
 
-    conn.commit()
-    conn.close()
 
-    elapsed = time.time() - start_time
-    print(f"[SQLITE] 변환 완료! 총 {total_records:,}건, {elapsed:.1f}초 소요")
+def _require_current_schema(cursor, table='excel_data'):
+    """요청 경로 로더용 스키마 확인 - 변환 전 DB면 sqlite3.DatabaseError (로더는 DB를 바꾸지 않음)"""
+    if table == 'excel_data':
+        outdated = _excel_schema_outdated(cursor)
+    else:
+        outdated = cursor.execute('PRAGMA user_version').fetchone()[0] < SQLITE_SCHEMA_VERSION
+    if outdated:
+        raise sqlite3.DatabaseError(f"{table}가 변환 전 스키마입니다 - 서버 시작(워밍업) 시 migrate_sqlite_schema()로 변환 필요")
+
+
+def migrate_sqlite_schema():
+    """구 스키마/정규화 이전 DB를 현재 스키마로 변환 (INGEST_LOCK을 잡은 상태에서 호출 - 시작 시/DB 외부 교체 시)
+
+    테이블 재작성, raw_data 제거, VACUUM까지 할 수 있으므로 요청 경로에서는 부르지 않는다.
+
+    Returns:
+        변환했으면 True
+    """
+    if not SQLITE_DB.exists():
+        return False
+    conn = sqlite3.connect(str(SQLITE_DB))
+    try:
+        outdated = _excel_schema_outdated(conn.cursor())
+    finally:
+        conn.close()
+    if not outdated:
+        return False
+    print("[SQLITE] 변환 전 스키마 DB 감지 - 스키마 변환 시작...")
+    init_sqlite_db()
+    return True
 
 
 def load_excel_data_sqlite(year):
-    """SQLite에서 데이터 로드 (빠름) - Colab DB 호환"""
+    """SQLite에서 데이터 로드 (빠름) - 타입 컬럼에서 직접 행 구성 (JSON 디코딩 없음)"""
     import sqlite3
     import time
 
     start_time = time.time()
 
     conn = sqlite3.connect(str(SQLITE_DB))
-    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
-    # 테이블 컬럼 확인
-    cursor.execute("PRAGMA table_info(excel_data)")
-    columns = [col[1] for col in cursor.fetchall()]
+    # 테이블 컬럼 확인 (구 스키마/Colab DB는 시작 시 migrate_sqlite_schema에서 변환 - 여기서는 읽기만)
+    try:
+        _require_current_schema(cursor)
+    except sqlite3.DatabaseError:
+        conn.close()
+        raise
 
-    data = []
+    columns = EXCEL_DATA_COLUMN_NAMES
+    date_indices = [i for i, c in enumerate(columns) if c in EXCEL_DATE_COLUMNS]
+    cursor.execute('SELECT {} FROM excel_data WHERE year = ? ORDER BY source_file, id'.format(
+        ', '.join(_quote_col(c) for c in columns)), (str(year),))
 
-    # raw_data 컬럼이 있으면 기존 방식 (JSON 파싱)
-    if 'raw_data' in columns:
-        cursor.execute('SELECT raw_data FROM excel_data WHERE year = ?', (str(year),))
-        rows = cursor.fetchall()
-        for row in rows:
-            try:
-                if row[0]:
-                    data.append(json.loads(row[0]))
-            except:
-                pass
-    else:
-        # Colab DB 방식: 컬럼에서 직접 로드
-        cursor.execute('SELECT * FROM excel_data WHERE year = ?', (str(year),))
-        rows = cursor.fetchall()
-        data = [dict(row) for row in rows]
+    data = []
+    for record in cursor:
+        record = list(record)
+        for i in date_indices:
+            record[i] = _date_from_int(record[i])
+        data.append(dict(zip(columns, record)))
 
     conn.close()
 
@@ -1182,7 +2005,29 @@ def load_excel_data_sqlite(year):
     return data
 
 
-def load_food_item_data_sqlite(year):
+def load_excel_cube_sqlite(year):
+    """SQLite에서 연도별 집계 큐브 셀 로드 (원본 행 순서대로)"""
+    start_time = time.time()
+
+    conn = sqlite3.connect(str(SQLITE_DB))
+    cursor = conn.cursor()
+    try:
+        _require_current_schema(cursor)
+    except sqlite3.DatabaseError:
+        conn.close()
+        raise
+
+    cursor.execute('SELECT {} FROM excel_cube WHERE year = ? ORDER BY source_file, first_id'.format(
+        ', '.join(_quote_col(c) for c in CUBE_COLUMN_NAMES)), (str(year),))
+    cells = [dict(zip(CUBE_COLUMN_NAMES, record)) for record in cursor]
+    conn.close()
+
+    print(f"[SQLITE] {year}년 집계 큐브 로드: {len(cells):,}셀 ({sum(c['row_count'] for c in cells):,}건), "
+          f"{time.time() - start_time:.2f}초")
+    return cells
+
+
+def load_food_item_data_sqlite(year):
     """SQLite에서 food_item 데이터 로드 (빠름) - Colab DB 호환"""
     import sqlite3
     import time
@@ -1200,8 +2045,17 @@ def load_food_item_data_sqlite(year):
         print(f"[SQLITE] food_item_data 테이블 없음")
         return []
 
-    # Colab DB 호환: 모든 컬럼 로드
-    cursor.execute('SELECT * FROM food_item_data WHERE year = ?', (str(year),))
+    # 정규화 이전 DB(구 서버/Colab)는 시작 시 변환 - 여기서는 읽기만
+    try:
+        _require_current_schema(cursor, 'food_item_data')
+    except sqlite3.DatabaseError:
+        conn.close()
+        raise
+
+    # Colab DB 호환: 모든 컬럼 로드 (원본 파일 순서 유지)
+    cursor.execute("PRAGMA table_info(food_item_data)")
+    order_by = 'source_file, id' if 'source_file' in [col[1] for col in cursor.fetchall()] else 'id'
+    cursor.execute(f'SELECT * FROM food_item_data WHERE year = ? ORDER BY {order_by}', (str(year),))
 
     rows = cursor.fetchall()
     data = [dict(row) for row in rows]
@@ -1214,82 +2068,76 @@ def load_food_item_data_sqlite(year):
     return data
 
 
-def get_data_files_mtime():
-    """모든 데이터 파일의 최신 수정 시간 반환"""
-    latest_mtime = 0
+def _iter_data_files():
+    """모든 원본 Excel 파일 (기본 데이터 + food_item)"""
     for year in ['2024', '2025']:
-        data_path = DATA_DIR / str(year)
-        if data_path.exists():
-            for f in data_path.glob("*.xlsx"):
-                mtime = f.stat().st_mtime
-                if mtime > latest_mtime:
-                    latest_mtime = mtime
-        food_path = DATA_DIR / "food_item" / str(year)
-        if food_path.exists():
-            for f in food_path.glob("*.xlsx"):
-                mtime = f.stat().st_mtime
-                if mtime > latest_mtime:
-                    latest_mtime = mtime
-    return latest_mtime
+        for data_path in (DATA_DIR / str(year), DATA_DIR / "food_item" / str(year)):
+            if data_path.exists():
+                yield from sorted(data_path.glob("*.xlsx"))
 
 
 def load_cache_from_file():
-    """파일에서 캐시 로드 (서버 시작 시)"""
-    global DATA_CACHE, CACHE_TIME, FILE_MTIME, AI_SUMMARY_CACHE
-    import pickle
+    """파일에서 캐시 로드 (서버 시작 시)
+
+    데이터 행은 세대별 컬럼 스냅샷(SHARED_DATA_DIR)을 mmap만 하고 (컬럼은 처음 읽을 때 매핑),
+    CACHE_FILE에는 파일 서명/AI 요약(파일별 부분합)처럼 작은 상태만 둔다. 현재 세대의 스냅샷이 모두 있어야 True.
+    """
+    global FILE_MTIME, AI_SUMMARY_CACHE, AI_SUMMARY_PARTIALS
 
     if not CACHE_FILE.exists():
         print("[CACHE] 캐시 파일 없음 - 새로 생성 필요")
         return False
 
     try:
-        # 데이터 파일 수정 시간 확인
-        current_mtime = get_data_files_mtime()
-        cache_mtime = CACHE_FILE.stat().st_mtime
-
-        # 캐시가 데이터보다 오래된 경우 무효화
-        if current_mtime > cache_mtime:
-            print(f"[CACHE] 데이터 파일이 캐시보다 최신 - 다시 로드 필요")
-            return False
-
-        with open(CACHE_FILE, 'rb') as f:
-            cached = pickle.load(f)
+        with open(CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
 
-        DATA_CACHE = cached.get('DATA_CACHE', {})
-        CACHE_TIME = cached.get('CACHE_TIME', {})
+        # 파일 서명을 먼저 복원해야 size+mtime이 같은 파일의 내용 해시를 다시 계산하지 않음
+        FILE_SIGNATURES.update((path, tuple(sig)) for path, sig in cached.get('FILE_SIGNATURES', {}).items())
         FILE_MTIME = cached.get('FILE_MTIME', {})
         AI_SUMMARY_CACHE = cached.get('AI_SUMMARY_CACHE', {})
-
-        # 캐시 시간 업데이트 (현재 시간 기준으로)
-        import time
-        current_time = time.time()
-        for key in CACHE_TIME:
-            CACHE_TIME[key] = current_time
-
-        total_records = sum(len(v) for v in DATA_CACHE.values() if isinstance(v, list))
-        print(f"[CACHE] 파일에서 캐시 로드 완료 ({total_records:,}건)")
-        return True
-
-    except Exception as e:
+        AI_SUMMARY_PARTIALS = cached.get('AI_SUMMARY_PARTIALS', {})  # 서명이 같은 파일만 재사용됨
+        for year in ('2024', '2025'):  # JSON 키는 문자열 - 접수월 정수 키 복원
+            monthly = AI_SUMMARY_CACHE.get('ai_summary', {}).get(year, {}).get('monthly')
+            if monthly:
+                AI_SUMMARY_CACHE['ai_summary'][year]['monthly'] = {int(m): v for m, v in monthly.items()}
+        update_data_generations()
+    except (OSError, ValueError, TypeError, AttributeError) as e:
         print(f"[CACHE] 파일 캐시 로드 실패: {e}")
         return False
 
+    if not USE_SHARED_DATASETS:
+        return False
+    loaders = {}
+    for year in ('2024', '2025'):
+        loaders[year] = lambda year=year: load_excel_data(year)
+        loaders[f"food_item_{year}"] = lambda year=year: load_food_item_data(year)
+    missing = [cache_key for cache_key in loaders
+               if not (SHARED_DATA_DIR / f"{cache_key}-{data_generation(cache_key)}" / 'meta.json').exists()]
+    if missing:
+        print(f"[CACHE] 스냅샷 없음 (데이터 변경): {', '.join(missing)} - 다시 로드 필요")
+        return False
 
-def save_cache_to_file():
-    """캐시를 파일로 저장"""
-    import pickle
+    total_records = sum(len(load()) for load in loaders.values())
+    print(f"[CACHE] 컬럼 스냅샷 매핑 완료 ({total_records:,}건)")
+    return True
 
+
+def save_cache_to_file():
+    """캐시 상태(파일 서명, AI 요약/파일별 부분합)를 파일로 저장 - 데이터 행은 로드 시 이미 스냅샷으로 기록됨"""
     try:
         cached = {
-            'DATA_CACHE': DATA_CACHE,
-            'CACHE_TIME': CACHE_TIME,
             'FILE_MTIME': FILE_MTIME,
-            'AI_SUMMARY_CACHE': AI_SUMMARY_CACHE
-        }
-        with open(CACHE_FILE, 'wb') as f:
-            pickle.dump(cached, f)
+            'AI_SUMMARY_CACHE': AI_SUMMARY_CACHE,
+            'AI_SUMMARY_PARTIALS': AI_SUMMARY_PARTIALS,
+            'FILE_SIGNATURES': FILE_SIGNATURES
+        }
+        tmp_path = CACHE_FILE.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cached, f, ensure_ascii=False)
+        os.replace(tmp_path, CACHE_FILE)
         print(f"[CACHE] 파일로 캐시 저장 완료")
-    except Exception as e:
+    except (OSError, TypeError, ValueError) as e:
         print(f"[CACHE] 파일 캐시 저장 실패: {e}")
 
 # 설정
@@ -1331,26 +2179,523 @@ EXCLUDED_MANAGERS = {"IBK", "미지정"}
 # 업체별 분석에서 제외할 거래처
 EXCLUDED_CLIENTS = {"IBK", "IGC"}
 
-def load_excel_data(year, use_cache=True):
-    """데이터 로드 (SQLite 우선, 없으면 Excel)"""
-    import time
+def _db_identity():
+    """DB 파일 식별값 (교체되면 inode, 다른 프로세스가 쓰면 mtime/size가 바뀜)"""
+    st = SQLITE_DB.stat()
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _sqlite_data_generations():
+    """file_metadata 기준 캐시 키별 데이터 세대
+
+    (테이블, 연도)마다 파일 경로/내용 해시/행 수를 묶어 해시한다. DB 교체(inode), 스키마 정규화,
+    파생 차원 재계산도 모든 키의 세대를 바꾼다.
+    """
+    import sqlite3
+
+    conn = sqlite3.connect(str(SQLITE_DB))
+    try:
+        cursor = conn.cursor()
+        salt = [SQLITE_DB.stat().st_ino, cursor.execute('PRAGMA user_version').fetchone()[0],
+                sorted(_stored_dimension_state(cursor).items())]
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='file_metadata'")
+        rows = cursor.execute('''
+            SELECT table_name, year, file_path, content_hash, row_count FROM file_metadata
+            WHERE table_name IS NOT NULL ORDER BY file_path
+        ''').fetchall() if cursor.fetchone() else []
+    finally:
+        conn.close()
+
+    partitions = {'*': []}
+    for table, year, file_path, content_hash, row_count in rows:
+        cache_key = f"food_item_{year}" if table == 'food_item_data' else str(year)
+        partitions.setdefault(cache_key, []).append([file_path, content_hash, row_count])
+    return {cache_key: hashlib.sha1(json.dumps([salt, parts], ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+            for cache_key, parts in partitions.items()}
+
 
-    # 캐시 확인 (1시간 유효)
-    cache_key = str(year)
-    if use_cache and cache_key in DATA_CACHE:
-        cache_age = time.time() - CACHE_TIME.get(cache_key, 0)
-        if cache_age < 3600:  # 1시간
-            print(f"[CACHE] {year}년 데이터 캐시 사용 ({len(DATA_CACHE[cache_key])}건)")
-            return DATA_CACHE[cache_key]
+def _excel_data_generations():
+    """Excel 직접 로드 모드의 캐시 키별 데이터 세대 (폴더별 파일 내용 해시)"""
+    partitions = {'*': []}
+    for f in _iter_data_files():
+        year = f.parent.name
+        cache_key = f"food_item_{year}" if f.parent.parent.name == 'food_item' else year
+        partitions.setdefault(cache_key, []).append([f.name, get_file_signature(f)[2]])
+    return {cache_key: hashlib.sha1(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+            for cache_key, parts in partitions.items()}
 
-    # SQLite 사용 (DB가 존재하면)
+
+def _compute_data_generations():
+    """현재 DB(없으면 Excel 폴더) 기준 (DB 식별값, 캐시 키별 세대) 계산 - 전역 세대는 바꾸지 않음"""
     if USE_SQLITE and SQLITE_DB.exists():
-        all_data = load_excel_data_sqlite(year)
-        DATA_CACHE[cache_key] = all_data
-        CACHE_TIME[cache_key] = time.time()
-        return all_data
+        return _db_identity(), _sqlite_data_generations()
+    return None, _excel_data_generations()
+
+
+def _publish_data_generations(identity, generations):
+    """계산해 둔 세대를 현재 세대로 게시하고 바뀐 캐시 키 목록 반환 (바뀌었으면 결과 캐시 비움)"""
+    global DATA_GENERATIONS, _DB_IDENTITY
+
+    changed = sorted(k for k in set(generations) | set(DATA_GENERATIONS)
+                     if generations.get(k) != DATA_GENERATIONS.get(k))
+    DATA_GENERATIONS = generations
+    _DB_IDENTITY = identity
+    if changed:
+        clear_result_cache()  # 이전 세대 결과는 다시 쓰이지 않으므로 메모리 반환
+    return changed
 
-    # 기존 Excel 로드 방식 (폴백)
+
+def update_data_generations():
+    """현재 데이터 세대를 다시 계산해 게시 (수집/업로드 직후, DB 외부 변경 감지 시 호출)
+
+    Returns:
+        세대가 바뀐 캐시 키 목록
+    """
+    try:
+        identity, generations = _compute_data_generations()
+    except (sqlite3.Error, OSError) as e:
+        print(f"[CACHE] 데이터 세대 계산 실패: {e}")
+        return []
+    return _publish_data_generations(identity, generations)
+
+
+def data_generation(cache_key):
+    """캐시 키의 현재 데이터 세대 (요청 경로에서는 dict 조회만)"""
+    if not DATA_GENERATIONS:
+        update_data_generations()
+    return DATA_GENERATIONS.get(cache_key, DATA_GENERATIONS.get('*'))
+
+
+def clear_result_cache(prefix=None):
+    """API 결과 캐시 비우기 (prefix: 해당 엔드포인트 이름으로 시작하는 항목만)"""
+    with RESULT_CACHE_LOCK:
+        for key in [k for k in RESULT_CACHE if prefix is None or k[0].startswith(prefix)]:
+            RESULT_CACHE_STATS['bytes'] -= len(RESULT_CACHE.pop(key))
+
+
+def result_cache_stats():
+    """API 결과 캐시 현황 (적중/실패/제거 횟수, 사용 바이트)"""
+    with RESULT_CACHE_LOCK:
+        lookups = RESULT_CACHE_STATS['hits'] + RESULT_CACHE_STATS['misses']
+        return dict(RESULT_CACHE_STATS, entries=len(RESULT_CACHE), max_bytes=RESULT_CACHE_MAX_BYTES,
+                    hit_rate=round(RESULT_CACHE_STATS['hits'] / lookups * 100, 1) if lookups else 0)
+
+
+def cached_json_response(name, defaults=None, extra_key=None):
+    """JSON API 결과 캐시 데코레이터 (login_required 아래에 둔다)
+
+    같은 쿼리(빈 값 제거, 기본값 채움)와 같은 데이터 세대면 직렬화된 응답을 그대로 돌려준다.
+    extra_key: 결과가 데이터 외에 의존하는 값 (예: 오늘 날짜)을 돌려주는 함수
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            params = dict(defaults or {})
+            params.update((k, v.strip()) for k, v in request.args.items() if v.strip())
+            data_generation('*')  # 세대가 아직 계산되지 않았으면 계산
+            key = (name, tuple(sorted(params.items())), tuple(sorted(DATA_GENERATIONS.items())),
+                   extra_key() if extra_key else None)
+
+            with RESULT_CACHE_LOCK:
+                body = RESULT_CACHE.get(key)
+                if body is not None:
+                    RESULT_CACHE.move_to_end(key)
+                    RESULT_CACHE_STATS['hits'] += 1
+                else:
+                    RESULT_CACHE_STATS['misses'] += 1
+            if body is not None:
+                return app.response_class(body, mimetype='application/json')
+
+            response = f(*args, **kwargs)
+            if getattr(response, 'status_code', None) != 200 or response.mimetype != 'application/json':
+                return response  # 오류/튜플 응답은 캐시하지 않음
+            if g.get('skip_result_cache'):
+                return response  # 일부 데이터를 읽지 못한 응답 (다음 요청에서 다시 계산)
+            body = response.get_data()
+            if len(body) > RESULT_CACHE_MAX_BYTES:
+                return response
+
+            with RESULT_CACHE_LOCK:
+                old = RESULT_CACHE.pop(key, None)
+                if old is not None:
+                    RESULT_CACHE_STATS['bytes'] -= len(old)
+                RESULT_CACHE[key] = body
+                RESULT_CACHE_STATS['bytes'] += len(body)
+                while RESULT_CACHE_STATS['bytes'] > RESULT_CACHE_MAX_BYTES:
+                    _, evicted = RESULT_CACHE.popitem(last=False)
+                    RESULT_CACHE_STATS['bytes'] -= len(evicted)
+                    RESULT_CACHE_STATS['evictions'] += 1
+            return response
+        return decorated_function
+    return decorator
+
+
+class SharedRow(Mapping):
+    """공유 데이터셋의 한 행 (dict처럼 row['컬럼'], row.get() 사용 - 값은 읽을 때 디코딩)"""
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, name):
+        kind, view, dictionary = self._columns[name]
+        value = view[self._index]
+        if dictionary is not None:
+            return dictionary[value]
+        if kind == 'date':
+            return _date_from_int(value)
+        return value
+
+    def __iter__(self):
+        return iter(self._columns.names)
+
+    def __len__(self):
+        return len(self._columns.names)
+
+
+class SharedColumns(dict):
+    """컬럼 이름 → (종류, view, 사전) - 요청이 처음 읽는 컬럼만 매핑하고 문자열 사전을 로드"""
+
+    def __init__(self, path, buffer, specs):
+        super().__init__()
+        self.path = path
+        self.names = [col['name'] for col in specs]
+        self._buffer = buffer
+        self._specs = {col['name']: col for col in specs}
+
+    def __missing__(self, name):
+        col = self._specs[name]
+        typecode = 'd' if col['kind'] == 'float' else 'i'
+        view = self._buffer[col['offset']:col['offset'] + col['nbytes']].cast(typecode) if col['nbytes'] else ()
+        dictionary = None
+        if col['kind'] == 'dict':
+            with open(self.path / col['dictionary'], encoding='utf-8') as f:
+                dictionary = json.load(f)
+        column = self[name] = (col['kind'], view, dictionary)
+        return column
+
+
+class SharedTable(Sequence):
+    """컬럼 배열로 된 읽기 전용 데이터셋 (행 목록처럼 순회/인덱싱, 행은 SharedRow)
+
+    mmap한 스냅샷(SharedTable(path)) 또는 메모리 내 배열(SharedTable.from_rows)로 만든다.
+    """
+
+    def __init__(self, path):
+        import mmap
+
+        with open(path / 'meta.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.path = path
+        self._rows = meta['rows']
+        self._map = None
+        buffer = memoryview(b'')
+        if os.path.getsize(path / 'columns.bin'):
+            with open(path / 'columns.bin', 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(self._map)
+        self._columns = SharedColumns(path, buffer, meta['columns'])
+        self._date_index = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """dict 행 목록을 메모리 내 컬럼 테이블로 변환 (파일 없이 같은 인코딩 - 모든 행이 같은 키)"""
+        table = cls.__new__(cls)
+        table.path = None
+        table._rows = len(rows)
+        table._map = None
+        table._columns = SharedColumns(None, memoryview(b''), [])
+        table._date_index = None
+        table._columns.names = list(rows[0].keys()) if rows else []
+        for name in table._columns.names:
+            table._columns[name] = _encode_shared_column([row[name] for row in rows])
+        return table
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [SharedRow(self._columns, i) for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError(index)
+        return SharedRow(self._columns, index)
+
+    def __iter__(self):
+        columns = self._columns
+        for i in range(self._rows):
+            yield SharedRow(columns, i)
+
+    def column(self, name):
+        """한 컬럼의 값 목록 (행 객체를 만들지 않고 컬럼 배열을 한 번에 디코딩)"""
+        return _decode_shared_column(self._columns[name], view_indexes=None)
+
+    def date_index(self):
+        """(정렬된 접수일 키 목록, 키별, 월(YYYYMM)별, 연도별 행 위치 목록) - 처음 쓸 때 한 번 만듦
+
+        접수일 키는 YYYYMMDD (날짜 없으면 0). 위치 목록은 모두 원래 행 순서다.
+        테이블은 세대마다 새로 만들어지므로 (읽기 전용) 인덱스를 다시 만들 일이 없다.
+        """
+        if self._date_index is None:
+            by_day, by_month, by_year = {}, {}, {}
+            for position, (year, month, day) in enumerate(
+                    zip(self.column('recv_year'), self.column('recv_month'), self.column('recv_day'))):
+                key = year * 10000 + month * 100 + day
+                by_day.setdefault(key, []).append(position)
+                by_month.setdefault(key // 100, []).append(position)
+                by_year.setdefault(year, []).append(position)
+            self._date_index = (sorted(by_day), by_day, by_month, by_year)
+        return self._date_index
+
+    def rows_between(self, start_key, end_key):
+        """접수일 키가 start_key~end_key(포함)인 행 목록 (원래 행 순서 유지)
+
+        범위에 통째로 드는 연도/월은 그 위치 목록을, 경계 쪽 일자는 키별 목록을 쓴다.
+        조각이 하나면(연도/월/하루 조회) 그대로, 여럿이면 이미 행 순서인 목록을 heapq.merge로 합친다.
+        """
+        keys, by_day, by_month, by_year = self.date_index()
+        lo, hi = bisect_left(keys, start_key), bisect_right(keys, end_key)
+        pieces = []
+        i = lo
+        while i < hi:
+            key = keys[i]
+            for size, buckets in ((10000, by_year), (100, by_month)):
+                first = bisect_left(keys, key // size * size)
+                last = bisect_left(keys, (key // size + 1) * size)
+                if first >= lo and last <= hi:
+                    pieces.append(buckets[key // size])
+                    i = last
+                    break
+            else:
+                pieces.append(by_day[key])
+                i += 1
+        positions = pieces[0] if len(pieces) == 1 else heapq.merge(*pieces)
+        columns = self._columns
+        return [SharedRow(columns, position) for position in positions]
+
+
+def _decode_shared_column(column, view_indexes):
+    """(종류, view, 사전) 컬럼 → 값 목록 (view_indexes가 있으면 그 위치만 순서대로)"""
+    kind, view, dictionary = column
+    codes = view if view_indexes is None else list(map(view.__getitem__, view_indexes))
+    if dictionary is not None:
+        return list(map(dictionary.__getitem__, codes))
+    if kind == 'date':
+        return list(map(_date_from_int, codes))
+    return list(codes)
+
+
+def column_values(rows, name, runs=None):
+    """행 목록의 한 컬럼 값 목록
+
+    SharedTable이나 SharedRow 목록(runs=_shared_row_runs(rows))은 컬럼 배열에서 바로 디코딩하고,
+    dict 행은 row[name]으로 읽는다.
+    """
+    if isinstance(rows, SharedTable):
+        return rows.column(name)
+    if runs is not None:
+        values = []
+        for columns, indexes in runs:
+            values.extend(_decode_shared_column(columns[name], indexes))
+        return values
+    return [row[name] for row in rows]
+
+
+def _shared_row_runs(rows):
+    """SharedRow 목록 → 같은 테이블에서 온 연속 구간별 (컬럼, 행 인덱스 목록) (SharedRow가 아닌 행이 있으면 None)"""
+    runs = []
+    columns = None
+    for row in rows:
+        if type(row) is not SharedRow:
+            return None
+        if row._columns is not columns:
+            columns = row._columns
+            runs.append((columns, []))
+        runs[-1][1].append(row._index)
+    return runs
+
+
+def _encode_shared_column(values):
+    """컬럼 값을 (종류, array, 문자열 사전)으로 인코딩
+
+    float → float64, int → int32, date → YYYYMMDD int32, 그 외(문자열/None/혼합)는 사전 코드 int32
+    """
+    from array import array
+
+    types = {type(v) for v in values}
+    if types and types <= {float}:
+        return 'float', array('d', values), None
+    if types and types <= {int} and all(-2 ** 31 <= v < 2 ** 31 for v in values):
+        return 'int', array('i', values), None
+    if types and types <= {date, type(None)} and date in types:
+        return 'date', array('i', [_to_date_int(v) or 0 for v in values]), None
+    index = {}
+    dictionary = []
+    codes = array('i')
+    for v in values:
+        key = (type(v), v)
+        code = index.get(key)
+        if code is None:
+            code = index[key] = len(dictionary)
+            dictionary.append(v)
+        codes.append(code)
+    return 'dict', codes, dictionary
+
+
+def _write_shared_dataset(path, rows):
+    """행 목록을 컬럼 배열 파일(columns.bin, 컬럼마다 8바이트 정렬) + 컬럼별 사전 파일 + meta.json으로 기록
+
+    모든 행이 같은 키여야 한다. 사전은 컬럼마다 따로 두어 읽지 않는 컬럼의 문자열은 로드하지 않는다.
+    """
+    path.mkdir(parents=True)
+    columns = list(rows[0].keys()) if rows else []
+    meta = {'rows': len(rows), 'columns': []}
+    with open(path / 'columns.bin', 'wb') as f:
+        for i, name in enumerate(columns):
+            kind, data, dictionary = _encode_shared_column([row[name] for row in rows])
+            offset = f.tell()
+            data.tofile(f)
+            nbytes = f.tell() - offset
+            f.write(b'\0' * (-nbytes % 8))
+            dictionary_file = None
+            if dictionary is not None:
+                dictionary_file = f"dict_{i}.json"
+                with open(path / dictionary_file, 'w', encoding='utf-8') as df:
+                    json.dump(dictionary, df, ensure_ascii=False)
+            meta['columns'].append({'name': name, 'kind': kind, 'offset': offset, 'nbytes': nbytes,
+                                    'dictionary': dictionary_file})
+    with open(path / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def _compact_rows(cache_key, rows):
+    """dict 행 목록을 메모리 내 컬럼 테이블로 변환 (변환할 수 없으면 그대로 반환)"""
+    try:
+        return SharedTable.from_rows(rows)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"[SHARED] {cache_key} 컬럼 테이블 변환 실패 - dict 행 사용: {e}")
+        return rows
+
+
+def load_shared_dataset(cache_key, generation, loader):
+    """캐시 키/세대의 공유 스냅샷을 mmap해서 반환 (없으면 loader()로 읽어 기록한 뒤 mmap)
+
+    다른 워커가 이미 기록한 스냅샷은 다시 읽지 않고 그대로 매핑한다. 공유를 끄거나
+    기록에 실패하면 loader() 결과를 메모리 내 컬럼 테이블로 변환해 반환한다.
+    """
+    if not USE_SHARED_DATASETS or generation is None:
+        return _compact_rows(cache_key, loader())
+    import shutil
+    import tempfile
+
+    path = SHARED_DATA_DIR / f"{cache_key}-{generation}"
+    if (path / 'meta.json').exists():
+        try:
+            return SharedTable(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[SHARED] {path.name} 매핑 실패 - 다시 기록: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+
+    rows = loader()
+    try:
+        SHARED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{cache_key}-", dir=str(SHARED_DATA_DIR)))
+        _write_shared_dataset(staging / 'data', rows)
+        try:
+            os.rename(str(staging / 'data'), str(path))  # 다른 워커가 먼저 기록했으면 실패 → 그쪽 사용
+        except OSError:
+            pass
+        shutil.rmtree(staging, ignore_errors=True)
+        table = SharedTable(path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"[SHARED] {cache_key} 공유 스냅샷 기록 실패 - 프로세스 메모리 사용: {e}")
+        return _compact_rows(cache_key, rows)
+
+    # 이전 세대 스냅샷 정리 (이미 매핑한 프로세스는 닫을 때까지 계속 읽을 수 있음, 실패는 무시)
+    for old in SHARED_DATA_DIR.glob(f"{cache_key}-*"):
+        if old != path and old.name[len(cache_key) + 1:].isalnum():
+            shutil.rmtree(old, ignore_errors=True)
+    print(f"[SHARED] {cache_key} 공유 스냅샷 기록: {len(table):,}행")
+    return table
+
+
+def load_lock(cache_key):
+    """캐시 키별 로드 잠금 (처음 요청될 때 생성)"""
+    with LOAD_LOCKS_GUARD:
+        lock = LOAD_LOCKS.get(cache_key)
+        if lock is None:
+            lock = LOAD_LOCKS[cache_key] = threading.Lock()
+        return lock
+
+
+def _dataset_source(cache_key, generations=None):
+    """캐시 키 → (데이터 세대, 로더) - SQLite 사용 (DB가 존재하면), 없으면 기존 Excel 로드 방식 (폴백)
+
+    키: '<연도>' (excel_data 행), 'cube_<연도>' (집계 큐브, excel_data와 같은 세대), 'food_item_<연도>'
+    generations: 아직 게시하지 않은 세대 dict (없으면 현재 세대)
+    """
+    if generations is None:
+        generation_of = data_generation
+    else:
+        generation_of = lambda key: generations.get(key, generations.get('*'))
+    use_db = USE_SQLITE and SQLITE_DB.exists()
+    if cache_key.startswith('food_item_'):
+        year = cache_key[len('food_item_'):]
+        loader = load_food_item_data_sqlite if use_db else load_food_item_data_excel
+        return generation_of(cache_key), lambda: loader(year)
+    if cache_key.startswith('cube_'):
+        year = cache_key[len('cube_'):]
+        loader = load_excel_cube_sqlite if use_db else (lambda year: build_cube_cells(load_excel_data(year)))
+        return generation_of(year), lambda: loader(year)
+    loader = load_excel_data_sqlite if use_db else load_excel_data_excel
+    return generation_of(cache_key), lambda: loader(cache_key)
+
+
+def cached_dataset(cache_key, use_cache=True):
+    """데이터셋 캐시 조회/로드 (single-flight) - 어느 쪽이든 컬럼 스냅샷으로 보관
+
+    캐시가 현재 세대면 그대로 반환한다. 아니면 키별 잠금을 잡은 한 요청만 읽어
+    (세대, 데이터)를 한 번에 교체하고, 같은 키를 기다리던 요청은 그 결과를 쓴다.
+    use_cache=False여도 기다리는 동안 다른 요청이 새로 읽었으면 다시 읽지 않는다.
+    """
+    generation, loader = _dataset_source(cache_key)
+    seen = DATA_CACHE.get(cache_key)
+    if use_cache and seen is not None and seen[0] == generation:
+        return seen[1]
+    with load_lock(cache_key):
+        entry = DATA_CACHE.get(cache_key)
+        if entry is not None and entry[0] == generation and (use_cache or entry is not seen):
+            return entry[1]
+        data = load_shared_dataset(cache_key, generation, loader)
+        DATA_CACHE[cache_key] = (generation, data)
+        return data
+
+
+def cached_entry(cache_key, generation):
+    """해당 세대로 로드되어 있는 캐시 데이터 (없거나 이전 세대면 None - 로드하지 않음)"""
+    entry = DATA_CACHE.get(cache_key)
+    return entry[1] if entry is not None and entry[0] == generation else None
+
+
+def load_cache_snapshot(keys, generations=None):
+    """캐시 키들을 현재 세대(또는 게시 전 generations)로 모두 읽은 새 캐시 dict (DATA_CACHE에 한 번에 대입해 교체)"""
+    snapshot = {}
+    for cache_key in sorted(keys):
+        generation, loader = _dataset_source(cache_key, generations)
+        snapshot[cache_key] = (generation, load_shared_dataset(cache_key, generation, loader))
+    return snapshot
+
+
+def load_excel_data(year, use_cache=True):
+    """데이터 로드 (SQLite 우선, 없으면 Excel) - 데이터 세대가 같으면 캐시 (수집/업로드 전까지 다시 읽지 않음)"""
+    return cached_dataset(str(year), use_cache)
+
+
+def load_excel_data_excel(year):
+    """Excel 파일에서 연도 데이터 직접 로드 (SQLite를 쓰지 않을 때) - SQLite 행과 같은 정규화 컬럼"""
     from openpyxl import load_workbook
 
     data_path = DATA_DIR / str(year)
@@ -1370,8 +2715,7 @@ def load_excel_data(year, use_cache=True):
             headers = [cell.value for cell in ws[1]]
 
             for row in ws.iter_rows(min_row=2, values_only=True):
-                row_dict = dict(zip(headers, row))
-                all_data.append(row_dict)
+                all_data.append(canonicalize_excel_row(dict(zip(headers, row))))
             wb.close()
             print(f"[LOAD] {f.name} 완료")
         except Exception as e:
@@ -1380,33 +2724,55 @@ def load_excel_data(year, use_cache=True):
     elapsed = time.time() - start_time
     print(f"[LOAD] {year}년 완료: {len(all_data)}건, {elapsed:.1f}초 소요")
 
-    # 캐시 저장
-    DATA_CACHE[cache_key] = all_data
-    CACHE_TIME[cache_key] = time.time()
-
     return all_data
 
+
+def load_excel_cube(year, use_cache=True):
+    """연도별 집계 큐브 셀 로드 (SQLite 우선, 없으면 Excel 행에서 집계) - 캐시는 excel_data와 같은 세대"""
+    return cached_dataset(f"cube_{year}", use_cache)
+
+
 def load_food_item_data(year, use_cache=True):
     """food_item 데이터 로드 (SQLite 우선, 없으면 Excel)"""
-    import time
+    return cached_dataset(f"food_item_{year}", use_cache)
 
-    cache_key = f"food_item_{year}"
-    if use_cache and cache_key in DATA_CACHE:
-        cache_age = time.time() - CACHE_TIME.get(cache_key, 0)
-        if cache_age < 3600:
-            print(f"[CACHE] food_item {year}년 데이터 캐시 사용 ({len(DATA_CACHE[cache_key])}건)")
-            return DATA_CACHE[cache_key]
 
-    # SQLite 사용 (DB가 존재하면)
-    if USE_SQLITE and SQLITE_DB.exists():
-        all_data = load_food_item_data_sqlite(year)
-        DATA_CACHE[cache_key] = all_data
-        CACHE_TIME[cache_key] = time.time()
-        return all_data
-
-    # 기존 Excel 로드 방식 (폴백)
+def read_food_item_workbook(f):
+    """food_item Excel 파일 하나를 정규화된 행 목록으로 읽기 (필요한 컬럼만 + source_file)"""
     from openpyxl import load_workbook
 
+    # 필요한 컬럼만 로드
+    required_columns = ['접수일자', '발행일', '검체유형', '업체명', '의뢰인명', '업체주소',
+                       '항목명', '규격', '항목담당', '결과입력자', '입력일', '분석일',
+                       '항목단위', '시험결과', '시험치', '성적서결과', '판정', '검사목적',
+                       '긴급여부', '항목수수료', '영업담당']
+
+    rows = []
+    wb = load_workbook(f, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        headers = [cell.value for cell in ws[1]]
+
+        # 컬럼 인덱스 매핑
+        col_indices = {}
+        for i, h in enumerate(headers):
+            if h in required_columns:
+                col_indices[h] = i
+
+        for row in ws.iter_rows(min_row=2, values_only=True):
+            row_dict = {}
+            for col_name, idx in col_indices.items():
+                row_dict[col_name] = row[idx] if idx < len(row) else None
+            record = canonicalize_food_item_row(row_dict)
+            record['source_file'] = f.name
+            rows.append(record)
+    finally:
+        wb.close()
+    return rows
+
+
+def load_food_item_data_excel(year):
+    """Excel 파일에서 food_item 연도 데이터 직접 로드 (SQLite를 쓰지 않을 때)"""
     data_path = DATA_DIR / "food_item" / str(year)
     if not data_path.exists():
         print(f"[WARN] food_item {year}년 폴더 없음: {data_path}")
@@ -1415,33 +2781,12 @@ def load_food_item_data(year, use_cache=True):
     print(f"[LOAD] food_item {year}년 데이터 로딩 시작 (Excel)...")
     start_time = time.time()
 
-    # 필요한 컬럼만 로드
-    required_columns = ['접수일자', '발행일', '검체유형', '업체명', '의뢰인명', '업체주소',
-                       '항목명', '규격', '항목담당', '결과입력자', '입력일', '분석일',
-                       '항목단위', '시험결과', '시험치', '성적서결과', '판정', '검사목적',
-                       '긴급여부', '항목수수료', '영업담당']
-
     all_data = []
     files = sorted(data_path.glob("*.xlsx"))
 
     for f in files:
         try:
-            wb = load_workbook(f, read_only=True, data_only=True)
-            ws = wb.active
-            headers = [cell.value for cell in ws[1]]
-
-            # 컬럼 인덱스 매핑
-            col_indices = {}
-            for i, h in enumerate(headers):
-                if h in required_columns:
-                    col_indices[h] = i
-
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                row_dict = {}
-                for col_name, idx in col_indices.items():
-                    row_dict[col_name] = row[idx] if idx < len(row) else None
-                all_data.append(row_dict)
-            wb.close()
+            all_data.extend(read_food_item_workbook(f))
             print(f"[LOAD] food_item {f.name} 완료")
         except Exception as e:
             print(f"[ERROR] Loading food_item {f}: {e}")
@@ -1449,58 +2794,194 @@ def load_food_item_data(year, use_cache=True):
     elapsed = time.time() - start_time
     print(f"[LOAD] food_item {year}년 완료: {len(all_data)}건, {elapsed:.1f}초 소요")
 
-    DATA_CACHE[cache_key] = all_data
-    CACHE_TIME[cache_key] = time.time()
-
     return all_data
 
 
 def check_data_changed(year):
-    """데이터 파일 변경 감지"""
+    """데이터 파일 변경 감지 (내용 해시 기준 - size+mtime이 같으면 해시 재계산 생략)"""
     data_path = DATA_DIR / str(year)
     if not data_path.exists():
         return False
 
     files = sorted(data_path.glob("*.xlsx"))
-    current_mtimes = {}
+    current_hashes = {}
 
     for f in files:
-        current_mtimes[str(f)] = f.stat().st_mtime
+        current_hashes[str(f)] = get_file_signature(f)[2]
 
-    cache_key = f"mtime_{year}"
-    old_mtimes = FILE_MTIME.get(cache_key, {})
+    cache_key = f"hash_{year}"
+    old_hashes = FILE_MTIME.get(cache_key, {})
 
-    if current_mtimes != old_mtimes:
-        FILE_MTIME[cache_key] = current_mtimes
+    if current_hashes != old_hashes:
+        FILE_MTIME[cache_key] = current_hashes
         return True
 
     return False
 
 
+def _ai_summary_partial(rows):
+    """food_item 행 묶음(원본 파일 하나)의 AI 요약 부분합 - JSON으로 저장 가능 ([건수, 수수료], 월은 문자열 키)"""
+    partial = {'total_count': 0, 'total_fee': 0, 'by_purpose': {}, 'by_sample_type': {},
+               'by_manager': {}, 'by_item': {}, 'monthly': {}, 'by_client': {}}
+    clients = {}
+    for row in rows:
+        # 수집 시 정규화된 값 (공백 제거, 수수료 숫자, 접수월 정수)
+        purpose = row['검사목적']
+        manager = row['영업담당'] or DEFAULT_MANAGER
+        client = row['업체명'] or '미지정'
+        fee = row['항목수수료']
+        month = row['recv_month']
+
+        partial['total_count'] += 1
+        partial['total_fee'] += fee
+        for group, key in (('by_purpose', purpose), ('by_sample_type', row['검체유형']),
+                           ('by_manager', manager), ('by_item', row['항목명']),
+                           ('monthly', str(month) if month else None)):
+            if key or group == 'by_manager':
+                stats = partial[group].setdefault(key, [0, 0])
+                stats[0] += 1
+                stats[1] += fee
+
+        # 고객(업체)별
+        if client != '미지정':
+            stats = clients.setdefault(client, [0, 0, set(), set()])
+            stats[0] += 1
+            stats[1] += fee
+            if purpose:
+                stats[2].add(purpose)
+            if month:
+                stats[3].add(month)
+    partial['by_client'] = {client: [count, fee, sorted(purposes), sorted(months)]
+                            for client, (count, fee, purposes, months) in clients.items()}
+    return partial
+
+
+def _merge_ai_summary_partial(summary, year, partial):
+    """파일별 부분합을 연도 요약에 더함 (처음 나온 순서 유지)"""
+    target = summary[year]
+    filter_values = summary['filter_values']
+    target['total_count'] += partial['total_count']
+    target['total_fee'] += partial['total_fee']
+    for group, filter_key in (('by_purpose', 'purposes'), ('by_sample_type', 'sample_types'),
+                              ('by_manager', 'managers'), ('by_item', 'items'), ('monthly', None)):
+        for key, (count, fee) in partial[group].items():
+            if group == 'monthly':
+                key = int(key)
+            if key not in target[group]:
+                target[group][key] = {'count': 0, 'fee': 0}
+            target[group][key]['count'] += count
+            target[group][key]['fee'] += fee
+            if filter_key:
+                filter_values[filter_key].add(key)
+    for client, (count, fee, purposes, months) in partial['by_client'].items():
+        if client not in target['by_client']:
+            target['by_client'][client] = {'count': 0, 'fee': 0, 'purposes': set(), 'months': set()}
+        target['by_client'][client]['count'] += count
+        target['by_client'][client]['fee'] += fee
+        target['by_client'][client]['purposes'].update(purposes)
+        target['by_client'][client]['months'].update(months)
+        filter_values['clients'].add(client)
+
+
+def _ai_summary_sources(year):
+    """연도의 food_item 원본 파일별 (이름, 서명, 행 로더) - 서명이 같으면 저장된 부분합을 재사용"""
+    import sqlite3
+
+    if not (USE_SQLITE and SQLITE_DB.exists()):
+        data_path = DATA_DIR / "food_item" / str(year)
+        files = sorted(data_path.glob("*.xlsx")) if data_path.exists() else []
+        # 이미 로드된 연도면 워크북을 다시 읽지 않고 캐시 행을 파일별로 나눠 씀
+        loaded = {}
+        cache_key = f"food_item_{year}"
+        for row in cached_entry(cache_key, data_generation(cache_key)) or ():
+            loaded.setdefault(row.get('source_file'), []).append(row)
+
+        def read_file(f):
+            return loaded[f.name] if f.name in loaded else read_food_item_workbook(f)
+
+        return [(f.name, get_file_signature(f)[2], lambda f=f: read_file(f)) for f in files]
+
+    conn = sqlite3.connect(str(SQLITE_DB))
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='food_item_data'")
+        if not cursor.fetchone():
+            return []
+        user_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        columns = [col[1] for col in cursor.execute("PRAGMA table_info(food_item_data)").fetchall()]
+        if 'source_file' not in columns or user_version < SQLITE_SCHEMA_VERSION:
+            # 파일 구분이 없는 DB(구 Colab)/정규화 이전 DB는 연도 전체를 한 묶음으로
+            generation = data_generation(f"food_item_{year}")
+            return [('*', generation, lambda: load_food_item_data(year))]
+        # 파일별 행 수/id 범위 + 원본 내용 해시 (재수집/병합되면 id가 바뀜)
+        sources = cursor.execute('''
+            SELECT source_file, COUNT(*), MIN(id), MAX(id),
+                   (SELECT group_concat(content_hash) FROM file_metadata m
+                    WHERE m.table_name = 'food_item_data' AND m.year = d.year AND m.source_file = d.source_file)
+            FROM food_item_data d WHERE year = ? GROUP BY source_file ORDER BY source_file
+        ''', (str(year),)).fetchall()
+    finally:
+        conn.close()
+
+    def read_source(source_file):
+        conn = sqlite3.connect(str(SQLITE_DB))
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute('''
+                SELECT 검사목적, 검체유형, 항목명, 영업담당, 업체명, 항목수수료, recv_month
+                FROM food_item_data WHERE year = ? AND source_file IS ? ORDER BY id
+            ''', (str(year), source_file)).fetchall()
+        finally:
+            conn.close()
+
+    return [(source_file or '', json.dumps([user_version, *signature]), lambda s=source_file: read_source(s))
+            for source_file, *signature in sources]
+
+
+def _ai_summary_partials(year):
+    """연도의 파일별 AI 요약 부분합 (파일 순서) - 서명이 바뀐 파일만 다시 집계하고 사라진 파일은 버림"""
+    stored = AI_SUMMARY_PARTIALS.get(year, {})
+    current = {}
+    recomputed = 0
+    for name, signature, read_rows in _ai_summary_sources(year):
+        entry = stored.get(name)
+        if entry is None or entry['signature'] != signature:
+            entry = {'signature': signature, 'summary': _ai_summary_partial(read_rows())}
+            recomputed += 1
+        current[name] = entry
+    AI_SUMMARY_PARTIALS[year] = current
+    print(f"[AI-CACHE] {year}년 부분합: 파일 {len(current)}개 중 {recomputed}개 재집계")
+    return [entry['summary'] for entry in current.values()]
+
+
 def get_ai_data_summary(force_refresh=False):
     """AI 분석용 데이터 요약 생성 (캐시됨)"""
-    import time
 
     cache_key = 'ai_summary'
 
-    # 데이터 변경 확인
-    data_changed = check_data_changed('2024') or check_data_changed('2025')
-
-    # 캐시 유효성 확인 (1시간 또는 데이터 변경 시)
-    if not force_refresh and cache_key in AI_SUMMARY_CACHE:
-        cache_age = time.time() - AI_SUMMARY_CACHE.get('_time', 0)
-        if cache_age < 3600 and not data_changed:
-            print(f"[AI-CACHE] 요약 캐시 사용 (나이: {cache_age:.0f}초)")
-            return AI_SUMMARY_CACHE[cache_key]
-
+    # 캐시 유효성 확인 (food_item 데이터 세대가 같으면 유효, 캐시 dict는 교체될 수 있어 한 번만 읽음)
+    generation = [data_generation(f"food_item_{year}") for year in ('2024', '2025')]
+    cached = AI_SUMMARY_CACHE
+    seen = cached.get(cache_key) if cached.get('_generation') == generation else None
+    if not force_refresh and seen is not None:
+        print(f"[AI-CACHE] 요약 캐시 사용")
+        return seen
+
+    # 동시에 들어온 요청은 한 번만 생성 (기다리는 동안 다른 요청이 현재 세대로 만들었으면 그대로 사용)
+    with load_lock(cache_key):
+        cached = AI_SUMMARY_CACHE
+        summary = cached.get(cache_key) if cached.get('_generation') == generation else None
+        if summary is not None and (not force_refresh or summary is not seen):
+            return summary
+        return _build_ai_data_summary(cache_key, generation)
+
+
+def _build_ai_data_summary(cache_key, generation):
+    """AI 분석용 데이터 요약 생성 (get_ai_data_summary가 잠금을 잡고 호출)"""
     print(f"[AI-CACHE] 데이터 요약 생성 중...")
     start_time = time.time()
 
-    # 데이터 로드
-    food_2024 = load_food_item_data('2024')
-    food_2025 = load_food_item_data('2025')
-
-    # 요약 통계 계산
+    # 요약 통계 계산 (원본 파일별 부분합을 파일 순서대로 합침 - 바뀐 파일만 다시 집계)
     summary = {
         '2024': {'total_count': 0, 'total_fee': 0, 'by_purpose': {}, 'by_sample_type': {},
                  'by_manager': {}, 'by_item': {}, 'monthly': {}, 'by_client': {}},
@@ -1509,72 +2990,9 @@ def get_ai_data_summary(force_refresh=False):
         'filter_values': {'purposes': set(), 'sample_types': set(), 'items': set(), 'managers': set(), 'clients': set()}
     }
 
-    for year, data in [('2024', food_2024), ('2025', food_2025)]:
-        for row in data:
-            purpose = str(row.get('검사목적', '') or '').strip()
-            sample_type = str(row.get('검체유형', '') or '').strip()
-            item_name = str(row.get('항목명', '') or '').strip()
-            manager = str(row.get('영업담당', '') or '').strip() or '미지정'
-            client = str(row.get('업체명', '') or '').strip() or '미지정'
-            fee = row.get('항목수수료', 0) or 0
-            date = row.get('접수일자')
-
-            if isinstance(fee, str):
-                fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
-
-            summary[year]['total_count'] += 1
-            summary[year]['total_fee'] += fee
-
-            # 목적별
-            if purpose:
-                if purpose not in summary[year]['by_purpose']:
-                    summary[year]['by_purpose'][purpose] = {'count': 0, 'fee': 0}
-                summary[year]['by_purpose'][purpose]['count'] += 1
-                summary[year]['by_purpose'][purpose]['fee'] += fee
-                summary['filter_values']['purposes'].add(purpose)
-
-            # 검체유형별
-            if sample_type:
-                if sample_type not in summary[year]['by_sample_type']:
-                    summary[year]['by_sample_type'][sample_type] = {'count': 0, 'fee': 0}
-                summary[year]['by_sample_type'][sample_type]['count'] += 1
-                summary[year]['by_sample_type'][sample_type]['fee'] += fee
-                summary['filter_values']['sample_types'].add(sample_type)
-
-            # 영업담당별
-            if manager not in summary[year]['by_manager']:
-                summary[year]['by_manager'][manager] = {'count': 0, 'fee': 0}
-            summary[year]['by_manager'][manager]['count'] += 1
-            summary[year]['by_manager'][manager]['fee'] += fee
-            summary['filter_values']['managers'].add(manager)
-
-            # 항목별 (TOP 50만)
-            if item_name:
-                if item_name not in summary[year]['by_item']:
-                    summary[year]['by_item'][item_name] = {'count': 0, 'fee': 0}
-                summary[year]['by_item'][item_name]['count'] += 1
-                summary[year]['by_item'][item_name]['fee'] += fee
-                summary['filter_values']['items'].add(item_name)
-
-            # 월별
-            if date and hasattr(date, 'month'):
-                m = date.month
-                if m not in summary[year]['monthly']:
-                    summary[year]['monthly'][m] = {'count': 0, 'fee': 0}
-                summary[year]['monthly'][m]['count'] += 1
-                summary[year]['monthly'][m]['fee'] += fee
-
-            # 고객(업체)별
-            if client and client != '미지정':
-                if client not in summary[year]['by_client']:
-                    summary[year]['by_client'][client] = {'count': 0, 'fee': 0, 'purposes': set(), 'months': set()}
-                summary[year]['by_client'][client]['count'] += 1
-                summary[year]['by_client'][client]['fee'] += fee
-                if purpose:
-                    summary[year]['by_client'][client]['purposes'].add(purpose)
-                if date and hasattr(date, 'month'):
-                    summary[year]['by_client'][client]['months'].add(date.month)
-                summary['filter_values']['clients'].add(client)
+    for year in ['2024', '2025']:
+        for partial in _ai_summary_partials(year):
+            _merge_ai_summary_partial(summary, year, partial)
 
     # set을 sorted list로 변환
     summary['filter_values']['purposes'] = sorted(summary['filter_values']['purposes'])
@@ -1609,217 +3027,273 @@ def get_ai_data_summary(force_refresh=False):
     elapsed = time.time() - start_time
     print(f"[AI-CACHE] 요약 생성 완료: {elapsed:.1f}초 소요")
 
-    AI_SUMMARY_CACHE[cache_key] = summary
-    AI_SUMMARY_CACHE['_time'] = time.time()
+    AI_SUMMARY_CACHE[cache_key] = summary  # 요약을 먼저 넣어야 세대만 새것인 순간이 생기지 않음
+    AI_SUMMARY_CACHE['_generation'] = generation
 
     return summary
 
 
-def process_food_item_data(data, purpose_filter=None, sample_type_filter=None,
-                           item_filter=None, manager_filter=None):
-    """검사항목 데이터 처리"""
-    by_item = {}  # 항목별 데이터
-    by_item_month = {}  # 항목별-월별 데이터
-    by_item_analyzer = {}  # 항목별-분석자 데이터
-    by_sample_type_item = {}  # 검체유형별-항목 데이터
-    by_manager_item = {}  # 영업담당별-항목 데이터
-    by_manager_fee = {}  # 영업담당별-수수료 데이터
-    by_month_fee = {}  # 월별-수수료 데이터
-    by_purpose_sample_type = {}  # 검사목적별-검체유형 매핑
-    by_purpose_sample_type_item = {}  # 검사목적+검체유형별-항목 매핑
-    by_purpose_item = {}  # 검사목적별-항목 데이터 (NEW)
-    by_analyzer = {}  # 분석자별 데이터 (NEW)
-    by_analyzer_item = {}  # 분석자별-항목 데이터 (NEW)
-    by_month_item = {}  # 월별-항목 데이터 (NEW)
+def _finish_groups(groups, spec, measure_names, decimals=None):
+    """decimals(측정값 이름 → 합계 반올림 자릿수), 명세의 sort(내림차순 측정값)/top(상위 N개) 적용"""
+    offset = len(spec['dims']) + len(spec.get('first', ()))
+    rounded = [(offset + list(measure_names).index(name), digits)
+               for name, digits in (decimals or {}).items() if name in measure_names]
+    if rounded:
+        def round_group(group):
+            group = list(group)
+            for position, digits in rounded:
+                group[position] = round(group[position], digits)
+            return tuple(group)
+        groups = list(map(round_group, groups))
+    if spec.get('sort'):
+        position = len(spec['dims']) + len(spec.get('first', ())) + list(measure_names).index(spec['sort'])
+        groups = sorted(groups, key=lambda group: group[position], reverse=True)
+    if spec.get('top'):
+        groups = groups[:spec['top']]
+    return groups
+
+
+def run_aggregations(rows, specs, dimensions, flags, measures, selected=None, decimals=None):
+    """집계 명세 여러 개를 함께 계산
+
+    행은 한 번만 읽어 차원/행 조건/측정값 컬럼을 만들고, 같은 where 조합의 행 목록과 그 행의 차원 값은
+    한 번만 추려 명세끼리 공유한다. 합계는 그룹마다 행 순서대로 더한다 (행 루프에서 += 한 값과 같음).
 
-    purposes = set()
-    sample_types = set()
-    items = set()
-    managers = set()
-    analyzers = set()
+    Args:
+        specs: 명세 이름 → {'dims': 그룹 차원, 'where': 행 조건 목록, 'first': 그룹 첫 행에서 가져올 차원,
+               'measures': 합산할 측정값 (기본 전체, ()이면 그룹 키만), 'all_rows': 필터(selected) 무시,
+               'sort': 내림차순 정렬할 측정값, 'top': 상위 N개}
+        dimensions: 차원 이름 → (원본 컬럼/앞선 차원 튜플, 변환 함수 또는 None) - 선언 순서대로 계산
+        flags: 행 조건 이름 → (차원/컬럼 튜플, 조건 함수)
+        measures: 측정값 이름 → 컬럼 이름 또는 함수(rows, columns) → 행별 값 목록
+        selected: 필터 조건 (flags와 같은 형식, 없으면 전체 행)
+        decimals: 측정값 이름 → 합계 반올림 자릿수 (정렬 전에 반올림, 없으면 그대로)
+
+    Returns:
+        명세 이름 → [(*키, *first 값, *측정값 합), ...] (sort가 없으면 그룹 첫 등장 순서)
+    """
+    from itertools import compress, count
+
+    if not isinstance(rows, Sequence):
+        rows = list(rows)
+    runs = None if isinstance(rows, SharedTable) else _shared_row_runs(rows)
+    raw = {}
+    columns = {}
+
+    def column(name):
+        if name in columns:
+            return columns[name]
+        if name not in raw:
+            raw[name] = column_values(rows, name, runs)
+        return raw[name]
+
+    for name, (sources, fn) in dimensions.items():
+        values = [column(source) for source in sources]
+        columns[name] = values[0] if fn is None else list(map(fn, *values))
+    flags = dict(flags)
+    if selected is not None:
+        flags['selected'] = selected
+    for name, (sources, fn) in flags.items():
+        columns[name] = list(map(bool, map(fn, *[column(source) for source in sources])))
+    measure_names = list(measures)
+    measure_columns = [column(m) if isinstance(m, str) else m(rows, columns) for m in measures.values()]
+
+    selections = {(): list(range(len(rows)))}
+    picked = {}
+
+    def rows_where(where):
+        """where 조건을 모두 만족하는 행 번호 (앞쪽 조건 결과를 재사용)"""
+        if where not in selections:
+            parent = rows_where(where[:-1])
+            flag = columns[where[-1]]
+            selections[where] = list(compress(parent, [flag[i] for i in parent]))
+        return selections[where]
+
+    def pick(where, name):
+        """where 행의 차원/측정값 값 목록 (명세끼리 공유)"""
+        if (where, name) not in picked:
+            values = measure_columns[name] if isinstance(name, int) else columns[name]
+            picked[(where, name)] = [values[i] for i in rows_where(where)]
+        return picked[(where, name)]
 
-    total_fee = 0
-    total_count = 0
+    results = {}
+    for spec_name, spec in specs.items():
+        where = tuple(spec.get('where', ()))
+        if selected is not None and not spec.get('all_rows'):
+            where = ('selected',) + where
+        indexes = rows_where(where)
+        dims = tuple(spec['dims'])
+        if not dims:
+            keys = [()] * len(indexes)
+        elif len(dims) == 1:
+            keys = pick(where, dims[0])
+        else:
+            keys = list(zip(*[pick(where, dim) for dim in dims]))
+
+        # 키 → 첫 등장 위치 (setdefault), 첫 등장 순서대로 0부터 번호를 매겨 그룹 번호로 사용
+        group_of = {}
+        first_at = list(map(group_of.setdefault, keys, count()))
+        number = {position: n for n, position in enumerate(group_of.values())}
+        group_ids = list(map(number.__getitem__, first_at))
+        sums = []
+        for name in spec.get('measures', measure_names):
+            totals = [0] * len(group_of)
+            for group, amount in zip(group_ids, pick(where, measure_names.index(name))):
+                totals[group] += amount
+            sums.append(totals)
+        firsts = [indexes[position] for position in group_of.values()]
+        first_values = [[columns[name][i] for i in firsts] for name in spec.get('first', ())]
+
+        group_keys = [(key,) if len(dims) == 1 else key for key in group_of]
+        results[spec_name] = _finish_groups(
+            [key + tuple(values) for key, values in zip(group_keys, zip(*first_values, *sums))]
+            if first_values or sums else group_keys, spec, spec.get('measures', measure_names), decimals)
+    return results
+
+
+# process_food_item_data 집계 명세 (run_aggregations) - 측정값 rows: 항목 건수, fee: 항목수수료,
+# samples: 샘플 건수 (잔류농약/항생물질(참고용)은 접수일자+업체명+검체유형 고유 샘플만)
+FOOD_ITEM_DIMENSIONS = {
+    'purpose': (('검사목적',), None),
+    'sample_type': (('검체유형',), None),
+    'item': (('항목명',), None),
+    'manager': (('영업담당',), lambda manager: manager or DEFAULT_MANAGER),
+    'analyzer': (('결과입력자',), lambda analyzer: analyzer or '미지정'),
+    'month': (('recv_month',), None),
+    'date': (('접수일자',), None),
+    'company': (('업체명',), None),
+    'purpose_sample_type': (('purpose', 'sample_type'), lambda purpose, sample_type: f"{purpose}|{sample_type}"),
+}
+FOOD_ITEM_FLAGS = {
+    'has_purpose': (('purpose',), bool),
+    'has_sample_type': (('sample_type',), bool),
+    'has_item': (('item',), bool),
+    'known_manager': (('manager',), lambda manager: bool(manager) and manager != '미지정'),
+    'known_analyzer': (('analyzer',), lambda analyzer: analyzer != '미지정'),
+    'in_month': (('month',), lambda month: month > 0),
+    # 검사목적+검체유형별-항목 매핑에서 잔류농약, 항생물질 검체유형 제외
+    'itemized_sample_type': (('sample_type',),
+                             lambda sample_type: not (sample_type or '').startswith(('잔류농약', '항생물질'))),
+    'pesticide_reference': (('purpose',), lambda purpose: purpose == '잔류농약(참고용)'),
+    'antibiotic_reference': (('purpose',), lambda purpose: purpose == '항생물질(참고용)'),
+    'reference_purpose': (('purpose',), lambda purpose: purpose in ('잔류농약(참고용)', '항생물질(참고용)')),
+}
+FOOD_ITEM_AGGREGATIONS = {
+    'total': {'dims': (), 'measures': ('fee', 'samples')},
+    'pesticide_reference': {'dims': (), 'where': ('pesticide_reference',), 'measures': ('samples',)},
+    'antibiotic_reference': {'dims': (), 'where': ('antibiotic_reference',), 'measures': ('samples',)},
+    # 목록, 검사목적-검체유형(-항목) 매핑 (필터 적용 전 전체 행)
+    'purposes': {'dims': ('purpose',), 'where': ('has_purpose',), 'all_rows': True, 'measures': ()},
+    'sample_types': {'dims': ('sample_type',), 'where': ('has_sample_type',), 'all_rows': True, 'measures': ()},
+    'items': {'dims': ('item',), 'where': ('has_item',), 'all_rows': True, 'measures': ()},
+    'managers': {'dims': ('manager',), 'where': ('known_manager',), 'all_rows': True, 'measures': ()},
+    'analyzers': {'dims': ('analyzer',), 'where': ('known_analyzer',), 'all_rows': True, 'measures': ()},
+    'purpose_sample_type': {'dims': ('purpose', 'sample_type'), 'where': ('has_purpose', 'has_sample_type'),
+                            'all_rows': True, 'measures': ()},
+    'purpose_sample_type_item': {'dims': ('purpose_sample_type', 'item'),
+                                 'where': ('has_purpose', 'has_sample_type', 'has_item', 'itemized_sample_type'),
+                                 'all_rows': True, 'measures': ()},
+    # 항목별
+    'item': {'dims': ('item',), 'where': ('has_item',), 'sort': 'rows', 'measures': ('rows', 'fee')},
+    'item_month': {'dims': ('item', 'month'), 'where': ('has_item', 'in_month'), 'measures': ('rows',)},
+    'item_analyzer': {'dims': ('item', 'analyzer'), 'where': ('has_item',), 'measures': ('rows', 'fee')},
+    'sample_type': {'dims': ('sample_type',), 'where': ('has_sample_type',), 'measures': ()},
+    'sample_type_item': {'dims': ('sample_type', 'item'), 'where': ('has_sample_type', 'has_item'),
+                         'measures': ('rows', 'fee')},
+    'purpose_item': {'dims': ('purpose', 'item'), 'where': ('has_purpose', 'has_item'),
+                     'measures': ('rows', 'fee')},
+    # 영업담당별, 월별, 분석자별
+    'manager': {'dims': ('manager',), 'sort': 'fee', 'measures': ('fee', 'samples')},
+    'manager_item': {'dims': ('manager', 'item'), 'where': ('has_item',), 'measures': ('rows', 'fee')},
+    'month': {'dims': ('month',), 'where': ('in_month',), 'measures': ('fee', 'samples')},
+    'month_item': {'dims': ('month', 'item'), 'where': ('in_month', 'has_item'), 'measures': ('rows',)},
+    'analyzer': {'dims': ('analyzer',), 'where': ('known_analyzer',), 'sort': 'samples', 'top': 30,
+                 'measures': ('fee', 'samples')},
+    'analyzer_item': {'dims': ('analyzer', 'item'), 'where': ('known_analyzer', 'has_item'), 'measures': ('rows',)},
+}
 
-    # 잔류농약/항생물질(참고용) 중복 제거를 위한 고유 샘플 추적
-    unique_pesticide_samples = set()  # (접수일자, 업체명, 검체유형) 조합으로 고유 식별
-    pesticide_unique_count = 0  # 잔류농약(참고용) 고유 건수
-    antibiotic_unique_count = 0  # 항생물질(참고용) 고유 건수
 
-    for row in data:
-        purpose = str(row.get('검사목적', '') or '').strip()
-        sample_type = str(row.get('검체유형', '') or '').strip()
-        item_name = str(row.get('항목명', '') or '').strip()
-        manager = str(row.get('영업담당', '') or '').strip() or '미지정'
-        analyzer = str(row.get('결과입력자', '') or '').strip() or '미지정'
-        fee = row.get('항목수수료', 0) or 0
-        date = row.get('접수일자')
-        company = str(row.get('업체명', '') or '').strip()
-
-        if isinstance(fee, str):
-            fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
-
-        # 목록 수집
-        if purpose: purposes.add(purpose)
-        if sample_type: sample_types.add(sample_type)
-        if item_name: items.add(item_name)
-        if manager and manager != '미지정': managers.add(manager)
-        if analyzer and analyzer != '미지정': analyzers.add(analyzer)
-
-        # 검사목적별-검체유형 매핑 수집
-        if purpose and sample_type:
-            if purpose not in by_purpose_sample_type:
-                by_purpose_sample_type[purpose] = set()
-            by_purpose_sample_type[purpose].add(sample_type)
-
-        # 검사목적+검체유형별-항목 매핑 수집 (잔류농약, 항생물질 제외)
-        if purpose and sample_type and item_name:
-            if not (sample_type.startswith('잔류농약') or sample_type.startswith('항생물질')):
-                key = f"{purpose}|{sample_type}"
-                if key not in by_purpose_sample_type_item:
-                    by_purpose_sample_type_item[key] = set()
-                by_purpose_sample_type_item[key].add(item_name)
-
-        # 필터 적용
+def process_food_item_data(data, purpose_filter=None, sample_type_filter=None,
+                           item_filter=None, manager_filter=None):
+    """검사항목 데이터 처리 (FOOD_ITEM_AGGREGATIONS 명세를 행 한 번 순회로 계산)"""
+    def is_selected(purpose, sample_type, item_name, manager):
         if purpose_filter and purpose_filter != '전체' and purpose != purpose_filter:
-            continue
+            return False
         # 검체유형 필터 (와일드카드 지원)
         if sample_type_filter and sample_type_filter != '전체':
             if sample_type_filter.endswith('*'):
                 # 와일드카드 패턴: "잔류농약*" -> 잔류농약으로 시작하는 모든 유형 매칭
-                prefix = sample_type_filter[:-1]  # '*' 제거
-                if not sample_type.startswith(prefix):
-                    continue
+                if not sample_type.startswith(sample_type_filter[:-1]):
+                    return False
             elif sample_type != sample_type_filter:
-                continue
+                return False
         if item_filter and item_filter != '전체' and item_name != item_filter:
-            continue
+            return False
         if manager_filter and manager_filter != '전체' and manager != manager_filter:
-            continue
+            return False
+        return True
 
-        # 월 추출
-        month = 0
-        if date:
-            if hasattr(date, 'month'):
-                month = date.month
-            else:
-                try:
-                    month = int(str(date).split('-')[1])
-                except:
-                    month = 0
+    # 잔류농약/항생물질(참고용) 중복 제거를 위한 고유 샘플 추적
+    unique_pesticide_samples = set()  # (접수일자, 업체명, 검체유형) 조합으로 고유 식별
 
-        total_fee += fee
+    def sample_counts(rows, columns):
+        """행별 샘플 건수 (필터를 통과한 행만 고유 샘플 추적, 참고용 잔류농약/항생물질은 고유 샘플의 첫 행만 1)"""
+        counts = []
+        for i, (is_selected_row, is_reference) in enumerate(zip(columns['selected'], columns['reference_purpose'])):
+            if is_selected_row and is_reference:
+                unique_key = (str(columns['date'][i]), columns['company'][i], columns['sample_type'][i])
+                if unique_key in unique_pesticide_samples:
+                    counts.append(0)  # 이미 카운트된 샘플
+                    continue
+                unique_pesticide_samples.add(unique_key)
+            counts.append(1 if is_selected_row else 0)
+        return counts
 
-        # 잔류농약(참고용), 항생물질(참고용)은 접수일자+업체명+검체유형으로 고유 카운트
-        is_pesticide_ref = purpose == '잔류농약(참고용)'
-        is_antibiotic_ref = purpose == '항생물질(참고용)'
-        should_count_as_sample = True  # 이 행을 샘플 건수로 카운트할지 여부
+    groups = run_aggregations(
+        data, FOOD_ITEM_AGGREGATIONS, FOOD_ITEM_DIMENSIONS, FOOD_ITEM_FLAGS,
+        {'rows': lambda rows, columns: [1] * len(rows), 'fee': '항목수수료', 'samples': sample_counts},
+        selected=(('purpose', 'sample_type', 'item', 'manager'), is_selected))
+    return _food_item_result(groups)
 
-        if is_pesticide_ref or is_antibiotic_ref:
-            # 고유 식별 키: 접수일자 + 업체명 + 검체유형
-            unique_key = (str(date), company, sample_type)
-            if unique_key not in unique_pesticide_samples:
-                unique_pesticide_samples.add(unique_key)
-                total_count += 1
-                if is_pesticide_ref:
-                    pesticide_unique_count += 1
-                else:
-                    antibiotic_unique_count += 1
-            else:
-                should_count_as_sample = False  # 이미 카운트된 샘플
-        else:
-            # 일반 항목은 건별로 카운트
-            total_count += 1
 
-        # 항목별 집계
-        if item_name:
-            if item_name not in by_item:
-                by_item[item_name] = {'count': 0, 'fee': 0}
-            by_item[item_name]['count'] += 1
-            by_item[item_name]['fee'] += fee
-
-            # 항목별-월별
-            if month > 0:
-                if item_name not in by_item_month:
-                    by_item_month[item_name] = {}
-                if month not in by_item_month[item_name]:
-                    by_item_month[item_name][month] = 0
-                by_item_month[item_name][month] += 1
-
-            # 항목별-분석자
-            if item_name not in by_item_analyzer:
-                by_item_analyzer[item_name] = {}
-            if analyzer not in by_item_analyzer[item_name]:
-                by_item_analyzer[item_name][analyzer] = {'count': 0, 'fee': 0}
-            by_item_analyzer[item_name][analyzer]['count'] += 1
-            by_item_analyzer[item_name][analyzer]['fee'] += fee
-
-        # 검체유형별-항목
-        if sample_type:
-            if sample_type not in by_sample_type_item:
-                by_sample_type_item[sample_type] = {}
-            if item_name:
-                if item_name not in by_sample_type_item[sample_type]:
-                    by_sample_type_item[sample_type][item_name] = {'count': 0, 'fee': 0}
-                by_sample_type_item[sample_type][item_name]['count'] += 1
-                by_sample_type_item[sample_type][item_name]['fee'] += fee
-
-        # 영업담당별 집계 (잔류농약/항생물질은 고유 샘플만 카운트)
-        if manager not in by_manager_item:
-            by_manager_item[manager] = {'count': 0, 'fee': 0, 'items': {}}
-        if should_count_as_sample:
-            by_manager_item[manager]['count'] += 1
-        by_manager_item[manager]['fee'] += fee
-        if item_name:
-            if item_name not in by_manager_item[manager]['items']:
-                by_manager_item[manager]['items'][item_name] = {'count': 0, 'fee': 0}
-            by_manager_item[manager]['items'][item_name]['count'] += 1
-            by_manager_item[manager]['items'][item_name]['fee'] += fee
-
-        # 월별 수수료 (잔류농약/항생물질은 고유 샘플만 카운트)
-        if month > 0:
-            if month not in by_month_fee:
-                by_month_fee[month] = {'count': 0, 'fee': 0}
-            if should_count_as_sample:
-                by_month_fee[month]['count'] += 1
-            by_month_fee[month]['fee'] += fee
-
-            # 월별-항목 (NEW)
-            if item_name:
-                if month not in by_month_item:
-                    by_month_item[month] = {}
-                if item_name not in by_month_item[month]:
-                    by_month_item[month][item_name] = 0
-                by_month_item[month][item_name] += 1
-
-        # 검사목적별-항목 (NEW)
-        if purpose and item_name:
-            if purpose not in by_purpose_item:
-                by_purpose_item[purpose] = {}
-            if item_name not in by_purpose_item[purpose]:
-                by_purpose_item[purpose][item_name] = {'count': 0, 'fee': 0}
-            by_purpose_item[purpose][item_name]['count'] += 1
-            by_purpose_item[purpose][item_name]['fee'] += fee
-
-        # 분석자별 집계 (잔류농약/항생물질은 고유 샘플만 카운트)
-        if analyzer and analyzer != '미지정':
-            if analyzer not in by_analyzer:
-                by_analyzer[analyzer] = {'count': 0, 'fee': 0, 'items': set()}
-            if should_count_as_sample:
-                by_analyzer[analyzer]['count'] += 1
-            by_analyzer[analyzer]['fee'] += fee
-            if item_name:
-                by_analyzer[analyzer]['items'].add(item_name)
-
-            # 분석자별-항목 (NEW)
-            if item_name:
-                if analyzer not in by_analyzer_item:
-                    by_analyzer_item[analyzer] = {}
-                if item_name not in by_analyzer_item[analyzer]:
-                    by_analyzer_item[analyzer][item_name] = 0
-                by_analyzer_item[analyzer][item_name] += 1
-
-    # 항목별 분석자 다양성 계산 (NEW)
+def _food_item_result(groups):
+    """FOOD_ITEM_AGGREGATIONS 그룹 결과 → /api/food_item 응답 (python/SQL 실행 공용)"""
+    def item_amounts(rows, fee):
+        return {'count': rows, 'fee': fee}
+
+    by_item_month = {}  # 항목별-월별 데이터
+    for item_name, month, rows in groups['item_month']:
+        by_item_month.setdefault(item_name, []).append((month, rows))
+    by_item_analyzer = {}  # 항목별-분석자 데이터
+    for item_name, analyzer, rows, fee in groups['item_analyzer']:
+        by_item_analyzer.setdefault(item_name, {})[analyzer] = item_amounts(rows, fee)
+    by_sample_type_item = {sample_type: {} for sample_type, in groups['sample_type']}  # 검체유형별-항목 데이터
+    for sample_type, item_name, rows, fee in groups['sample_type_item']:
+        by_sample_type_item[sample_type][item_name] = item_amounts(rows, fee)
+    manager_items = {}  # 영업담당별-항목 데이터
+    for manager, item_name, rows, fee in groups['manager_item']:
+        manager_items.setdefault(manager, {})[item_name] = item_amounts(rows, fee)
+    by_month_item = {}  # 월별-항목 데이터
+    for month, item_name, rows in groups['month_item']:
+        by_month_item.setdefault(month, {})[item_name] = rows
+    by_purpose_item = {}  # 검사목적별-항목 데이터
+    for purpose, item_name, rows, fee in groups['purpose_item']:
+        by_purpose_item.setdefault(purpose, {})[item_name] = item_amounts(rows, fee)
+    by_analyzer_item = {}  # 분석자별-항목 데이터
+    for analyzer, item_name, rows in groups['analyzer_item']:
+        by_analyzer_item.setdefault(analyzer, {})[item_name] = rows
+    by_purpose_sample_type = {}  # 검사목적별-검체유형 매핑
+    for purpose, sample_type in groups['purpose_sample_type']:
+        by_purpose_sample_type.setdefault(purpose, []).append(sample_type)
+    by_purpose_sample_type_item = {}  # 검사목적+검체유형별-항목 매핑
+    for key, item_name in groups['purpose_sample_type_item']:
+        by_purpose_sample_type_item.setdefault(key, []).append(item_name)
+
+    total_fee, total_count = groups['total'][0] if groups['total'] else (0, 0)
+    pesticide_unique_count = groups['pesticide_reference'][0][0] if groups['pesticide_reference'] else 0
+    antibiotic_unique_count = groups['antibiotic_reference'][0][0] if groups['antibiotic_reference'] else 0
+
+    # 항목별 분석자 다양성 계산
     item_analyzer_diversity = []
     for item_name, analyzers_data in by_item_analyzer.items():
         analyzer_count = len(analyzers_data)
@@ -1833,28 +3307,27 @@ def process_food_item_data(data, purpose_filter=None, sample_type_filter=None,
         })
     item_analyzer_diversity.sort(key=lambda x: x['total_count'], reverse=True)
 
-    # 결과 정리
-    by_item_sorted = sorted(by_item.items(), key=lambda x: x[1]['count'], reverse=True)
-    by_manager_sorted = sorted(by_manager_item.items(), key=lambda x: x[1]['fee'], reverse=True)
-
-    # 분석자별 정렬
-    by_analyzer_sorted = [(name, {'count': d['count'], 'fee': d['fee'], 'item_count': len(d['items'])})
-                          for name, d in sorted(by_analyzer.items(), key=lambda x: x[1]['count'], reverse=True)]
+    # 결과 정리 (명세의 sort/top으로 이미 정렬됨)
+    by_item_sorted = [(item_name, item_amounts(rows, fee)) for item_name, rows, fee in groups['item']]
+    by_manager_sorted = [(manager, {'count': samples, 'fee': fee, 'items': manager_items.get(manager, {})})
+                         for manager, fee, samples in groups['manager']]
+    by_analyzer_sorted = [(name, {'count': samples, 'fee': fee, 'item_count': len(by_analyzer_item.get(name, {}))})
+                          for name, fee, samples in groups['analyzer']]
 
     return {
         'by_item': by_item_sorted,
-        'by_item_month': {k: list(v.items()) for k, v in by_item_month.items()},
+        'by_item_month': by_item_month,
         'by_item_analyzer': {k: sorted(v.items(), key=lambda x: x[1]['count'], reverse=True)
                             for k, v in by_item_analyzer.items()},
         'by_sample_type_item': {k: sorted(v.items(), key=lambda x: x[1]['count'], reverse=True)
                                for k, v in by_sample_type_item.items()},
         'by_manager_item': by_manager_sorted,
-        'by_month_fee': list(by_month_fee.items()),
-        'purposes': sorted(purposes),
-        'sample_types': sorted(sample_types),
-        'items': sorted(items),
-        'managers': sorted(managers),
-        'analyzers': sorted(analyzers),
+        'by_month_fee': [(month, {'count': samples, 'fee': fee}) for month, fee, samples in groups['month']],
+        'purposes': sorted(purpose for purpose, in groups['purposes']),
+        'sample_types': sorted(sample_type for sample_type, in groups['sample_types']),
+        'items': sorted(item_name for item_name, in groups['items']),
+        'managers': sorted(manager for manager, in groups['managers']),
+        'analyzers': sorted(analyzer for analyzer, in groups['analyzers']),
         'total_fee': total_fee,
         'total_count': total_count,
         'pesticide_unique_count': pesticide_unique_count,  # 잔류농약(참고용) 고유 건수
@@ -1864,7 +3337,7 @@ def process_food_item_data(data, purpose_filter=None, sample_type_filter=None,
         # 새로운 데이터 (전체 항목 포함 - UI에서 필요시 제한)
         'by_purpose_item': {k: sorted(v.items(), key=lambda x: x[1]['count'], reverse=True)
                            for k, v in by_purpose_item.items()},
-        'by_analyzer': by_analyzer_sorted[:30],
+        'by_analyzer': by_analyzer_sorted,
         'by_analyzer_item': {k: sorted(v.items(), key=lambda x: x[1], reverse=True)[:20]
                             for k, v in by_analyzer_item.items()},
         'by_month_item': {m: sorted(items.items(), key=lambda x: x[1], reverse=True)[:10]
@@ -1872,6 +3345,132 @@ def process_food_item_data(data, purpose_filter=None, sample_type_filter=None,
         'item_analyzer_diversity': item_analyzer_diversity[:50]
     }
 
+
+# FOOD_ITEM_AGGREGATIONS의 SQL 표현 (process_food_item_data_sqlite) - 차원/플래그는 food_item_data 컬럼 식
+_FOOD_ITEM_SQL_REFERENCE = "COALESCE(검사목적, '') IN ('잔류농약(참고용)', '항생물질(참고용)')"
+FOOD_ITEM_SQL_DIMENSIONS = {
+    'purpose': '검사목적',
+    'sample_type': '검체유형',
+    'item': '항목명',
+    'manager': f"COALESCE(NULLIF(영업담당, ''), '{DEFAULT_MANAGER}')",
+    'analyzer': "COALESCE(NULLIF(결과입력자, ''), '미지정')",
+    'month': 'recv_month',
+    'purpose_sample_type': "검사목적 || '|' || 검체유형",
+}
+FOOD_ITEM_SQL_FLAGS = {
+    'has_purpose': "검사목적 != ''",
+    'has_sample_type': "검체유형 != ''",
+    'has_item': "항목명 != ''",
+    'known_manager': "영업담당 != '' AND 영업담당 != '미지정'",
+    'known_analyzer': "결과입력자 != '' AND 결과입력자 != '미지정'",
+    'in_month': 'recv_month > 0',
+    'itemized_sample_type': "substr(COALESCE(검체유형, ''), 1, 4) NOT IN ('잔류농약', '항생물질')",
+    'pesticide_reference': "검사목적 = '잔류농약(참고용)'",
+    'antibiotic_reference': "검사목적 = '항생물질(참고용)'",
+    'reference_purpose': _FOOD_ITEM_SQL_REFERENCE,
+}
+# sample: 필터를 통과한 행 중 참고용 잔류농약/항생물질은 (접수일자, 업체명, 검체유형) 고유 샘플의 첫 행만 1
+FOOD_ITEM_SQL_MEASURES = {'rows': 'COUNT(*)', 'fee': 'TOTAL(항목수수료)', 'samples': 'SUM(sample)'}
+# 전체 합계(total)의 샘플 수는 고유 샘플 키의 COUNT(DISTINCT)로 센다 - 목적별 고유 건수는 두 참고용 목적이
+# 고유 샘플 집합을 함께 쓰므로 (먼저 나온 목적에만 셈) 첫 행 표시(sample)의 합계로 센다
+FOOD_ITEM_SQL_UNIQUE_SAMPLES = (
+    f"SUM(NOT ({_FOOD_ITEM_SQL_REFERENCE})) + COUNT(DISTINCT CASE WHEN {_FOOD_ITEM_SQL_REFERENCE} "
+    "THEN quote(접수일자) || ',' || quote(업체명) || ',' || quote(검체유형) END)")
+
+
+def _food_item_sql_filters(year, purpose_filter, sample_type_filter, item_filter, manager_filter):
+    """process_food_item_data 필터 → (WHERE 식, 파라미터) - (year, 검사목적, 검체유형, 항목명) 등 복합 인덱스 사용"""
+    conditions, params = ['year = ?'], [str(year)]
+    if purpose_filter and purpose_filter != '전체':
+        conditions.append('검사목적 = ?')
+        params.append(purpose_filter)
+    if sample_type_filter and sample_type_filter != '전체':
+        if sample_type_filter.endswith('*'):
+            # 와일드카드 패턴: "잔류농약*" -> 접두어 범위 (인덱스 범위 검색)
+            prefix = sample_type_filter[:-1]
+            conditions.append('검체유형 >= ? AND 검체유형 < ?')
+            params.extend([prefix, prefix + '\U0010ffff'])
+        else:
+            conditions.append('검체유형 = ?')
+            params.append(sample_type_filter)
+    if item_filter and item_filter != '전체':
+        conditions.append('항목명 = ?')
+        params.append(item_filter)
+    if manager_filter and manager_filter != '전체':
+        # 빈 영업담당은 '미지정'으로 묶어 집계하므로 '미지정' 필터는 빈 값도 포함 (인덱스 사용 가능한 형태)
+        conditions.append("영업담당 IN ('', ?)" if manager_filter == DEFAULT_MANAGER else '영업담당 = ?')
+        params.append(manager_filter)
+    return ' AND '.join(conditions), params
+
+
+def process_food_item_data_sqlite(year, purpose_filter=None, sample_type_filter=None,
+                                  item_filter=None, manager_filter=None):
+    """검사항목 데이터 처리 (SQLite에서 직접 집계 - process_food_item_data와 같은 결과)
+
+    필터는 WHERE로 내려 통과한 행만 임시 테이블(원본 파일 순서, rowid = 순번)에 담고,
+    FOOD_ITEM_AGGREGATIONS 명세마다 GROUP BY 한 번을 실행한다. 그룹 순서는 python 실행과 같은
+    첫 등장 순서 (MIN(rowid)), 필터 전 목록/매핑(all_rows)은 정렬해서 쓰므로 원본 테이블에서 바로 센다.
+    DB가 정규화 이전 스키마면 sqlite3.DatabaseError (스키마 변환은 시작 시 migrate_sqlite_schema에서만).
+    """
+    import sqlite3
+    import time
+
+    start_time = time.time()
+    conn = sqlite3.connect(str(SQLITE_DB))
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='food_item_data'")
+    if not cursor.fetchone():
+        conn.close()
+        print(f"[SQLITE] food_item_data 테이블 없음")
+        return process_food_item_data([])
+
+    try:
+        _require_current_schema(cursor, 'food_item_data')
+        cursor.execute('PRAGMA temp_store = MEMORY')
+        cursor.execute("PRAGMA table_info(food_item_data)")
+        order_by = 'source_file, id' if 'source_file' in [col[1] for col in cursor.fetchall()] else 'id'
+        where, params = _food_item_sql_filters(year, purpose_filter, sample_type_filter, item_filter, manager_filter)
+        cursor.execute(f'''
+            CREATE TEMP TABLE food_selected AS
+            SELECT 검사목적, 검체유형, 항목명, 영업담당, 결과입력자, recv_month, 항목수수료, 접수일자, 업체명,
+                   1 AS sample
+            FROM food_item_data WHERE {where} ORDER BY {order_by}
+        ''', params)
+        # 참고용 잔류농약/항생물질: 고유 샘플별 첫 행(가장 작은 rowid)만 1
+        cursor.execute(f'''
+            UPDATE food_selected SET sample = rowid IN (
+                SELECT MIN(rowid) FROM food_selected WHERE {_FOOD_ITEM_SQL_REFERENCE} GROUP BY 접수일자, 업체명, 검체유형)
+            WHERE {_FOOD_ITEM_SQL_REFERENCE}
+        ''')
+
+        groups = {}
+        for spec_name, spec in FOOD_ITEM_AGGREGATIONS.items():
+            dims = [FOOD_ITEM_SQL_DIMENSIONS[name] for name in spec['dims']]
+            conditions = [f"({FOOD_ITEM_SQL_FLAGS[name]})" for name in spec.get('where', ())]
+            measures = [FOOD_ITEM_SQL_UNIQUE_SAMPLES if name == 'samples' and not dims and not conditions
+                        else FOOD_ITEM_SQL_MEASURES[name] for name in spec.get('measures', FOOD_ITEM_SQL_MEASURES)]
+            if spec.get('all_rows'):
+                source, spec_params = 'food_item_data', [str(year)]
+                conditions.insert(0, 'year = ?')
+            else:
+                source, spec_params = 'food_selected', []
+            sql = f"SELECT {', '.join(dims + measures + ['MIN(rowid)'])} FROM {source}"
+            if conditions:
+                sql += ' WHERE ' + ' AND '.join(conditions)
+            if dims:
+                sql += f" GROUP BY {', '.join(dims)}"
+            # 마지막 MIN(rowid)로 첫 등장 순서 정렬 (그룹 수만큼만 정렬) - 그룹 없는 합계에 행이 없으면 NULL
+            rows = sorted((row for row in cursor.execute(sql, spec_params) if row[-1] is not None),
+                          key=lambda row: row[-1])
+            rows = [row[:-1] for row in rows]
+            groups[spec_name] = _finish_groups(rows, spec, spec.get('measures', FOOD_ITEM_SQL_MEASURES))
+        selected_count = cursor.execute('SELECT COUNT(*) FROM food_selected').fetchone()[0]
+    finally:
+        conn.close()
+
+    print(f"[SQLITE] food_item {year}년 SQL 집계: {selected_count:,}건, {time.time() - start_time:.2f}초")
+    return _food_item_result(groups)
+
 def extract_region(address):
     """주소에서 시/도, 시/군/구 추출"""
     if not address:
@@ -1926,467 +3525,486 @@ def extract_region(address):
 
     return sido, sigungu
 
-def process_data(data, purpose_filter=None, prev_year_clients=None):
-    """데이터 처리
+def client_retention(month_clients, prev_year_clients=None, cumulative=False):
+    """월별 거래처 집합 → 월별 기존/신규 거래처와 유지율
 
-    Args:
-        data: 처리할 데이터 목록
-        purpose_filter: 검사목적 필터 (옵션)
-        prev_year_clients: 전년도 거래처 목록 (신규/기존 판단용)
+    기존 거래처는 전년도 또는 이전 월에 거래한 적 있는 거래처. 거래처마다 첫 거래월을 한 번 구해
+    신규 수를 세므로 누적 집합을 매월 교차하지 않는다.
+    cumulative: 누적 거래처 수와 전년도 대비 유지 거래처 수도 포함 (전체 합산용)
     """
-    by_manager = {}
-    by_branch = {}
-    by_month = {}
-    by_client = {}
-    by_purpose = {}
-    by_defect = {}
-    by_defect_month = {}
-    by_defect_purpose = {}  # 부적합-검사목적별 데이터
-    by_defect_purpose_month = {}  # 부적합-검사목적별-월별 데이터
-    by_defect_manager = {}  # 부적합-담당자별 데이터
-    by_defect_client = {}  # 부적합-업체별 데이터
-    by_defect_season = {}  # 부적합-계절별 데이터
-    defect_monthly_total = {}  # 부적합 월별 총 건수
-    by_purpose_month = {}  # 목적별-월별 데이터
-    by_region = {}  # 지역별 데이터
-    by_region_manager = {}  # 지역-담당자별 데이터
-    by_purpose_manager = {}  # 목적별-담당자 데이터
-    by_purpose_region = {}  # 목적별-지역 데이터
-    by_sample_type = {}  # 검체유형별 데이터
-    by_sample_type_month = {}  # 검체유형별-월별 데이터
-    by_sample_type_manager = {}  # 검체유형별-담당자 데이터
-    by_sample_type_purpose = {}  # 검체유형별-목적 데이터
-    by_urgent_month = {}  # 월별 긴급 데이터
-    by_branch_month_clients = {}  # 지사별 월별 거래처 (중복 분석용)
-    purpose_month_clients = {}  # 목적별 월별 거래처 (필터링용)
-    client_purpose_months = {}  # 거래처+목적별 월별 거래 추적 (지속적인 거래 분석용)
-    client_sample_type_months = {}  # 거래처+검체유형별 월별 거래 추적
-    by_department = {}  # 부서별 데이터 (본사, 마케팅, 영업부, 지사)
-    purposes = set()
-    sample_types = set()  # 검체유형 목록
-    total_sales = 0
-    total_count = 0
-
-    # 주소 컬럼 자동 감지
-    address_columns = ['거래처 주소', '채품지주소', '채품장소', '주소', '시료주소', '업체주소', '거래처주소', '검체주소', '시료채취장소']
+    prev = prev_year_clients or ()
+    months = sorted(month_clients.keys())
+    first_month = {}
+    for month in months:
+        for client in month_clients[month]:
+            first_month.setdefault(client, month)
+    new_by_month = {}
+    for client, month in first_month.items():
+        if client not in prev:
+            new_by_month[month] = new_by_month.get(month, 0) + 1
+
+    retention_data = []
+    known = len(prev)  # 전년도 + 이전 월 거래처 수
+    for month in months:
+        clients = month_clients[month]
+        new_clients = new_by_month.get(month, 0)
+        overlap = len(clients) - new_clients
+        retention_rate = (overlap / known * 100) if known else 0
+        entry = {
+            'month': month,
+            'total': len(clients),
+            'overlap': overlap,
+            'retention': round(retention_rate, 1),
+            'new': new_clients
+        }
+        known += new_clients
+        if cumulative:
+            entry['cumulative'] = known
+            entry['prev_year_overlap'] = sum(1 for client in clients if client in prev)  # 전년도 대비 유지 거래처
+        retention_data.append(entry)
+    return retention_data
+
+
+# process_data 집계 명세 (run_aggregations / _CubeColumns.aggregate) - 새 분석은 명세를 추가하고
+# _dashboard_accumulators에서 결과 모양만 만든다 (행 루프에 분기를 추가하지 않음)
+DASHBOARD_DIMENSIONS = {
+    'purpose': (('검사목적',), None),
+    'manager': (('영업담당',), None),
+    'client': (('거래처',), lambda client: client or '미지정'),
+    'branch': (('branch',), None),
+    'department': (('department',), None),
+    'month': (('recv_month',), None),
+    'sample_type': (('검체유형',), None),
+    'defect': (('부적합항목',), None),
+    'season': (('season',), None),
+    'test_field': (('시험분야',), None),
+    'company_type': (('업체분류',), None),
+    'address': (('client_address',), None),
+    'sido': (('sido',), None),
+    'sigungu': (('sigungu',), None),
+    'region': (('sido', 'sigungu'), lambda sido, sigungu: f"{sido} {sigungu}" if sigungu else sido),
+    'client_purpose': (('client', 'purpose'), lambda client, purpose: f"{client}|{purpose}"),
+    'client_sample_type': (('client', 'sample_type'), lambda client, sample_type: f"{client}|{sample_type}"),
+}
+DASHBOARD_FLAGS = {
+    'has_purpose': (('purpose',), bool),
+    'has_sample_type': (('sample_type',), bool),
+    'has_defect': (('defect',), bool),
+    'has_region': (('sido',), bool),
+    'has_test_field': (('test_field',), bool),
+    'has_company_type': (('company_type',), bool),
+    'has_address': (('address',), bool),
+    'in_month': (('month',), lambda month: month > 0),
+    'urgent': (('is_urgent',), bool),  # '일반'이 아니고 값이 있으면 긴급 (수집 시 계산)
+    'known_manager': (('manager',), lambda manager: bool(manager) and manager != '미지정'),
+    'known_client': (('client',), lambda client: client != '미지정'),
+    'counted_client': (('client',), lambda client: client not in EXCLUDED_CLIENTS),
+}
+DASHBOARD_MEASURES = {'sales': '공급가액', 'count': 'row_count'}
+# 금액 합계 반올림 자릿수 - 큐브 셀은 공급가액을 SQL에서 미리 합산하므로 float 합산 순서가 행 루프와 다르다.
+# 원 단위 미만 금액이 있어도 큐브/행 단위 결과가 같은 값이 되도록 그룹 합계를 반올림한다 (정렬 전)
+DASHBOARD_MEASURE_DECIMALS = {'sales': 2}
+DASHBOARD_AGGREGATIONS = {
+    'total': {'dims': ()},
+    'purposes': {'dims': ('purpose',), 'where': ('has_purpose',), 'all_rows': True, 'measures': ()},
+    'sample_types': {'dims': ('sample_type',), 'where': ('has_sample_type',), 'measures': ()},
+    # 매니저별
+    'manager': {'dims': ('manager',)},
+    'manager_purpose': {'dims': ('manager', 'purpose'), 'where': ('has_purpose',)},
+    'manager_urgent': {'dims': ('manager',), 'where': ('urgent',), 'measures': ('count',)},
+    'manager_urgent_purpose': {'dims': ('manager', 'purpose'), 'where': ('urgent', 'has_purpose'),
+                               'measures': ('count',)},
+    'manager_client': {'dims': ('manager', 'client')},
+    # 지사별, 부서별
+    'branch': {'dims': ('branch',)},
+    'branch_manager': {'dims': ('branch', 'manager'), 'measures': ()},
+    'branch_purpose': {'dims': ('branch', 'purpose'), 'where': ('has_purpose',)},
+    'department': {'dims': ('department',)},
+    # 월별
+    'month': {'dims': ('month',), 'where': ('in_month',)},
+    'month_client': {'dims': ('month', 'client'), 'where': ('in_month', 'counted_client'), 'measures': ()},
+    'month_purpose': {'dims': ('month', 'purpose'), 'where': ('in_month', 'has_purpose')},
+    'month_manager': {'dims': ('month', 'manager'), 'where': ('in_month',)},
+    'month_manager_purpose': {'dims': ('month', 'manager', 'purpose'), 'where': ('in_month', 'has_purpose')},
+    'month_branch': {'dims': ('month', 'branch'), 'where': ('in_month',)},
+    'month_branch_purpose': {'dims': ('month', 'branch', 'purpose'), 'where': ('in_month', 'has_purpose')},
+    'urgent_month': {'dims': ('month',), 'where': ('in_month', 'urgent')},
+    'urgent_month_manager': {'dims': ('month', 'manager'), 'where': ('in_month', 'urgent', 'known_manager')},
+    'urgent_month_purpose': {'dims': ('month', 'purpose'), 'where': ('in_month', 'urgent', 'has_purpose')},
+    'branch_month': {'dims': ('branch', 'month'), 'where': ('in_month',), 'measures': ()},
+    'branch_month_client': {'dims': ('branch', 'month', 'client'), 'where': ('in_month', 'known_client'),
+                            'measures': ()},
+    'purpose_month_client': {'dims': ('purpose', 'month', 'client'),
+                             'where': ('in_month', 'has_purpose', 'known_client'), 'measures': ()},
+    # 거래처별
+    'client': {'dims': ('client',)},
+    'client_test_field': {'dims': ('client', 'test_field'), 'where': ('has_test_field',), 'measures': ()},
+    'client_company_type': {'dims': ('client', 'company_type'), 'where': ('has_company_type',), 'measures': ()},
+    'client_address': {'dims': ('client',), 'where': ('has_address',), 'first': ('address',), 'measures': ()},
+    'client_manager': {'dims': ('client', 'manager'), 'where': ('known_manager',)},
+    'client_month': {'dims': ('client', 'month'), 'where': ('in_month',), 'measures': ()},
+    'client_purpose': {'dims': ('client', 'purpose'), 'where': ('has_purpose',)},
+    'client_purpose_months': {'dims': ('client_purpose',), 'where': ('in_month', 'has_purpose'),
+                              'first': ('client', 'purpose')},
+    'client_purpose_month': {'dims': ('client_purpose', 'month'), 'where': ('in_month', 'has_purpose'),
+                             'measures': ()},
+    'client_sample_type_months': {'dims': ('client_sample_type',), 'where': ('in_month', 'has_sample_type'),
+                                  'first': ('client', 'sample_type')},
+    'client_sample_type_month': {'dims': ('client_sample_type', 'month'),
+                                 'where': ('in_month', 'has_sample_type'), 'measures': ()},
+    # 검사목적별
+    'purpose': {'dims': ('purpose',), 'where': ('has_purpose',)},
+    'purpose_manager': {'dims': ('purpose', 'manager'), 'where': ('has_purpose',)},
+    'purpose_month': {'dims': ('purpose', 'month'), 'where': ('in_month', 'has_purpose')},
+    'purpose_month_manager': {'dims': ('purpose', 'month', 'manager'), 'where': ('in_month', 'has_purpose')},
+    # 부적합항목별
+    'defect': {'dims': ('defect',), 'where': ('has_defect',), 'measures': ('count',)},
+    'defect_month': {'dims': ('defect', 'month'), 'where': ('has_defect', 'in_month'), 'measures': ('count',)},
+    'defect_total_month': {'dims': ('month',), 'where': ('has_defect', 'in_month'), 'measures': ('count',)},
+    'defect_total_month_purpose': {'dims': ('month', 'purpose'),
+                                   'where': ('has_defect', 'in_month', 'has_purpose'), 'measures': ('count',)},
+    'defect_season': {'dims': ('season',), 'where': ('has_defect', 'in_month'), 'measures': ('count',)},
+    'defect_season_month': {'dims': ('season', 'month'), 'where': ('has_defect', 'in_month'), 'measures': ()},
+    'defect_season_defect': {'dims': ('season', 'defect'), 'where': ('has_defect', 'in_month'),
+                             'measures': ('count',)},
+    'defect_season_purpose': {'dims': ('season', 'purpose'), 'where': ('has_defect', 'in_month', 'has_purpose'),
+                              'measures': ('count',)},
+    'defect_manager': {'dims': ('manager',), 'where': ('has_defect', 'known_manager'), 'measures': ('count',)},
+    'defect_manager_defect': {'dims': ('manager', 'defect'), 'where': ('has_defect', 'known_manager'),
+                              'measures': ('count',)},
+    'defect_manager_purpose': {'dims': ('manager', 'purpose'),
+                               'where': ('has_defect', 'known_manager', 'has_purpose'), 'measures': ('count',)},
+    'defect_client': {'dims': ('client',), 'where': ('has_defect', 'known_client'), 'measures': ('count',)},
+    'defect_client_defect': {'dims': ('client', 'defect'), 'where': ('has_defect', 'known_client'),
+                             'measures': ('count',)},
+    'defect_client_purpose': {'dims': ('client', 'purpose'),
+                              'where': ('has_defect', 'known_client', 'has_purpose'), 'measures': ('count',)},
+    'defect_purpose': {'dims': ('purpose', 'defect'), 'where': ('has_defect', 'has_purpose'),
+                       'measures': ('count',)},
+    'defect_purpose_month': {'dims': ('purpose', 'defect', 'month'),
+                             'where': ('has_defect', 'has_purpose', 'in_month'), 'measures': ('count',)},
+    # 검체유형별
+    'sample_type': {'dims': ('sample_type',), 'where': ('has_sample_type',)},
+    'sample_type_manager': {'dims': ('sample_type', 'manager'), 'where': ('has_sample_type',)},
+    'sample_type_manager_purpose': {'dims': ('sample_type', 'manager', 'purpose'),
+                                    'where': ('has_sample_type', 'has_purpose')},
+    'sample_type_purpose': {'dims': ('sample_type', 'purpose'), 'where': ('has_sample_type', 'has_purpose')},
+    'sample_type_month': {'dims': ('sample_type', 'month'), 'where': ('has_sample_type', 'in_month')},
+    'sample_type_month_manager': {'dims': ('sample_type', 'month', 'manager'),
+                                  'where': ('has_sample_type', 'in_month')},
+    'sample_type_month_purpose': {'dims': ('sample_type', 'month', 'purpose'),
+                                  'where': ('has_sample_type', 'in_month', 'has_purpose')},
+    # 지역별 (수집 시 주소에서 추출한 시/도, 시/군/구)
+    'region': {'dims': ('region',), 'where': ('has_region',), 'first': ('sido', 'sigungu')},
+    'region_manager': {'dims': ('region', 'manager'), 'where': ('has_region',)},
+    'manager_region': {'dims': ('manager', 'region'), 'where': ('has_region',), 'first': ('sido', 'sigungu')},
+    'purpose_region': {'dims': ('purpose', 'region'), 'where': ('has_region', 'has_purpose')},
+}
 
-    for row in data:
-        purpose = str(row.get('검사목적', '') or '').strip()
-        purposes.add(purpose) if purpose else None
+# /api/data 응답 키 → 계산에 필요한 DASHBOARD_AGGREGATIONS 명세
+DASHBOARD_OUTPUTS = {
+    'total_sales': ('total',),
+    'total_count': ('total',),
+    'by_department': ('department',),
+    'by_purpose': ('purpose',),
+    'purposes': ('purposes',),
+    'sample_types': ('sample_types',),
+    'prev_year_client_count': (),
+    'by_manager': ('manager', 'manager_purpose', 'manager_urgent', 'manager_urgent_purpose'),
+    'manager_top_clients': ('manager', 'manager_client'),
+    'manager_regions': ('manager_region',),
+    'purpose_managers': ('purpose_manager',),
+    'by_branch': ('branch', 'branch_manager', 'branch_purpose'),
+    'by_month': ('month', 'month_client', 'month_purpose', 'month_manager', 'month_manager_purpose',
+                 'month_branch', 'month_branch_purpose'),
+    'by_urgent_month': ('month', 'urgent_month', 'urgent_month_manager', 'urgent_month_purpose'),
+    'branch_client_retention': ('branch_month', 'branch_month_client'),
+    'total_client_retention': ('branch_month', 'branch_month_client'),
+    'purpose_client_retention': ('purpose_month_client',),
+    'by_client': ('client', 'client_test_field', 'client_company_type', 'client_address', 'client_manager',
+                  'client_month', 'client_purpose'),
+    'high_efficiency': ('client',),
+    'high_volume': ('client',),
+    'by_region': ('region', 'region_manager'),
+    'region_top_managers': ('region', 'region_manager'),
+    'sido_hierarchy': ('region', 'region_manager'),
+    'purpose_regions': ('purpose_region',),
+    'by_sample_type': ('sample_type',),
+    'by_sample_type_month': ('sample_type_month', 'sample_type_month_manager', 'sample_type_month_purpose'),
+    'sample_type_managers': ('sample_type_manager', 'sample_type_manager_purpose'),
+    'sample_type_purposes': ('sample_type_purpose',),
+    'client_sample_type_months': ('client_sample_type_months', 'client_sample_type_month'),
+    'by_purpose_month': ('purpose_month', 'purpose_month_manager'),
+    'client_purpose_months': ('client_purpose_months', 'client_purpose_month'),
+    'by_defect': ('defect',),
+    'by_defect_month': ('defect_month',),
+    'by_defect_purpose': ('defect_purpose',),
+    'by_defect_purpose_month': ('defect_purpose_month',),
+    'by_defect_manager': ('defect_manager', 'defect_manager_defect', 'defect_manager_purpose'),
+    'by_defect_client': ('defect_client', 'defect_client_defect', 'defect_client_purpose'),
+    'by_defect_season': ('defect_season', 'defect_season_month', 'defect_season_defect', 'defect_season_purpose'),
+    'defect_monthly_total': ('defect_total_month', 'defect_total_month_purpose'),
+}
+# /api/data/<section> 화면 구역별 응답 키 (summary는 KPI/메인 탭, 나머지는 탭 하나가 쓰는 키)
+DASHBOARD_SECTIONS = {
+    'summary': ('total_sales', 'total_count', 'by_department', 'by_purpose', 'purposes', 'sample_types',
+                'prev_year_client_count'),
+    'personal': ('by_manager', 'manager_top_clients', 'manager_regions', 'purpose_managers', 'by_month',
+                 'by_urgent_month', 'by_client'),
+    'team': ('by_branch', 'by_manager', 'by_month', 'branch_client_retention', 'total_client_retention',
+             'purpose_client_retention'),
+    'monthly': ('by_month', 'by_manager', 'by_urgent_month'),
+    'client': ('by_client', 'by_month', 'high_efficiency', 'high_volume'),
+    'region': ('by_region', 'region_top_managers', 'sido_hierarchy', 'manager_regions', 'purpose_regions',
+               'by_client'),
+    'sample_type': ('by_sample_type', 'by_sample_type_month', 'sample_type_managers', 'sample_type_purposes',
+                    'client_sample_type_months'),
+    'defect': ('by_defect', 'by_defect_month', 'by_defect_purpose', 'by_defect_purpose_month', 'by_defect_manager',
+               'by_defect_client', 'by_defect_season', 'defect_monthly_total'),
+    'purpose': ('by_purpose_month', 'purpose_managers', 'client_purpose_months', 'by_client', 'by_manager',
+                'by_month'),
+}
 
-        # 검사목적 필터 적용
-        if purpose_filter and purpose_filter != '전체' and purpose != purpose_filter:
-            continue
 
-        manager = row.get('영업담당', '미지정')
-        sales = row.get('공급가액', 0) or 0
-        date = row.get('접수일자')
-        client = str(row.get('거래처', '') or '').strip() or '미지정'
-        defect = str(row.get('부적합항목', '') or '').strip()
-        sample_type = str(row.get('검체유형', '') or '').strip()
-        urgent_raw = str(row.get('긴급여부', '') or '').strip()
-        # '일반'이 아니고 값이 있으면 모두 긴급으로 처리
-        is_urgent = urgent_raw and urgent_raw != '일반'
-        if sample_type:
-            sample_types.add(sample_type)
-
-        if isinstance(sales, str):
-            sales = float(sales.replace(',', '').replace('원', '')) if sales else 0
-
-        # 매니저별
-        if manager not in by_manager:
-            by_manager[manager] = {'sales': 0, 'count': 0, 'clients': {}, 'urgent': 0, 'urgent_by_purpose': {}, 'by_purpose': {}}
-        by_manager[manager]['sales'] += sales
-        by_manager[manager]['count'] += 1
-        # 검사목적별 매출/건수 추가
-        if purpose:
-            if purpose not in by_manager[manager]['by_purpose']:
-                by_manager[manager]['by_purpose'][purpose] = {'sales': 0, 'count': 0}
-            by_manager[manager]['by_purpose'][purpose]['sales'] += sales
-            by_manager[manager]['by_purpose'][purpose]['count'] += 1
-        if is_urgent:
-            by_manager[manager]['urgent'] += 1
-            # 검사목적별 긴급 건수 추가
-            if purpose:
-                if purpose not in by_manager[manager]['urgent_by_purpose']:
-                    by_manager[manager]['urgent_by_purpose'][purpose] = 0
-                by_manager[manager]['urgent_by_purpose'][purpose] += 1
-        if client not in by_manager[manager]['clients']:
-            by_manager[manager]['clients'][client] = {'sales': 0, 'count': 0}
-        by_manager[manager]['clients'][client]['sales'] += sales
-        by_manager[manager]['clients'][client]['count'] += 1
-
-        # 지사별
-        branch = MANAGER_TO_BRANCH.get(manager, '기타')
-        if branch not in by_branch:
-            by_branch[branch] = {'sales': 0, 'count': 0, 'managers': set(), 'by_purpose': {}}
-        by_branch[branch]['sales'] += sales
-        by_branch[branch]['count'] += 1
-        by_branch[branch]['managers'].add(manager)
+def _dashboard_accumulators(groups):
+    """DASHBOARD_AGGREGATIONS 결과 → _process_data_result가 받는 중첩 dict/set 집계
 
-        # 팀별 검사목적별 데이터
-        if purpose:
-            if purpose not in by_branch[branch]['by_purpose']:
-                by_branch[branch]['by_purpose'][purpose] = {'sales': 0, 'count': 0}
-            by_branch[branch]['by_purpose'][purpose]['sales'] += sales
-            by_branch[branch]['by_purpose'][purpose]['count'] += 1
-
-        # 부서별 (본사, 마케팅, 영업부, 지사)
-        department = MANAGER_TO_DEPARTMENT.get(manager, '기타')
-        if department not in by_department:
-            by_department[department] = {'sales': 0, 'count': 0}
-        by_department[department]['sales'] += sales
-        by_department[department]['count'] += 1
-
-        # 월별
-        month = 0
-        if date:
-            if hasattr(date, 'month'):
-                month = date.month
-            else:
-                try:
-                    month = int(str(date).split('-')[1])
-                except:
-                    month = 0
-
-        if month > 0:
-            if month not in by_month:
-                by_month[month] = {'sales': 0, 'count': 0, 'byPurpose': {}, 'byManager': {}, 'byBranch': {}, 'clients': set()}
-            by_month[month]['sales'] += sales
-            by_month[month]['count'] += 1
-            # 월별 거래 업체 추적 (제외 대상 제외)
-            if client and client not in EXCLUDED_CLIENTS:
-                by_month[month]['clients'].add(client)
-
-            # 월별 검사목적별 데이터
-            if purpose:
-                if purpose not in by_month[month]['byPurpose']:
-                    by_month[month]['byPurpose'][purpose] = {'sales': 0, 'count': 0}
-                by_month[month]['byPurpose'][purpose]['sales'] += sales
-                by_month[month]['byPurpose'][purpose]['count'] += 1
-
-            # 월별 담당자별 데이터
-            if manager not in by_month[month]['byManager']:
-                by_month[month]['byManager'][manager] = {'sales': 0, 'count': 0, 'byPurpose': {}}
-            by_month[month]['byManager'][manager]['sales'] += sales
-            by_month[month]['byManager'][manager]['count'] += 1
-            # 월별 담당자별 검사목적 데이터
-            if purpose:
-                if purpose not in by_month[month]['byManager'][manager]['byPurpose']:
-                    by_month[month]['byManager'][manager]['byPurpose'][purpose] = {'sales': 0, 'count': 0}
-                by_month[month]['byManager'][manager]['byPurpose'][purpose]['sales'] += sales
-                by_month[month]['byManager'][manager]['byPurpose'][purpose]['count'] += 1
-
-            # 월별 팀별 데이터
-            if branch not in by_month[month]['byBranch']:
-                by_month[month]['byBranch'][branch] = {'sales': 0, 'count': 0, 'byPurpose': {}}
-            by_month[month]['byBranch'][branch]['sales'] += sales
-            by_month[month]['byBranch'][branch]['count'] += 1
-            # 월별 팀별 검사목적 데이터
-            if purpose:
-                if purpose not in by_month[month]['byBranch'][branch]['byPurpose']:
-                    by_month[month]['byBranch'][branch]['byPurpose'][purpose] = {'sales': 0, 'count': 0}
-                by_month[month]['byBranch'][branch]['byPurpose'][purpose]['sales'] += sales
-                by_month[month]['byBranch'][branch]['byPurpose'][purpose]['count'] += 1
-
-            # 월별 긴급 데이터 (담당자별, 검사목적별 세분화)
-            if month not in by_urgent_month:
-                by_urgent_month[month] = {'sales': 0, 'count': 0, 'byManager': {}, 'byPurpose': {}}
-            if is_urgent:
-                by_urgent_month[month]['sales'] += sales
-                by_urgent_month[month]['count'] += 1
-                # 긴급 담당자별
-                if manager and manager != '미지정':
-                    if manager not in by_urgent_month[month]['byManager']:
-                        by_urgent_month[month]['byManager'][manager] = {'sales': 0, 'count': 0}
-                    by_urgent_month[month]['byManager'][manager]['sales'] += sales
-                    by_urgent_month[month]['byManager'][manager]['count'] += 1
-                # 긴급 검사목적별
-                if purpose:
-                    if purpose not in by_urgent_month[month]['byPurpose']:
-                        by_urgent_month[month]['byPurpose'][purpose] = {'sales': 0, 'count': 0}
-                    by_urgent_month[month]['byPurpose'][purpose]['sales'] += sales
-                    by_urgent_month[month]['byPurpose'][purpose]['count'] += 1
-
-            # 지사별 월별 거래처 (중복 분석용)
-            if branch not in by_branch_month_clients:
-                by_branch_month_clients[branch] = {}
-            if month not in by_branch_month_clients[branch]:
-                by_branch_month_clients[branch][month] = set()
-            if client and client != '미지정':
-                by_branch_month_clients[branch][month].add(client)
-
-            # 목적별 월별 거래처 (필터링용)
-            if purpose and client and client != '미지정':
-                if purpose not in purpose_month_clients:
-                    purpose_month_clients[purpose] = {}
-                if month not in purpose_month_clients[purpose]:
-                    purpose_month_clients[purpose][month] = set()
-                purpose_month_clients[purpose][month].add(client)
-
-        # 거래처별 - 주소 추출
-        client_address = None
-        for col in address_columns:
-            if row.get(col):
-                client_address = str(row.get(col, '')).strip()
-                break
-
-        # 시험분야, 업체분류 추출
-        test_field = str(row.get('시험분야', '') or '').strip()  # 식품, 축산 등
-        company_type = str(row.get('업체분류', '') or '').strip()  # 식품, 축산, 식품,축산 등
-
-        # 거래처별
-        if client not in by_client:
-            by_client[client] = {'sales': 0, 'count': 0, 'purposes': {}, 'managers': {}, 'months': set(), 'address': '', 'test_fields': set(), 'company_types': set()}
-        by_client[client]['sales'] += sales
-        by_client[client]['count'] += 1
-        # 시험분야 저장
-        if test_field:
-            by_client[client]['test_fields'].add(test_field)
-        # 업체분류 저장
-        if company_type:
-            by_client[client]['company_types'].add(company_type)
-        # 주소 저장 (첫번째 유효한 주소 사용)
-        if client_address and not by_client[client]['address']:
-            by_client[client]['address'] = client_address
-        # 거래처별 담당자 집계
-        if manager and manager != '미지정':
-            if manager not in by_client[client]['managers']:
-                by_client[client]['managers'][manager] = {'sales': 0, 'count': 0}
-            by_client[client]['managers'][manager]['sales'] += sales
-            by_client[client]['managers'][manager]['count'] += 1
-        # 거래처별 거래 월 추적
-        if month > 0:
-            by_client[client]['months'].add(month)
-        if purpose:
-            if purpose not in by_client[client]['purposes']:
-                by_client[client]['purposes'][purpose] = {'sales': 0, 'count': 0}
-            by_client[client]['purposes'][purpose]['sales'] += sales
-            by_client[client]['purposes'][purpose]['count'] += 1
-
-            # 거래처+유형별 월별 거래 추적
-            if month > 0:
-                cp_key = f"{client}|{purpose}"
-                if cp_key not in client_purpose_months:
-                    client_purpose_months[cp_key] = {'client': client, 'purpose': purpose, 'months': set(), 'sales': 0, 'count': 0}
-                client_purpose_months[cp_key]['months'].add(month)
-                client_purpose_months[cp_key]['sales'] += sales
-                client_purpose_months[cp_key]['count'] += 1
-
-        # 검사목적별
-        if purpose:
-            if purpose not in by_purpose:
-                by_purpose[purpose] = {'sales': 0, 'count': 0}
-            by_purpose[purpose]['sales'] += sales
-            by_purpose[purpose]['count'] += 1
-
-            # 목적별-담당자 데이터
-            if purpose not in by_purpose_manager:
-                by_purpose_manager[purpose] = {}
-            if manager not in by_purpose_manager[purpose]:
-                by_purpose_manager[purpose][manager] = {'sales': 0, 'count': 0}
-            by_purpose_manager[purpose][manager]['sales'] += sales
-            by_purpose_manager[purpose][manager]['count'] += 1
-
-            # 목적별-월별 데이터
-            if month > 0:
-                if purpose not in by_purpose_month:
-                    by_purpose_month[purpose] = {}
-                if month not in by_purpose_month[purpose]:
-                    by_purpose_month[purpose][month] = {'sales': 0, 'count': 0, 'by_manager': {}}
-                by_purpose_month[purpose][month]['sales'] += sales
-                by_purpose_month[purpose][month]['count'] += 1
-                # 담당자별 월별 목적 데이터
-                if manager not in by_purpose_month[purpose][month]['by_manager']:
-                    by_purpose_month[purpose][month]['by_manager'][manager] = {'sales': 0, 'count': 0}
-                by_purpose_month[purpose][month]['by_manager'][manager]['sales'] += sales
-                by_purpose_month[purpose][month]['by_manager'][manager]['count'] += 1
-
-        # 부적합항목별
-        if defect:
-            if defect not in by_defect:
-                by_defect[defect] = {'count': 0}
-            by_defect[defect]['count'] += 1
-
-            # 부적합항목 월별
-            if month > 0:
-                if defect not in by_defect_month:
-                    by_defect_month[defect] = {}
-                if month not in by_defect_month[defect]:
-                    by_defect_month[defect][month] = 0
-                by_defect_month[defect][month] += 1
-
-                # 월별 총 부적합 건수
-                if month not in defect_monthly_total:
-                    defect_monthly_total[month] = {'count': 0, 'by_purpose': {}}
-                defect_monthly_total[month]['count'] += 1
-                if purpose:
-                    if purpose not in defect_monthly_total[month]['by_purpose']:
-                        defect_monthly_total[month]['by_purpose'][purpose] = 0
-                    defect_monthly_total[month]['by_purpose'][purpose] += 1
-
-                # 계절별 부적합
-                season = '봄' if month in [3, 4, 5] else '여름' if month in [6, 7, 8] else '가을' if month in [9, 10, 11] else '겨울'
-                if season not in by_defect_season:
-                    by_defect_season[season] = {'count': 0, 'months': set(), 'defects': {}, 'by_purpose': {}}
-                by_defect_season[season]['count'] += 1
-                by_defect_season[season]['months'].add(month)
-                if defect not in by_defect_season[season]['defects']:
-                    by_defect_season[season]['defects'][defect] = 0
-                by_defect_season[season]['defects'][defect] += 1
-                if purpose:
-                    if purpose not in by_defect_season[season]['by_purpose']:
-                        by_defect_season[season]['by_purpose'][purpose] = 0
-                    by_defect_season[season]['by_purpose'][purpose] += 1
-
-            # 부적합항목-담당자별
-            if manager and manager != '미지정':
-                if manager not in by_defect_manager:
-                    by_defect_manager[manager] = {'count': 0, 'defects': {}, 'by_purpose': {}}
-                by_defect_manager[manager]['count'] += 1
-                if defect not in by_defect_manager[manager]['defects']:
-                    by_defect_manager[manager]['defects'][defect] = 0
-                by_defect_manager[manager]['defects'][defect] += 1
-                if purpose:
-                    if purpose not in by_defect_manager[manager]['by_purpose']:
-                        by_defect_manager[manager]['by_purpose'][purpose] = 0
-                    by_defect_manager[manager]['by_purpose'][purpose] += 1
-
-            # 부적합항목-업체별
-            if client and client != '미지정':
-                if client not in by_defect_client:
-                    by_defect_client[client] = {'count': 0, 'defects': {}, 'by_purpose': {}}
-                by_defect_client[client]['count'] += 1
-                if defect not in by_defect_client[client]['defects']:
-                    by_defect_client[client]['defects'][defect] = 0
-                by_defect_client[client]['defects'][defect] += 1
-                if purpose:
-                    if purpose not in by_defect_client[client]['by_purpose']:
-                        by_defect_client[client]['by_purpose'][purpose] = 0
-                    by_defect_client[client]['by_purpose'][purpose] += 1
-
-            # 부적합항목-검사목적별
-            if purpose:
-                if purpose not in by_defect_purpose:
-                    by_defect_purpose[purpose] = {}
-                if defect not in by_defect_purpose[purpose]:
-                    by_defect_purpose[purpose][defect] = {'count': 0}
-                by_defect_purpose[purpose][defect]['count'] += 1
-
-                # 부적합항목-검사목적별-월별
-                if month > 0:
-                    if purpose not in by_defect_purpose_month:
-                        by_defect_purpose_month[purpose] = {}
-                    if defect not in by_defect_purpose_month[purpose]:
-                        by_defect_purpose_month[purpose][defect] = {}
-                    if month not in by_defect_purpose_month[purpose][defect]:
-                        by_defect_purpose_month[purpose][defect][month] = 0
-                    by_defect_purpose_month[purpose][defect][month] += 1
-
-        # 검체유형별
-        if sample_type:
-            if sample_type not in by_sample_type:
-                by_sample_type[sample_type] = {'sales': 0, 'count': 0}
-            by_sample_type[sample_type]['sales'] += sales
-            by_sample_type[sample_type]['count'] += 1
-
-            # 검체유형별-담당자 데이터
-            if sample_type not in by_sample_type_manager:
-                by_sample_type_manager[sample_type] = {}
-            if manager not in by_sample_type_manager[sample_type]:
-                by_sample_type_manager[sample_type][manager] = {'sales': 0, 'count': 0, 'by_purpose': {}}
-            by_sample_type_manager[sample_type][manager]['sales'] += sales
-            by_sample_type_manager[sample_type][manager]['count'] += 1
-            # 담당자별 목적 데이터 추가
-            if purpose:
-                if purpose not in by_sample_type_manager[sample_type][manager]['by_purpose']:
-                    by_sample_type_manager[sample_type][manager]['by_purpose'][purpose] = {'sales': 0, 'count': 0}
-                by_sample_type_manager[sample_type][manager]['by_purpose'][purpose]['sales'] += sales
-                by_sample_type_manager[sample_type][manager]['by_purpose'][purpose]['count'] += 1
+    그룹은 첫 등장 순서이므로 dict 키와 set 추가 순서가 행 순서대로 쌓은 것과 같다.
+    """
+    def amounts(sales, count):
+        return {'sales': sales, 'count': count}
 
-            # 검체유형별-목적 데이터
-            if purpose:
-                if sample_type not in by_sample_type_purpose:
-                    by_sample_type_purpose[sample_type] = {}
-                if purpose not in by_sample_type_purpose[sample_type]:
-                    by_sample_type_purpose[sample_type][purpose] = {'sales': 0, 'count': 0}
-                by_sample_type_purpose[sample_type][purpose]['sales'] += sales
-                by_sample_type_purpose[sample_type][purpose]['count'] += 1
-
-            # 검체유형별-월별 데이터
-            if month > 0:
-                if sample_type not in by_sample_type_month:
-                    by_sample_type_month[sample_type] = {}
-                if month not in by_sample_type_month[sample_type]:
-                    by_sample_type_month[sample_type][month] = {'sales': 0, 'count': 0, 'by_manager': {}, 'by_purpose': {}}
-                by_sample_type_month[sample_type][month]['sales'] += sales
-                by_sample_type_month[sample_type][month]['count'] += 1
-                # 담당자별 월별 검체유형 데이터
-                if manager not in by_sample_type_month[sample_type][month]['by_manager']:
-                    by_sample_type_month[sample_type][month]['by_manager'][manager] = {'sales': 0, 'count': 0}
-                by_sample_type_month[sample_type][month]['by_manager'][manager]['sales'] += sales
-                by_sample_type_month[sample_type][month]['by_manager'][manager]['count'] += 1
-                # 목적별 월별 검체유형 데이터
-                if purpose:
-                    if purpose not in by_sample_type_month[sample_type][month]['by_purpose']:
-                        by_sample_type_month[sample_type][month]['by_purpose'][purpose] = {'sales': 0, 'count': 0}
-                    by_sample_type_month[sample_type][month]['by_purpose'][purpose]['sales'] += sales
-                    by_sample_type_month[sample_type][month]['by_purpose'][purpose]['count'] += 1
-
-                # 거래처+검체유형별 월별 거래 추적
-                cst_key = f"{client}|{sample_type}"
-                if cst_key not in client_sample_type_months:
-                    client_sample_type_months[cst_key] = {'client': client, 'sample_type': sample_type, 'months': set(), 'sales': 0, 'count': 0}
-                client_sample_type_months[cst_key]['months'].add(month)
-                client_sample_type_months[cst_key]['sales'] += sales
-                client_sample_type_months[cst_key]['count'] += 1
-
-        # 지역별 분석
-        address = None
-        for col in address_columns:
-            if row.get(col):
-                address = row.get(col)
-                break
+    total_sales, total_count = groups['total'][0] if groups['total'] else (0, 0)
+    purposes = {purpose for purpose, in groups['purposes']}
+    sample_types = {sample_type for sample_type, in groups['sample_types']}
 
-        sido, sigungu = extract_region(address)
+    # 매니저별
+    by_manager = {}
+    for manager, s, c in groups['manager']:
+        by_manager[manager] = {'sales': s, 'count': c, 'clients': {}, 'urgent': 0, 'urgent_by_purpose': {}, 'by_purpose': {}}
+    for manager, purpose, s, c in groups['manager_purpose']:
+        by_manager[manager]['by_purpose'][purpose] = amounts(s, c)
+    for manager, c in groups['manager_urgent']:
+        by_manager[manager]['urgent'] = c
+    for manager, purpose, c in groups['manager_urgent_purpose']:
+        by_manager[manager]['urgent_by_purpose'][purpose] = c
+    for manager, client, s, c in groups['manager_client']:
+        by_manager[manager]['clients'][client] = amounts(s, c)
+
+    # 지사별, 부서별
+    by_branch = {}
+    for branch, s, c in groups['branch']:
+        by_branch[branch] = {'sales': s, 'count': c, 'managers': set(), 'by_purpose': {}}
+    for branch, manager in groups['branch_manager']:
+        by_branch[branch]['managers'].add(manager)
+    for branch, purpose, s, c in groups['branch_purpose']:
+        by_branch[branch]['by_purpose'][purpose] = amounts(s, c)
+    by_department = {department: amounts(s, c) for department, s, c in groups['department']}
 
-        if sido:
-            region_key = sido
-            if sigungu:
-                region_key = f"{sido} {sigungu}"
-
-            # 지역별 통계
-            if region_key not in by_region:
-                by_region[region_key] = {'sales': 0, 'count': 0, 'sido': sido, 'sigungu': sigungu or '', 'managers': {}}
-            by_region[region_key]['sales'] += sales
-            by_region[region_key]['count'] += 1
-
-            # 지역-담당자별 통계
-            if manager not in by_region[region_key]['managers']:
-                by_region[region_key]['managers'][manager] = {'sales': 0, 'count': 0}
-            by_region[region_key]['managers'][manager]['sales'] += sales
-            by_region[region_key]['managers'][manager]['count'] += 1
-
-            # 담당자-지역별 통계
-            if manager not in by_region_manager:
-                by_region_manager[manager] = {}
-            if region_key not in by_region_manager[manager]:
-                by_region_manager[manager][region_key] = {'sales': 0, 'count': 0, 'sido': sido, 'sigungu': sigungu or ''}
-            by_region_manager[manager][region_key]['sales'] += sales
-            by_region_manager[manager][region_key]['count'] += 1
-
-            # 목적별-지역 데이터
-            if purpose:
-                if purpose not in by_purpose_region:
-                    by_purpose_region[purpose] = {}
-                if region_key not in by_purpose_region[purpose]:
-                    by_purpose_region[purpose][region_key] = {'sales': 0, 'count': 0}
-                by_purpose_region[purpose][region_key]['sales'] += sales
-                by_purpose_region[purpose][region_key]['count'] += 1
+    # 월별, 월별 긴급
+    by_month = {}
+    by_urgent_month = {}
+    for month, s, c in groups['month']:
+        by_month[month] = {'sales': s, 'count': c, 'byPurpose': {}, 'byManager': {}, 'byBranch': {}, 'clients': set()}
+        by_urgent_month[month] = {'sales': 0, 'count': 0, 'byManager': {}, 'byPurpose': {}}
+    for month, client in groups['month_client']:
+        by_month[month]['clients'].add(client)
+    for month, purpose, s, c in groups['month_purpose']:
+        by_month[month]['byPurpose'][purpose] = amounts(s, c)
+    for key, name in (('byManager', 'month_manager'), ('byBranch', 'month_branch')):
+        for month, value, s, c in groups[name]:
+            by_month[month][key][value] = {'sales': s, 'count': c, 'byPurpose': {}}
+        for month, value, purpose, s, c in groups[name + '_purpose']:
+            by_month[month][key][value]['byPurpose'][purpose] = amounts(s, c)
+    for month, s, c in groups['urgent_month']:
+        by_urgent_month[month]['sales'] = s
+        by_urgent_month[month]['count'] = c
+    for month, manager, s, c in groups['urgent_month_manager']:
+        by_urgent_month[month]['byManager'][manager] = amounts(s, c)
+    for month, purpose, s, c in groups['urgent_month_purpose']:
+        by_urgent_month[month]['byPurpose'][purpose] = amounts(s, c)
+
+    # 지사별/목적별 월별 거래처 (중복 분석용)
+    by_branch_month_clients = {}
+    for branch, month in groups['branch_month']:
+        by_branch_month_clients.setdefault(branch, {})[month] = set()
+    for branch, month, client in groups['branch_month_client']:
+        by_branch_month_clients[branch][month].add(client)
+    purpose_month_clients = {}
+    for purpose, month, client in groups['purpose_month_client']:
+        purpose_month_clients.setdefault(purpose, {}).setdefault(month, set()).add(client)
+
+    # 거래처별
+    by_client = {}
+    for client, s, c in groups['client']:
+        by_client[client] = {'sales': s, 'count': c, 'purposes': {}, 'managers': {}, 'months': set(), 'address': '', 'test_fields': set(), 'company_types': set()}
+    for client, test_field in groups['client_test_field']:
+        by_client[client]['test_fields'].add(test_field)
+    for client, company_type in groups['client_company_type']:
+        by_client[client]['company_types'].add(company_type)
+    for client, address in groups['client_address']:
+        by_client[client]['address'] = address  # 첫번째 유효한 주소
+    for client, manager, s, c in groups['client_manager']:
+        by_client[client]['managers'][manager] = amounts(s, c)
+    for client, month in groups['client_month']:
+        by_client[client]['months'].add(month)
+    for client, purpose, s, c in groups['client_purpose']:
+        by_client[client]['purposes'][purpose] = amounts(s, c)
+
+    # 거래처+유형별, 거래처+검체유형별 월별 거래 추적
+    client_purpose_months = {}
+    for key, client, purpose, s, c in groups['client_purpose_months']:
+        client_purpose_months[key] = {'client': client, 'purpose': purpose, 'months': set(), 'sales': s, 'count': c}
+    for key, month in groups['client_purpose_month']:
+        client_purpose_months[key]['months'].add(month)
+    client_sample_type_months = {}
+    for key, client, sample_type, s, c in groups['client_sample_type_months']:
+        client_sample_type_months[key] = {'client': client, 'sample_type': sample_type, 'months': set(), 'sales': s, 'count': c}
+    for key, month in groups['client_sample_type_month']:
+        client_sample_type_months[key]['months'].add(month)
+
+    # 검사목적별
+    by_purpose = {purpose: amounts(s, c) for purpose, s, c in groups['purpose']}
+    by_purpose_manager = {}
+    for purpose, manager, s, c in groups['purpose_manager']:
+        by_purpose_manager.setdefault(purpose, {})[manager] = amounts(s, c)
+    by_purpose_month = {}
+    for purpose, month, s, c in groups['purpose_month']:
+        by_purpose_month.setdefault(purpose, {})[month] = {'sales': s, 'count': c, 'by_manager': {}}
+    for purpose, month, manager, s, c in groups['purpose_month_manager']:
+        by_purpose_month[purpose][month]['by_manager'][manager] = amounts(s, c)
+
+    # 부적합항목별
+    by_defect = {defect: {'count': c} for defect, c in groups['defect']}
+    by_defect_month = {}
+    for defect, month, c in groups['defect_month']:
+        by_defect_month.setdefault(defect, {})[month] = c
+    defect_monthly_total = {month: {'count': c, 'by_purpose': {}} for month, c in groups['defect_total_month']}
+    for month, purpose, c in groups['defect_total_month_purpose']:
+        defect_monthly_total[month]['by_purpose'][purpose] = c
+    by_defect_season = {}
+    for season, c in groups['defect_season']:
+        by_defect_season[season] = {'count': c, 'months': set(), 'defects': {}, 'by_purpose': {}}
+    for season, month in groups['defect_season_month']:
+        by_defect_season[season]['months'].add(month)
+    for season, defect, c in groups['defect_season_defect']:
+        by_defect_season[season]['defects'][defect] = c
+    for season, purpose, c in groups['defect_season_purpose']:
+        by_defect_season[season]['by_purpose'][purpose] = c
+    by_defect_manager = {}
+    by_defect_client = {}
+    for target, name in ((by_defect_manager, 'defect_manager'), (by_defect_client, 'defect_client')):
+        for value, c in groups[name]:
+            target[value] = {'count': c, 'defects': {}, 'by_purpose': {}}
+        for value, defect, c in groups[name + '_defect']:
+            target[value]['defects'][defect] = c
+        for value, purpose, c in groups[name + '_purpose']:
+            target[value]['by_purpose'][purpose] = c
+    by_defect_purpose = {}
+    for purpose, defect, c in groups['defect_purpose']:
+        by_defect_purpose.setdefault(purpose, {})[defect] = {'count': c}
+    by_defect_purpose_month = {}
+    for purpose, defect, month, c in groups['defect_purpose_month']:
+        by_defect_purpose_month.setdefault(purpose, {}).setdefault(defect, {})[month] = c
+
+    # 검체유형별
+    by_sample_type = {sample_type: amounts(s, c) for sample_type, s, c in groups['sample_type']}
+    by_sample_type_manager = {}
+    for sample_type, manager, s, c in groups['sample_type_manager']:
+        by_sample_type_manager.setdefault(sample_type, {})[manager] = {'sales': s, 'count': c, 'by_purpose': {}}
+    for sample_type, manager, purpose, s, c in groups['sample_type_manager_purpose']:
+        by_sample_type_manager[sample_type][manager]['by_purpose'][purpose] = amounts(s, c)
+    by_sample_type_purpose = {}
+    for sample_type, purpose, s, c in groups['sample_type_purpose']:
+        by_sample_type_purpose.setdefault(sample_type, {})[purpose] = amounts(s, c)
+    by_sample_type_month = {}
+    for sample_type, month, s, c in groups['sample_type_month']:
+        by_sample_type_month.setdefault(sample_type, {})[month] = {'sales': s, 'count': c, 'by_manager': {}, 'by_purpose': {}}
+    for sample_type, month, manager, s, c in groups['sample_type_month_manager']:
+        by_sample_type_month[sample_type][month]['by_manager'][manager] = amounts(s, c)
+    for sample_type, month, purpose, s, c in groups['sample_type_month_purpose']:
+        by_sample_type_month[sample_type][month]['by_purpose'][purpose] = amounts(s, c)
+
+    # 지역별
+    by_region = {}
+    for region, sido, sigungu, s, c in groups['region']:
+        by_region[region] = {'sales': s, 'count': c, 'sido': sido, 'sigungu': sigungu, 'managers': {}}
+    for region, manager, s, c in groups['region_manager']:
+        by_region[region]['managers'][manager] = amounts(s, c)
+    by_region_manager = {}
+    for manager, region, sido, sigungu, s, c in groups['manager_region']:
+        by_region_manager.setdefault(manager, {})[region] = {'sales': s, 'count': c, 'sido': sido, 'sigungu': sigungu}
+    by_purpose_region = {}
+    for purpose, region, s, c in groups['purpose_region']:
+        by_purpose_region.setdefault(purpose, {})[region] = amounts(s, c)
+
+    return dict(
+        by_manager=by_manager, by_branch=by_branch, by_month=by_month, by_client=by_client, by_purpose=by_purpose,
+        by_defect=by_defect, by_defect_month=by_defect_month, by_defect_purpose=by_defect_purpose,
+        by_defect_purpose_month=by_defect_purpose_month, by_defect_manager=by_defect_manager,
+        by_defect_client=by_defect_client, by_defect_season=by_defect_season,
+        defect_monthly_total=defect_monthly_total, by_purpose_month=by_purpose_month, by_region=by_region,
+        by_region_manager=by_region_manager, by_purpose_manager=by_purpose_manager,
+        by_purpose_region=by_purpose_region, by_sample_type=by_sample_type,
+        by_sample_type_month=by_sample_type_month, by_sample_type_manager=by_sample_type_manager,
+        by_sample_type_purpose=by_sample_type_purpose, by_urgent_month=by_urgent_month,
+        by_branch_month_clients=by_branch_month_clients, purpose_month_clients=purpose_month_clients,
+        client_purpose_months=client_purpose_months, client_sample_type_months=client_sample_type_months,
+        by_department=by_department, purposes=purposes, sample_types=sample_types, total_sales=total_sales,
+        total_count=total_count)
+
+
+def process_data(data, purpose_filter=None, prev_year_clients=None, section=None):
+    """데이터 처리
 
-        total_sales += sales
-        total_count += 1
+    Args:
+        data: 처리할 집계 큐브 셀 목록 (load_excel_cube - 셀마다 건수 row_count, 공급가액 합계)
+        purpose_filter: 검사목적 필터 (옵션)
+        prev_year_clients: 전년도 거래처 목록 (신규/기존 판단용)
+        section: DASHBOARD_SECTIONS 이름 - 그 구역 키에 필요한 명세만 계산하고 그 키만 반환 (옵션)
 
+    DASHBOARD_AGGREGATIONS 명세를 행 한 번 순회로 계산한다 (run_aggregations).
+    AGGREGATION_ENGINE이 'numpy'면 (NUMPY_AVAILABLE일 때) 공유 컬럼 데이터의 group-by만 _CubeColumns.aggregate로
+    계산하고, 'check'면 두 실행 결과를 비교해 다르면 로그를 남기고 python 결과를 쓴다.
+    """
+    selected = None
+    if purpose_filter and purpose_filter != '전체':
+        selected = (('purpose',), lambda purpose: purpose == purpose_filter)
+
+    specs = DASHBOARD_AGGREGATIONS
+    if section is not None:
+        needed = {name for key in DASHBOARD_SECTIONS[section] for name in DASHBOARD_OUTPUTS[key]}
+        specs = {name: spec for name, spec in DASHBOARD_AGGREGATIONS.items() if name in needed}
+
+    groups = None
+    if AGGREGATION_ENGINE in ('numpy', 'check') and NUMPY_AVAILABLE and len(data) and _CubeColumns.accepts(data):
+        groups = _CubeColumns(data).aggregate(specs, DASHBOARD_DIMENSIONS, DASHBOARD_FLAGS,
+                                              DASHBOARD_MEASURES, selected, DASHBOARD_MEASURE_DECIMALS)
+    if groups is None or AGGREGATION_ENGINE == 'check':
+        checked = groups
+        groups = run_aggregations(data, specs, DASHBOARD_DIMENSIONS, DASHBOARD_FLAGS, DASHBOARD_MEASURES, selected,
+                                  DASHBOARD_MEASURE_DECIMALS)
+        if checked is not None:
+            mismatched = [name for name in specs if checked[name] != groups[name]]
+            if mismatched:
+                print(f"[ENGINE] numpy/python 집계 결과 불일치 (python 결과 사용): {', '.join(mismatched)}")
+    if section is None:
+        return _process_data_result(prev_year_clients, **_dashboard_accumulators(groups))
+    # 계산하지 않은 명세는 빈 그룹 - 구역 밖 키는 빈 값으로 만들어지고 잘라낸다
+    groups = {name: groups.get(name, []) for name in DASHBOARD_AGGREGATIONS}
+    result = _process_data_result(prev_year_clients, **_dashboard_accumulators(groups))
+    return {key: result[key] for key in DASHBOARD_SECTIONS[section]}
+
+
+def _process_data_result(prev_year_clients, *, by_manager, by_branch, by_month, by_client, by_purpose, by_defect,
+                          by_defect_month, by_defect_purpose, by_defect_purpose_month, by_defect_manager,
+                          by_defect_client, by_defect_season, defect_monthly_total, by_purpose_month, by_region,
+                          by_region_manager, by_purpose_manager, by_purpose_region, by_sample_type,
+                          by_sample_type_month, by_sample_type_manager, by_sample_type_purpose, by_urgent_month,
+                          by_branch_month_clients, purpose_month_clients, client_purpose_months,
+                          client_sample_type_months, by_department, purposes, sample_types, total_sales,
+                          total_count):
+    """process_data 집계 결과(엔진 공통) → 정렬/TOP N/유지율을 계산해 API 응답 형태로 변환"""
     # 정렬 (EXCLUDED_MANAGERS 제외)
     sorted_managers = sorted(
         [(m, d) for m, d in by_manager.items() if m not in EXCLUDED_MANAGERS],
@@ -2526,50 +4144,12 @@ def process_data(data, purpose_filter=None, prev_year_clients=None):
         ]
 
     # 지사별 월별 거래처 중복률 계산 (전년도 기준)
-    branch_client_retention = {}
-    for branch, month_clients in by_branch_month_clients.items():
-        months = sorted(month_clients.keys())
-        retention_data = []
-        # 전년도 거래처로 초기화
-        all_clients = set(prev_year_clients) if prev_year_clients else set()
-        for month in months:
-            clients = month_clients[month]
-            # 기존 거래처: 전년도 또는 이전 월에 거래한 적 있는 거래처
-            overlap = len(clients & all_clients)
-            new_clients = len(clients - all_clients)
-            retention_rate = (overlap / len(all_clients) * 100) if all_clients else 0
-            retention_data.append({
-                'month': month,
-                'total': len(clients),
-                'overlap': overlap,
-                'retention': round(retention_rate, 1),
-                'new': new_clients
-            })
-            all_clients.update(clients)
-        branch_client_retention[branch] = retention_data
+    branch_client_retention = {branch: client_retention(month_clients, prev_year_clients)
+                               for branch, month_clients in by_branch_month_clients.items()}
 
     # 목적별 월별 거래처 중복률 계산 (전년도 기준)
-    purpose_client_retention = {}
-    for purpose, month_clients in purpose_month_clients.items():
-        months = sorted(month_clients.keys())
-        retention_data = []
-        # 전년도 거래처로 초기화
-        all_clients = set(prev_year_clients) if prev_year_clients else set()
-        for month in months:
-            clients = month_clients[month]
-            # 기존 거래처: 전년도 또는 이전 월에 거래한 적 있는 거래처
-            overlap = len(clients & all_clients)
-            new_clients = len(clients - all_clients)
-            retention_rate = (overlap / len(all_clients) * 100) if all_clients else 0
-            retention_data.append({
-                'month': month,
-                'total': len(clients),
-                'overlap': overlap,
-                'retention': round(retention_rate, 1),
-                'new': new_clients
-            })
-            all_clients.update(clients)
-        purpose_client_retention[purpose] = retention_data
+    purpose_client_retention = {purpose: client_retention(month_clients, prev_year_clients)
+                                for purpose, month_clients in purpose_month_clients.items()}
 
     # 전체 월별 거래처 중복률 (모든 지사 합산)
     all_month_clients = {}
@@ -2579,29 +4159,7 @@ def process_data(data, purpose_filter=None, prev_year_clients=None):
                 all_month_clients[month] = set()
             all_month_clients[month].update(clients)
 
-    total_retention = []
-    # 전년도 거래처가 있으면 기존 거래처 기준으로 사용
-    cumulative_clients = set(prev_year_clients) if prev_year_clients else set()
-    prev_year_base = set(prev_year_clients) if prev_year_clients else set()
-
-    for month in sorted(all_month_clients.keys()):
-        clients = all_month_clients[month]
-        # 기존 거래처: 전년도 또는 이전 월에 거래한 적 있는 거래처
-        overlap = len(clients & cumulative_clients)
-        # 신규 거래처: 전년도에도 없고 올해 이전 월에도 없는 거래처
-        new_clients = len(clients - cumulative_clients)
-        retention_rate = (overlap / len(cumulative_clients) * 100) if cumulative_clients else 0
-
-        total_retention.append({
-            'month': month,
-            'total': len(clients),
-            'overlap': overlap,
-            'retention': round(retention_rate, 1),
-            'new': new_clients,
-            'cumulative': len(cumulative_clients | clients),
-            'prev_year_overlap': len(clients & prev_year_base) if prev_year_base else 0  # 전년도 대비 유지 거래처
-        })
-        cumulative_clients.update(clients)
+    total_retention = client_retention(all_month_clients, prev_year_clients, cumulative=True)
 
     return {
         'by_manager': [(m, {'sales': d['sales'], 'count': d['count'], 'urgent': d.get('urgent', 0), 'urgent_by_purpose': d.get('urgent_by_purpose', {}), 'by_purpose': d.get('by_purpose', {})}) for m, d in sorted_managers],
@@ -2677,6 +4235,205 @@ def process_data(data, purpose_filter=None, prev_year_clients=None):
         ][:100]  # 상위 100개만
     }
 
+class _CubeColumns:
+    """집계 큐브 셀 목록 → 컬럼별 (코드 배열, 값 목록) - numpy 집계 엔진 (AGGREGATION_ENGINE='numpy')용
+
+    SharedTable이나 SharedRow 목록만 받는다 (accepts) - 컬럼 배열과 문자열 사전을 그대로 코드로 쓴다
+    (행마다 디코딩 안 함). 코드는 값 목록의 인덱스이고 같은 값이면 같은 코드다.
+    group-by 단계만 대신하고 정렬/TOP N/dict 응답 변환은 python 실행과 같은 함수를 쓴다.
+    """
+
+    def __init__(self, data):
+        import numpy as np
+
+        self.np = np
+        self._columns = {}
+        self._segments = []
+        if isinstance(data, SharedTable):
+            self.n = len(data)
+            self._segments.append((data._columns, np.arange(self.n), np.arange(self.n)))
+            return
+        self.n = len(data)
+        # 필터된 SharedRow 목록 - 테이블(연도)별로 원래 위치와 테이블 내 인덱스를 모은다
+        tables = {}
+        owners = []
+        for row in data:
+            owner = tables.get(id(row._columns))
+            if owner is None:
+                owner = tables[id(row._columns)] = len(self._segments)
+                self._segments.append(row._columns)
+            owners.append(owner)
+        owners = np.array(owners, dtype=np.int64)
+        indexes = np.fromiter((row._index for row in data), dtype=np.int64, count=self.n)
+        for owner, columns in enumerate(self._segments):
+            positions = np.flatnonzero(owners == owner)
+            self._segments[owner] = (columns, positions, indexes[positions])
+
+    @staticmethod
+    def accepts(data):
+        """컬럼 배열을 그대로 쓸 수 있는 데이터인지 (SharedTable 또는 SharedRow 목록, dict 행은 python 실행)"""
+        return isinstance(data, SharedTable) or (
+            isinstance(data, list) and all(type(row) is SharedRow for row in data))
+
+    def __len__(self):
+        return self.n
+
+    def column(self, name):
+        """컬럼 → (행별 코드 int64 배열, 코드별 값 목록)"""
+        column = self._columns.get(name)
+        if column is not None:
+            return column
+        np = self.np
+        ids = {}
+        codes = np.zeros(self.n, dtype=np.int64)
+        for columns, positions, indexes in self._segments:
+            if not len(positions):
+                continue
+            kind, view, dictionary = columns[name]
+            if dictionary is not None:
+                seg_codes = np.frombuffer(view, dtype=np.int32)
+                seg_values = dictionary
+            else:
+                seg_values, seg_codes = np.unique(np.frombuffer(view, dtype=np.float64 if kind == 'float' else np.int32),
+                                                  return_inverse=True)
+                seg_values = seg_values.tolist()
+                if kind == 'date':
+                    seg_values = [_date_from_int(v) for v in seg_values]
+            remap = np.array([ids.setdefault(v, len(ids)) for v in seg_values], dtype=np.int64)
+            codes[positions] = remap[seg_codes[indexes]]
+        column = self._columns[name] = (codes, list(ids))
+        return column
+
+    def define(self, name, source, fn):
+        """source 컬럼 값에 fn을 적용한 파생 컬럼 (fn 결과가 같은 값은 하나의 코드로 합침)"""
+        codes, values = self.column(source)
+        ids = {}
+        remap = self.np.array([ids.setdefault(fn(v), len(ids)) for v in values], dtype=self.np.int64)
+        self._columns[name] = (remap[codes] if len(values) else codes, list(ids))
+
+    def combine(self, name, sources, fn):
+        """여러 컬럼 값 조합에 fn을 적용한 파생 컬럼 (예: 시/도 + 시/군/구 → 지역 키)"""
+        np = self.np
+        key, size = self._key(np.arange(self.n), sources)
+        first = self._first(key, size)
+        groups = np.flatnonzero(first < self.n)
+        rows = first[groups]
+        decoded = [self.values_at(source, rows) for source in sources]
+        ids = {}
+        remap = np.zeros(size, dtype=np.int64)
+        remap[groups] = [ids.setdefault(fn(*values), len(ids)) for values in zip(*decoded)]
+        self._columns[name] = (remap[key], list(ids))
+
+    def numbers(self, name):
+        """숫자 컬럼 → float64 배열 (합계는 np.bincount로 행 순서대로 더한다)"""
+        codes, values = self.column(name)
+        return self.np.array(values, dtype=self.np.float64)[codes]
+
+    def mask(self, name, predicate=bool):
+        """컬럼 값이 predicate를 만족하는 행 (bool 배열)"""
+        codes, values = self.column(name)
+        return self.np.array([bool(predicate(v)) for v in values], dtype=bool)[codes]
+
+    def values_at(self, name, rows):
+        codes, values = self.column(name)
+        return [values[code] for code in codes[rows].tolist()]
+
+    def _key(self, idx, names):
+        """idx 행의 names 코드 조합 → (0 ~ size-1 그룹 키, size) - 조합마다 빈 키를 압축해 범위를 작게 유지"""
+        np = self.np
+        key = np.zeros(len(idx), dtype=np.int64)
+        size = 1
+        for name in names:
+            codes, values = self.column(name)
+            key = key * len(values) + codes[idx]
+            size *= len(values)
+            if size <= 4 * len(idx) + 1024:
+                present = np.zeros(size, dtype=bool)
+                present[key] = True
+                rank = np.cumsum(present) - 1
+                key = rank[key]
+                size = int(rank[-1]) + 1
+            else:
+                _, key = np.unique(key, return_inverse=True)
+                key = key.reshape(-1)
+                size = int(key.max()) + 1
+        return key, size
+
+    def _first(self, key, size):
+        """그룹 키별 첫 등장 위치 (없는 키는 len(key))"""
+        np = self.np
+        first = np.full(size, len(key), dtype=np.int64)
+        np.minimum.at(first, key, np.arange(len(key), dtype=np.int64))
+        return first
+
+    def groups(self, mask, names, weights, ints, first=()):
+        """mask 행을 names 값 조합으로 묶어 첫 등장 순서대로 (*키 값, *first 컬럼의 첫 행 값, *weights 합) 목록
+
+        합계는 np.bincount로 행 순서대로 더하므로 행 루프에서 += 한 값과 같다 (float 포함).
+        ints: weights마다 정수 합으로 돌려줄지 여부
+        """
+        np = self.np
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return []
+        key, size = self._key(idx, names)
+        first_at = self._first(key, size)
+        groups = np.flatnonzero(first_at < len(idx))
+        groups = groups[np.argsort(first_at[groups], kind='stable')]
+        rows = idx[first_at[groups]]
+        sums = []
+        for weight, is_int in zip(weights, ints):
+            total = np.bincount(key, weights=weight[idx], minlength=size)[groups]
+            sums.append((total.astype(np.int64) if is_int else total).tolist())
+        decoded = [self.values_at(name, rows) for name in list(names) + list(first)]
+        return list(zip(*decoded, *sums))
+
+    def aggregate(self, specs, dimensions, flags, measures, selected=None, decimals=None):
+        """run_aggregations와 같은 명세/결과를 컬럼 group-by로 계산 (측정값은 컬럼 이름만)
+
+        같은 where 조합의 행 mask는 명세끼리 공유한다.
+        """
+        np = self.np
+        for name, (sources, fn) in dimensions.items():
+            if fn is None:
+                if sources[0] != name:
+                    self._columns[name] = self.column(sources[0])
+            elif len(sources) == 1:
+                self.define(name, sources[0], fn)
+            else:
+                self.combine(name, sources, fn)
+        flags = dict(flags)
+        if selected is not None:
+            flags['selected'] = selected
+        flag_masks = {}
+        for name, (sources, fn) in flags.items():
+            if len(sources) > 1:
+                self.combine('?' + name, sources, lambda *values, fn=fn: bool(fn(*values)))
+                sources, fn = ('?' + name,), bool
+            flag_masks[name] = self.mask(sources[0], fn)
+        weights = [self.numbers(column) for column in measures.values()]
+        ints = [all(type(v) is int for v in self.column(column)[1]) for column in measures.values()]
+
+        masks = {}
+        results = {}
+        for name, spec in specs.items():
+            where = tuple(spec.get('where', ()))
+            if selected is not None and not spec.get('all_rows'):
+                where = ('selected',) + where
+            mask = masks.get(where)
+            if mask is None:
+                mask = np.ones(self.n, dtype=bool)
+                for flag in where:
+                    mask = mask & flag_masks[flag]
+                masks[where] = mask
+            names = list(spec.get('measures', measures))
+            chosen = [list(measures).index(measure) for measure in names]
+            results[name] = _finish_groups(self.groups(mask, spec['dims'], [weights[m] for m in chosen],
+                                                       [ints[m] for m in chosen], spec.get('first', ())),
+                                           spec, names, decimals)
+        return results
+
+
 # ============ 로그인 페이지 템플릿 ============
 LOGIN_TEMPLATE = '''
 <!DOCTYPE html>
@@ -9308,6 +11065,24 @@ HTML_TEMPLATE = '''
         let branchTableSort = { column: null, direction: 'desc' };
         let clientChartFiltersInitialized = false;  // 거래처 차트 필터 초기화 여부
         let availableYears = [];  // 사용 가능한 연도 목록 (API에서 동적 로드)
+        let dataQuery = null;  // 마지막 조회 조건 (구역 요청에 같은 조건 사용)
+        let dataRequestId = 0;  // 조회할 때마다 증가 - 이전 조회의 늦은 응답은 버림
+        let loadedSections = new Set();  // 현재 조회 조건으로 받아 둔 /api/data 구역
+        let renderedTabs = new Set();  // 현재 조회 데이터로 그린 탭
+
+        // 탭 → /api/data 구역과 탭을 그리는 함수 (summary는 조회 시 먼저 받아 KPI/메인 탭을 그림)
+        const TAB_SECTIONS = {
+            personal: { section: 'personal', render: () => { updatePersonalTab(); updateManagerChart(); updateManagerTable(); } },
+            team: { section: 'team', render: () => { updateTeamTab(); updateBranchChart(); updateBranchTable(); } },
+            monthly: { section: 'monthly', render: () => updateMonthlyTab() },
+            client: { section: 'client', render: () => updateClientTab() },
+            region: { section: 'region', render: () => updateRegionTab() },
+            purpose: { section: 'purpose', render: () => updatePurposeTab() },
+            sampleType: { section: 'sample_type', render: () => updateSampleTypeTab() },
+            defect: { section: 'defect', render: () => updateDefectTab() },
+            foodItem: { section: null, render: () => updateFoodItemTab() },
+            collection: { section: null, render: () => updateCollectionTab() }
+        };
 
         // 담당자-팀 매핑 (JavaScript용)
         const MANAGER_TO_BRANCH_JS = {
@@ -9409,6 +11184,9 @@ HTML_TEMPLATE = '''
             if (content) content.classList.add('active');
             document.getElementById('kpiSection').classList.toggle('hidden', tabId !== 'main');
 
+            // 탭 구역 데이터가 아직 없으면 받아서 그림
+            showTabData(tabId);
+
             // 손익분석 탭이면 데이터 로드
             if (tabId === 'profitAnalysis') {
                 loadProfitAnalysisData();
@@ -9536,32 +11314,32 @@ HTML_TEMPLATE = '''
                 const compareYear = document.getElementById('compareYearSelect').value;
                 console.log('[DEBUG] 조회 조건:', { year, month, purpose, compareCheck, compareYear });
 
-                let url = `/api/data?year=${year}`;
-                if (month) url += `&month=${month}`;
-                if (purpose !== '전체') url += `&purpose=${encodeURIComponent(purpose)}`;
-                console.log('[DEBUG] API URL:', url);
+                // 조회 조건이 바뀌면 받아 둔 구역/그린 탭을 모두 버림
+                const requestId = ++dataRequestId;
+                dataQuery = { year, month, purpose, compareYear: compareCheck ? compareYear : null };
+                loadedSections = new Set(['summary']);
+                renderedTabs = new Set();
 
-                const res = await fetch(url);
-                console.log('[DEBUG] API 응답 상태:', res.status);
-                currentData = await res.json();
+                // 요약(KPI/메인)만 먼저 받아서 그림
+                const [summary, compSummary] = await Promise.all([
+                    fetchDataSection('summary', year),
+                    compareCheck ? fetchDataSection('summary', compareYear) : Promise.resolve(null)
+                ]);
+                if (requestId !== dataRequestId) return;  // 그 사이 다시 조회함
+                currentData = summary;
                 console.log('[DEBUG] currentData 로드됨, 키:', Object.keys(currentData));
                 currentData.year = year;
+                compareData = compSummary;
+                if (compareData) compareData.year = compareYear;
 
-                // 비교 데이터 로드
-                if (compareCheck) {
-                    let compUrl = `/api/data?year=${compareYear}`;
-                    if (month) compUrl += `&month=${month}`;
-                    if (purpose !== '전체') compUrl += `&purpose=${encodeURIComponent(purpose)}`;
-                    const compRes = await fetch(compUrl);
-                    compareData = await compRes.json();
-                    compareData.year = compareYear;
-                } else {
-                    compareData = null;
-                }
-
-                updateAll();
+                updateSummary();
+                updatePurposeGrid();
+                updateDepartmentCards();  // 부서별 카드 업데이트
                 hideToast();
                 showToast(`${year}년 데이터 로드 완료`, 'success');
+
+                // 보이는 탭의 구역만 받아서 그림 (나머지 탭은 열 때 받음)
+                await showTabData(currentTab);
             } catch (e) {
                 console.error('[DEBUG] loadData 에러:', e);
                 hideToast();
@@ -9573,24 +11351,40 @@ HTML_TEMPLATE = '''
             console.log('[DEBUG] loadData() 완료');
         }
 
-        function updateAll() {
-            updateSummary();
-            updatePurposeGrid();
-            updateDepartmentCards();  // 부서별 카드 업데이트
-            updatePersonalTab();  // 개인별 탭 전체 업데이트
-            updateTeamTab();      // 팀별 탭 전체 업데이트
-            updateManagerChart();
-            updateBranchChart();
-            updateMonthlyTab();   // 월별 탭 전체 업데이트
-            updateManagerTable();
-            updateBranchTable();
-            updateClientTab();
-            updateRegionTab();
-            updateSampleTypeTab();
-            updateDefectTab();
-            updatePurposeTab();
-            updateFoodItemTab();
-            updateCollectionTab();
+        // /api/data/<구역> 요청 (조회 조건의 월/검사목적 적용)
+        async function fetchDataSection(section, year) {
+            let url = `/api/data/${section}?year=${year}`;
+            if (dataQuery.month) url += `&month=${dataQuery.month}`;
+            if (dataQuery.purpose !== '전체') url += `&purpose=${encodeURIComponent(dataQuery.purpose)}`;
+            const res = await fetch(url);
+            if (!res.ok) throw new Error(`${section} 구역 응답 ${res.status}`);
+            return res.json();
+        }
+
+        // 탭을 처음 볼 때 그 탭의 구역을 받아 currentData/compareData에 합치고 탭을 그림 (조회마다 한 번)
+        async function showTabData(tabId) {
+            const tab = TAB_SECTIONS[tabId];
+            if (!tab || !dataQuery || renderedTabs.has(tabId)) return;
+            const requestId = dataRequestId;
+            if (tab.section && !loadedSections.has(tab.section)) {
+                try {
+                    const [part, compPart] = await Promise.all([
+                        fetchDataSection(tab.section, dataQuery.year),
+                        dataQuery.compareYear ? fetchDataSection(tab.section, dataQuery.compareYear) : Promise.resolve(null)
+                    ]);
+                    if (requestId !== dataRequestId) return;  // 그 사이 다시 조회함
+                    Object.assign(currentData, part);
+                    if (compareData && compPart) Object.assign(compareData, compPart);
+                    loadedSections.add(tab.section);
+                } catch (e) {
+                    console.error('[DEBUG] 구역 로드 에러:', e);
+                    showToast('데이터 로드 실패: ' + e.message, 'error');
+                    return;
+                }
+            }
+            if (requestId !== dataRequestId || renderedTabs.has(tabId)) return;
+            renderedTabs.add(tabId);
+            tab.render();
         }
 
         function updateSummary() {
@@ -26568,10 +28362,8 @@ def api_cost_profit_analysis():
     # 항목별 매출 집계
     item_sales = {}
     for row in sales_data:
-        item_name = str(row.get('항목명', '')).strip()
-        fee = row.get('항목수수료', 0) or 0
-        if isinstance(fee, str):
-            fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
+        item_name = row['항목명']
+        fee = row['항목수수료']
 
         if item_name:
             if item_name not in item_sales:
@@ -26659,19 +28451,15 @@ def get_financial_settings(year):
 
 @app.route('/api/profit/summary')
 @login_required
+@cached_json_response('profit/summary', defaults={'year': '2025'})
 def api_profit_summary():
     """손익 요약 API - 실제 매출 데이터 + 원가율/판관비율 적용"""
     year = request.args.get('year', '2025')
 
-    # 1. 실제 매출 데이터 가져오기 (Excel 데이터에서)
-    data = load_excel_data(year)
+    # 1. 실제 매출 데이터 가져오기 (Excel 데이터 집계 큐브에서)
+    data = load_excel_cube(year)
 
-    total_sales = 0  # 실제 매출액 (공급가액 합계)
-    for row in data:
-        fee = row.get('공급가액', 0) or 0
-        if isinstance(fee, str):
-            fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
-        total_sales += fee
+    total_sales = sum(cell['공급가액'] for cell in data)  # 실제 매출액 (공급가액 합계)
 
     # 2. 원가율/판관비율 가져오기 (financial_settings에서)
     fin_settings = get_financial_settings(year)
@@ -26699,7 +28487,7 @@ def api_profit_summary():
         'success': True,
         'year': year,
         'source': 'excel_data',
-        'data_count': len(data),
+        'data_count': sum(cell['row_count'] for cell in data),
         'total_actual_sales': total_sales,
         'cost_of_sales': cost_of_sales,
         'gross_profit': gross_profit,
@@ -26719,10 +28507,11 @@ def api_profit_summary():
 
 @app.route('/api/profit/by-purpose')
 @login_required
+@cached_json_response('profit/by-purpose', defaults={'year': '2025'})
 def api_profit_by_purpose():
     """검사목적별 손익 분석 - 실제 매출 + 원가율/판관비율 적용"""
     year = request.args.get('year', '2025')
-    data = load_excel_data(year)
+    data = load_excel_cube(year)  # 집계 큐브 셀
 
     # 원가율/판관비율 가져오기
     fin_settings = get_financial_settings(year)
@@ -26735,18 +28524,15 @@ def api_profit_by_purpose():
 
     purpose_stats = {}
     for row in data:
-        purpose = str(row.get('검사목적', '기타')).strip() or '기타'
+        purpose = row['검사목적'] or '기타'
 
         if purpose not in purpose_stats:
             purpose_stats[purpose] = {'count': 0, 'sales': 0}
 
-        purpose_stats[purpose]['count'] += 1
+        purpose_stats[purpose]['count'] += row['row_count']
 
         # 공급가액 사용
-        fee = row.get('공급가액', 0) or 0
-        if isinstance(fee, str):
-            fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
-        purpose_stats[purpose]['sales'] += fee
+        purpose_stats[purpose]['sales'] += row['공급가액']
 
     result = []
     for purpose, stats in purpose_stats.items():
@@ -26772,10 +28558,11 @@ def api_profit_by_purpose():
 
 @app.route('/api/profit/by-manager')
 @login_required
+@cached_json_response('profit/by-manager', defaults={'year': '2025'})
 def api_profit_by_manager():
     """담당자별 손익 분석 - 실제 매출 + 원가율/판관비율 적용"""
     year = request.args.get('year', '2025')
-    data = load_excel_data(year)
+    data = load_excel_cube(year)  # 집계 큐브 셀
 
     # 원가율/판관비율 가져오기
     fin_settings = get_financial_settings(year)
@@ -26788,18 +28575,15 @@ def api_profit_by_manager():
 
     manager_stats = {}
     for row in data:
-        manager = str(row.get('영업담당', '미지정')).strip() or '미지정'
+        manager = row['영업담당'] or DEFAULT_MANAGER
 
         if manager not in manager_stats:
             manager_stats[manager] = {'count': 0, 'sales': 0}
 
-        manager_stats[manager]['count'] += 1
+        manager_stats[manager]['count'] += row['row_count']
 
         # 공급가액 사용
-        fee = row.get('공급가액', 0) or 0
-        if isinstance(fee, str):
-            fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
-        manager_stats[manager]['sales'] += fee
+        manager_stats[manager]['sales'] += row['공급가액']
 
     result = []
     for manager, stats in manager_stats.items():
@@ -26825,10 +28609,11 @@ def api_profit_by_manager():
 
 @app.route('/api/profit/by-month')
 @login_required
+@cached_json_response('profit/by-month', defaults={'year': '2025'})
 def api_profit_by_month():
     """월별 손익 분석 - 실제 매출 + 원가율/판관비율 적용"""
     year = request.args.get('year', '2025')
-    data = load_excel_data(year)
+    data = load_excel_cube(year)  # 집계 큐브 셀
 
     # 원가율/판관비율 가져오기
     fin_settings = get_financial_settings(year)
@@ -26842,25 +28627,13 @@ def api_profit_by_month():
     month_stats = {m: {'count': 0, 'sales': 0} for m in range(1, 13)}
 
     for row in data:
-        date_str = row.get('접수일자', '')
-        if not date_str:
-            continue
-        try:
-            if isinstance(date_str, str):
-                month = int(date_str.split('-')[1]) if '-' in date_str else int(date_str.split('/')[1])
-            else:
-                month = date_str.month
-        except:
-            continue
+        month = row['recv_month']  # 접수일자 없으면 0
 
         if 1 <= month <= 12:
-            month_stats[month]['count'] += 1
+            month_stats[month]['count'] += row['row_count']
 
             # 공급가액 사용
-            fee = row.get('공급가액', 0) or 0
-            if isinstance(fee, str):
-                fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
-            month_stats[month]['sales'] += fee
+            month_stats[month]['sales'] += row['공급가액']
 
     result = []
     for month in range(1, 13):
@@ -26984,6 +28757,7 @@ def api_admin_save_financial_settings():
 
         conn.commit()
         conn.close()
+        clear_result_cache('profit/')  # 손익 API 결과는 원가율/판관비율 설정에 의존
 
         # COST_RATE 글로벌 변수 업데이트 (해당 연도가 현재 연도인 경우)
         global COST_RATE
@@ -27074,93 +28848,55 @@ def index():
     return render_template_string(HTML_TEMPLATE)
 
 def filter_data_by_date(data, year, month=None, day=None, end_year=None, end_month=None, end_day=None):
-    """날짜 조건으로 데이터 필터링"""
-    from datetime import datetime, date
+    """날짜 조건으로 데이터 필터링 (행/큐브 셀의 수집 시 분리된 접수 연/월/일로 비교, 날짜 없으면 제외)
 
-    filtered = []
+    조건을 접수일 키(YYYYMMDD) 범위로 바꿔, SharedTable이면 날짜 인덱스(date_index)에서 고른다
+    (원래 행 순서 유지). dict 행 목록은 의도적으로 인덱스 없이 순차 비교한다 - 컬럼 테이블로 변환하지
+    못한 경우(_compact_rows)의 대체 경로라 인덱스를 만들어 둘 곳이 없다.
+    """
     year = int(year)
     month = int(month) if month else None
     day = int(day) if day else None
     end_year = int(end_year) if end_year else None
     end_month = int(end_month) if end_month else None
     end_day = int(end_day) if end_day else None
+    day_only = None  # 월 없이 일만 지정한 단일 날짜 모드 (연도 범위 안에서 일자 비교)
 
     # 범위 모드인 경우
     if end_year:
-        # 시작 날짜 결정
-        if month and day:
-            start_date = date(year, month, day)
-        elif month:
-            start_date = date(year, month, 1)
-        else:
-            start_date = date(year, 1, 1)
+        # 시작 날짜 결정 (YYYYMMDD)
+        start_key = year * 10000 + (month or 1) * 100 + (day if month and day else 1)
 
         # 종료 날짜 결정
         if end_month and end_day:
-            end_date = date(end_year, end_month, end_day)
+            end_key = end_year * 10000 + end_month * 100 + end_day
         elif end_month:
             # 해당 월의 마지막 날
             import calendar
-            last_day = calendar.monthrange(end_year, end_month)[1]
-            end_date = date(end_year, end_month, last_day)
+            end_key = end_year * 10000 + end_month * 100 + calendar.monthrange(end_year, end_month)[1]
         else:
-            end_date = date(end_year, 12, 31)
-
-        for row in data:
-            row_date = row.get('접수일자')
-            if not row_date:
-                continue
-
-            # datetime 또는 date 객체로 변환
-            if hasattr(row_date, 'date'):
-                row_date = row_date.date()
-            elif hasattr(row_date, 'year'):
-                row_date = date(row_date.year, row_date.month, row_date.day)
-            else:
-                try:
-                    parts = str(row_date).split('-')
-                    row_date = date(int(parts[0]), int(parts[1]), int(parts[2][:2]))
-                except:
-                    continue
-
-            if start_date <= row_date <= end_date:
-                filtered.append(row)
+            end_key = end_year * 10000 + 1231
+    elif month:
+        # 단일 날짜 모드 (월, 월+일)
+        start_key = year * 10000 + month * 100 + (day or 0)
+        end_key = year * 10000 + month * 100 + (day or 99)
     else:
-        # 단일 날짜 모드
-        for row in data:
-            row_date = row.get('접수일자')
-            if not row_date:
-                continue
-
-            # 연도 확인
-            if hasattr(row_date, 'year'):
-                row_year = row_date.year
-                row_month = row_date.month
-                row_day = row_date.day
-            else:
-                try:
-                    parts = str(row_date).split('-')
-                    row_year = int(parts[0])
-                    row_month = int(parts[1])
-                    row_day = int(parts[2][:2])
-                except:
-                    continue
-
-            if row_year != year:
-                continue
-
-            if month and row_month != month:
-                continue
-
-            if day and row_day != day:
-                continue
-
-            filtered.append(row)
+        start_key, end_key = year * 10000, year * 10000 + 9999
+        day_only = day
 
+    # 날짜 없는 행(키 0)은 어느 범위에도 들지 않음
+    start_key = max(start_key, 1)
+    if isinstance(data, SharedTable):
+        filtered = data.rows_between(start_key, end_key)
+    else:
+        filtered = [row for row in data
+                    if start_key <= row['recv_year'] * 10000 + row['recv_month'] * 100 + row['recv_day'] <= end_key]
+    if day_only:
+        filtered = [row for row in filtered if row['recv_day'] == day_only]
     return filtered
 
-@app.route('/api/data')
-def get_data():
+def _dashboard_request_data():
+    """/api/data 요청 인자 → (날짜 필터링된 큐브 셀, 검사목적, 전년도 거래처) - 전체/구역별 응답 공용"""
     year = request.args.get('year', '2025')
     month = request.args.get('month', '')
     day = request.args.get('day', '')
@@ -27178,40 +28914,71 @@ def get_data():
     if end_day: date_info += f", end_day={end_day}"
     print(f"[API] 요청: {date_info}, purpose={purpose}")
 
-    # 기본 데이터 로드 (연도별)
+    # 기본 데이터 로드 (연도별 집계 큐브 - 행 대신 그룹 셀 단위로 처리)
     years_to_load = {year}
     if end_year and end_year != year:
         years_to_load.add(end_year)
 
-    all_data = []
-    for y in years_to_load:
-        all_data.extend(load_excel_data(y))
-
-    print(f"[API] 로드된 원본 데이터: {len(all_data)}건")
+    cubes = [load_excel_cube(y) for y in sorted(years_to_load)]  # 연도 순 (셀 순서가 실행마다 같게)
+    print(f"[API] 로드된 큐브 셀: {sum(len(cube) for cube in cubes)}개")
 
-    # 전년도 거래처 목록 추출 (신규/기존 판단용)
-    prev_year_clients = set()
+    # 전년도 거래처 목록 (신규/기존 판단용 - 수집 시 만든 거래처 인덱스 조회)
+    prev_year_clients = {}
     try:
         prev_year = str(int(year) - 1)
-        prev_year_data = load_excel_data(prev_year)
-        if prev_year_data:
-            for row in prev_year_data:
-                client = str(row.get('거래처', '') or '').strip()
-                if client:
-                    prev_year_clients.add(client)
+        prev_year_clients = load_client_index('excel_data', prev_year)
+        if prev_year_clients:
             print(f"[API] 전년도({prev_year}) 거래처: {len(prev_year_clients)}개")
     except Exception as e:
-        print(f"[API] 전년도 데이터 로드 실패: {e}")
+        print(f"[API] 전년도 거래처 인덱스 로드 실패: {e}")
+        g.skip_result_cache = True  # 신규/기존 거래처 수가 빠진 응답은 결과 캐시에 남기지 않음
 
-    # 날짜 필터링 적용
-    filtered_data = filter_data_by_date(all_data, year, month, day, end_year, end_month, end_day)
-    print(f"[API] 날짜 필터링 후 데이터: {len(filtered_data)}건")
+    # 날짜 필터링 적용 (연도별 큐브의 날짜 인덱스에서 범위 선택)
+    filtered_data = []
+    for cube in cubes:
+        filtered_data.extend(filter_data_by_date(cube, year, month, day, end_year, end_month, end_day))
+    print(f"[API] 날짜 필터링 후 큐브 셀: {len(filtered_data)}개")
+    return filtered_data, purpose, prev_year_clients.keys() if prev_year_clients else None
 
-    processed = process_data(filtered_data, purpose, prev_year_clients if prev_year_clients else None)
+
+@app.route('/api/data')
+@cached_json_response('data', defaults={'year': '2025', 'purpose': '전체'})
+def get_data():
+    """대시보드 전체 데이터 API (모든 구역)"""
+    filtered_data, purpose, prev_year_clients = _dashboard_request_data()
+    processed = process_data(filtered_data, purpose, prev_year_clients)
     print(f"[API] 처리 완료: total_count={processed['total_count']}")
     return jsonify(processed)
 
+
+@app.route('/api/data/<section>')
+@cached_json_response('data_section', defaults={'year': '2025', 'purpose': '전체'},
+                      extra_key=lambda: request.view_args.get('section'))
+def get_data_section(section):
+    """대시보드 구역별 데이터 API (DASHBOARD_SECTIONS) - 구역에 필요한 명세만 계산하고 구역마다 따로 캐시
+
+    화면은 summary를 먼저 받아 KPI를 그리고, 보이는 탭의 구역만 받는다.
+    """
+    if section not in DASHBOARD_SECTIONS:
+        return jsonify({'error': f'알 수 없는 구역: {section}', 'sections': list(DASHBOARD_SECTIONS)}), 404
+    filtered_data, purpose, prev_year_clients = _dashboard_request_data()
+    processed = process_data(filtered_data, purpose, prev_year_clients, section=section)
+    print(f"[API] {section} 구역 처리 완료: {len(processed)}개 키")
+    return jsonify(processed)
+
+def _food_item_use_sql(year):
+    """/api/food_item을 SQLite 집계로 처리할지 (auto: 연도 행이 현재 세대로 메모리에 없을 때만)"""
+    if FOOD_ITEM_ENGINE == 'python' or not (USE_SQLITE and SQLITE_DB.exists()):
+        return False
+    if FOOD_ITEM_ENGINE == 'sql':
+        return True
+    cache_key = f"food_item_{year}"
+    return cached_entry(cache_key, data_generation(cache_key)) is None
+
+
 @app.route('/api/food_item')
+@cached_json_response('food_item', defaults={'year': '2025', 'purpose': '전체', 'sample_type': '전체',
+                                               'item': '전체', 'manager': '전체'})
 def get_food_item_data():
     """검사항목 데이터 API"""
     year = request.args.get('year', '2025')
@@ -27222,18 +28989,22 @@ def get_food_item_data():
 
     print(f"[API] food_item 요청: year={year}, purpose={purpose}, sample_type={sample_type}, item={item}, manager={manager}")
 
-    # 데이터 로드
-    data = load_food_item_data(year)
-    print(f"[API] food_item 로드: {len(data)}건")
-
-    # 데이터 처리
-    processed = process_food_item_data(
-        data,
-        purpose_filter=purpose if purpose != '전체' else None,
-        sample_type_filter=sample_type if sample_type != '전체' else None,
-        item_filter=item if item != '전체' else None,
-        manager_filter=manager if manager != '전체' else None
-    )
+    filters = {
+        'purpose_filter': purpose if purpose != '전체' else None,
+        'sample_type_filter': sample_type if sample_type != '전체' else None,
+        'item_filter': item if item != '전체' else None,
+        'manager_filter': manager if manager != '전체' else None,
+    }
+    if _food_item_use_sql(year):
+        # SQLite에서 필터/GROUP BY 실행 (연도 행 전체를 메모리에 올리지 않음)
+        processed = process_food_item_data_sqlite(year, **filters)
+    else:
+        # 데이터 로드
+        data = load_food_item_data(year)
+        print(f"[API] food_item 로드: {len(data)}건")
+
+        # 데이터 처리
+        processed = process_food_item_data(data, **filters)
 
     processed['year'] = int(year)
     print(f"[API] food_item 처리 완료: total_count={processed['total_count']}")
@@ -27241,6 +29012,7 @@ def get_food_item_data():
 
 @app.route('/api/collection')
 @login_required
+@cached_json_response('collection', defaults={'year': '2025'}, extra_key=lambda: date.today().isoformat())
 def get_collection_data():
     """수금 현황 API"""
     from datetime import datetime, date
@@ -27267,18 +29039,17 @@ def get_collection_data():
 
         for row in data:
             # 수수료 = 공급가액 + 세액 (부가세 포함 총액)
-            sales = row.get('수수료', 0) or 0
-            if isinstance(sales, str):
-                sales = float(sales.replace(',', '').replace('원', '')) if sales else 0
+            sales = row['수수료']
 
             total_sales += sales
 
-            manager = str(row.get('영업담당', '') or '').strip() or '미지정'
-            payment_status = str(row.get('입금여부', '') or '').strip()
-            payment_date_str = str(row.get('입금일', '') or '').strip()
-            reception_date_str = str(row.get('접수일자', '') or '').strip()
-            payment_type = str(row.get('입금구분', '') or '').strip() or '기타'
-            company = str(row.get('거래처', '') or '').strip()
+            # 수집 시 정규화된 값 (날짜는 date 객체 또는 None)
+            manager = row['영업담당'] or DEFAULT_MANAGER
+            payment_status = row['입금여부']
+            payment_date = row['입금일']
+            reception_date = row['접수일자']
+            payment_type = row['입금구분'] or '기타'
+            company = row['거래처']
 
             if manager not in by_manager:
                 by_manager[manager] = {'total': 0, 'paid': 0, 'unpaid': 0}
@@ -27294,36 +29065,25 @@ def get_collection_data():
                 by_manager[manager]['paid'] += sales
                 by_type[payment_type] += sales
 
-                try:
-                    if reception_date_str and payment_date_str:
-                        reception_date = datetime.strptime(reception_date_str[:10], '%Y-%m-%d').date()
-                        payment_date = datetime.strptime(payment_date_str[:10], '%Y-%m-%d').date()
-                        days = (payment_date - reception_date).days
-                        if 0 <= days <= 365:
-                            collection_days.append(days)
-                        month = payment_date.month
-                        if month not in by_month:
-                            by_month[month] = {'paid': 0, 'count': 0}
-                        by_month[month]['paid'] += sales
-                        by_month[month]['count'] += 1
-                except:
-                    pass
+                if reception_date and payment_date:
+                    days = (payment_date - reception_date).days
+                    if 0 <= days <= 365:
+                        collection_days.append(days)
+                    month = payment_date.month
+                    if month not in by_month:
+                        by_month[month] = {'paid': 0, 'count': 0}
+                    by_month[month]['paid'] += sales
+                    by_month[month]['count'] += 1
             else:
                 unpaid_amount += sales
                 by_manager[manager]['unpaid'] += sales
 
                 if sales > 0:
-                    elapsed_days = 0
-                    try:
-                        if reception_date_str:
-                            reception_date = datetime.strptime(reception_date_str[:10], '%Y-%m-%d').date()
-                            elapsed_days = (today - reception_date).days
-                    except:
-                        pass
+                    elapsed_days = (today - reception_date).days if reception_date else 0
 
                     unpaid_list.append({
                         'company': company,
-                        'date': reception_date_str[:10] if reception_date_str else '-',
+                        'date': reception_date.isoformat() if reception_date else '-',
                         'amount': sales,
                         'days': elapsed_days,
                         'manager': manager
@@ -27579,16 +29339,229 @@ def get_columns():
     except Exception as e:
         return jsonify({'error': str(e), 'columns': []})
 
-@app.route('/api/upload-db', methods=['POST'])
-def upload_db():
-    """Colab에서 생성된 DB 파일 업로드 API"""
+def validate_db_file(db_path, require_rows=True):
+    """업로드된 DB 파일 검증 (무결성, 필수 테이블, 행 수)
+
+    Args:
+        require_rows: excel_data가 비어있으면 실패 (전체 DB 업로드용, 부분 업로드는 False)
+
+    Returns:
+        {테이블명: 행 수}
+
+    Raises:
+        ValueError: 검증 실패
+    """
+    import sqlite3
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        cursor = conn.cursor()
+        result = cursor.execute('PRAGMA integrity_check').fetchone()
+        if not result or result[0] != 'ok':
+            raise ValueError(f"integrity_check: {result[0] if result else '결과 없음'}")
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tables = [row[0] for row in cursor.fetchall()]
+        missing = [t for t in ('excel_data', 'food_item_data', 'file_metadata') if t not in tables]
+        if missing:
+            raise ValueError(f"필수 테이블 없음: {', '.join(missing)}")
+
+        table_info = {}
+        for table in tables:
+            cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+            table_info[table] = cursor.fetchone()[0]
+        if require_rows and table_info['excel_data'] == 0:
+            raise ValueError("excel_data 테이블이 비어있음")
+        return table_info
+    except sqlite3.DatabaseError as e:
+        raise ValueError(f"SQLite DB가 아님: {e}")
+    finally:
+        conn.close()
+
+
+def publish_uploaded_db(staging_path):
+    """업로드 DB로 교체하고 새 캐시 스냅샷을 다 읽은 뒤 세대와 함께 한 번에 게시 (백그라운드 스레드)
+
+    교체부터 게시까지 INGEST_LOCK을 잡고 있으므로 감시 스레드가 세대를 먼저 올리지 않는다.
+    그동안 요청은 이전 세대의 DATA_CACHE/결과 캐시로 계속 응답하고, 캐시에 없던 키를 읽은
+    항목은 게시 때 새 스냅샷으로 대체된다.
+    """
+    global DATA_CACHE, AI_SUMMARY_CACHE, FILE_MTIME
     import shutil
+    import time
 
-    # 간단한 API 키 인증 (환경변수 또는 기본값)
+    start_time = time.time()
+    try:
+        with INGEST_LOCK:
+            # 기존 DB 백업
+            if SQLITE_DB.exists():
+                backup_path = SQLITE_DB.with_suffix('.db.backup')
+                shutil.copy(str(SQLITE_DB), str(backup_path))
+                print(f"[DB] 기존 DB 백업: {backup_path}")
+
+            # 원자적 교체 - 이미 열린 연결은 이전 파일을 끝까지 읽는다
+            os.replace(str(staging_path), str(SQLITE_DB))
+            print(f"[DB] 새 DB 교체 완료: {SQLITE_DB}")
+
+            # 로드된 적 있던 키를 새 파일의 세대로 모두 읽은 뒤 세대 → 캐시 순서로 게시
+            identity, generations = _compute_data_generations()
+            snapshot = load_cache_snapshot(set(DATA_CACHE) | {'2024', '2025'}, generations)
+            _publish_data_generations(identity, generations)
+            DATA_CACHE = snapshot
+            AI_SUMMARY_CACHE = {}
+            FILE_MTIME = {}
+            try:
+                build_client_indexes()  # 새 DB의 거래처 인덱스 (만들어지기 전 요청은 원본에서 읽기만 함)
+            except sqlite3.Error as e:
+                print(f"[DB ERROR] 거래처 인덱스 생성 실패: {e}")
+        print(f"[DB] 새 DB 캐시 교체 완료 ({time.time() - start_time:.1f}초)")
+    except Exception as e:
+        # 교체 전 실패면 이전 DB/캐시 그대로, 교체 후 실패면 감시 스레드가 DB 변경을 감지해 세대를 올림
+        print(f"[DB ERROR] 업로드 DB 게시 실패: {e}")
+    finally:
+        if Path(staging_path).exists():
+            Path(staging_path).unlink()
+
+
+def refresh_changed_caches(changed):
+    """변경된 (테이블, 연도)의 캐시만 새로 읽어 교체 (호출자가 INGEST_LOCK 보유)"""
+    global AI_SUMMARY_CACHE
+
+    # 새 세대를 먼저 계산 - 바뀌지 않은 연도의 캐시는 그대로 유효
+    update_data_generations()
+    for table, year in changed:
+        if table == 'food_item_data':
+            cache_key = f"food_item_{year}"
+            if cache_key in DATA_CACHE:  # 로드된 적 있는 연도만 미리 교체
+                load_food_item_data(year, use_cache=False)
+        else:
+            load_excel_data(year, use_cache=False)
+            if f"cube_{year}" in DATA_CACHE:
+                load_excel_cube(year, use_cache=False)
+    build_client_indexes()  # 바뀐 (테이블, 연도)의 거래처 인덱스는 수집 직후 DB에 다시 생성
+    AI_SUMMARY_CACHE = {}
+
+
+def _partition_file_path(table, year, source_file):
+    """업로드된 파티션의 file_metadata 키 (로컬 Excel 경로와 겹치지 않음)"""
+    return f"upload:{table}/{year}/{source_file}"
+
+
+def get_partition_manifest():
+    """서버 DB의 파티션(테이블/연도/원본 파일) 목록과 내용 해시"""
+    import sqlite3
+
+    if not SQLITE_DB.exists():
+        return []
+    conn = sqlite3.connect(str(SQLITE_DB))
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT table_name, year, source_file, content_hash, row_count, file_path
+            FROM file_metadata WHERE table_name IS NOT NULL
+        ''')
+        return [{'table': table, 'year': year, 'source_file': source_file, 'content_hash': content_hash,
+                 'row_count': row_count, 'uploaded': file_path.startswith('upload:')}
+                for table, year, source_file, content_hash, row_count, file_path in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def diff_partition_manifest(client_partitions, years):
+    """클라이언트 매니페스트와 서버 파티션 비교
+
+    Returns:
+        (업로드가 필요한 파티션 목록, 서버에서 지울 업로드 파티션 목록) - 각 항목은 {'table', 'year', 'source_file'}
+    """
+    server = {(p['table'], p['year'], p['source_file']): p for p in get_partition_manifest()}
+    client_keys = set()
+    changed = []
+    for p in client_partitions:
+        key = (p['table'], str(p['year']), p['source_file'])
+        client_keys.add(key)
+        known = server.get(key)
+        if not known or not known['content_hash'] or known['content_hash'] != p.get('content_hash'):
+            changed.append({'table': key[0], 'year': key[1], 'source_file': key[2]})
+    years = {str(y) for y in years}
+    removed = [{'table': key[0], 'year': key[1], 'source_file': key[2]}
+               for key, p in server.items()
+               if p['uploaded'] and key[1] in years and key not in client_keys]
+    return changed, removed
+
+
+def merge_delta_db(delta_path, removed):
+    """부분 업로드 DB의 파티션을 서버 DB에 한 트랜잭션으로 병합
+
+    delta DB의 file_metadata에 있는 (테이블, 연도, 원본 파일)마다 서버의 같은 파티션 행을 지우고
+    delta의 행으로 채운다. removed 파티션은 행과 메타데이터를 삭제한다.
+
+    Returns:
+        변경된 (테이블, 연도) 목록
+    """
+    import sqlite3
+
+    columns = {'excel_data': EXCEL_DATA_COLUMN_NAMES, 'food_item_data': FOOD_ITEM_COLUMN_NAMES}
+    changed = set()
+    conn = sqlite3.connect(str(SQLITE_DB))
+    try:
+        conn.execute('ATTACH DATABASE ? AS delta', (str(delta_path),))
+        partitions = conn.execute('''
+            SELECT table_name, year, source_file, mtime, row_count, size, content_hash
+            FROM delta.file_metadata WHERE table_name IN ('excel_data', 'food_item_data')
+        ''').fetchall()
+        with conn:
+            for table, year, source_file, mtime, row_count, size, content_hash in partitions:
+                column_list = ', '.join(['year', 'source_file'] + [_quote_col(c) for c in columns[table]])
+                conn.execute(f'DELETE FROM {table} WHERE year = ? AND source_file = ?', (year, source_file))
+                conn.execute(f'''
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM delta.{table}
+                    WHERE year = ? AND source_file = ? ORDER BY id
+                ''', (year, source_file))
+                if table == 'excel_data':
+                    _refresh_cube(conn, year, source_file)
+                conn.execute('''
+                    INSERT OR REPLACE INTO file_metadata
+                        (file_path, mtime, row_count, table_name, year, source_file, size, content_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (_partition_file_path(table, year, source_file), mtime, row_count, table, year, source_file,
+                      size, content_hash))
+                changed.add((table, year))
+                print(f"[DB] 파티션 병합: {table} {year} {source_file} ({row_count or 0:,}건)")
+            for p in removed:
+                table, year, source_file = p['table'], str(p['year']), p['source_file']
+                if table not in columns:
+                    continue
+                conn.execute(f'DELETE FROM {table} WHERE year = ? AND source_file = ?', (year, source_file))
+                conn.execute('DELETE FROM file_metadata WHERE file_path = ?',
+                             (_partition_file_path(table, year, source_file),))
+                if table == 'excel_data':
+                    _refresh_cube(conn, year, source_file)
+                changed.add((table, year))
+                print(f"[DB] 파티션 삭제: {table} {year} {source_file}")
+        conn.execute('DETACH DATABASE delta')
+    finally:
+        conn.close()
+    return sorted(changed)
+
+
+def _check_upload_key():
+    """DB 업로드 API 키 확인 (환경변수 또는 기본값)"""
     api_key = request.headers.get('X-API-Key', '')
     expected_key = os.environ.get('DB_UPLOAD_KEY', 'biofl1411-upload-key')
+    return api_key == expected_key
+
+
+@app.route('/api/upload-db', methods=['POST'])
+def upload_db():
+    """Colab에서 생성된 DB 파일 업로드 API
+
+    스테이징 파일에 받아 검증한 뒤, 백그라운드에서 원자적으로 교체하고 새 DB 캐시를 다 읽으면 게시한다.
+    """
+    import tempfile
 
-    if api_key != expected_key:
+    # 간단한 API 키 인증 (환경변수 또는 기본값)
+    if not _check_upload_key():
         return jsonify({'error': '인증 실패'}), 401
 
     if 'file' not in request.files:
@@ -27598,69 +29571,163 @@ def upload_db():
     if file.filename == '':
         return jsonify({'error': '파일명이 없습니다'}), 400
 
+    # 같은 폴더의 임시 파일 (os.replace가 원자적이려면 같은 파일시스템이어야 함)
+    fd, staging_name = tempfile.mkstemp(dir=str(SQLITE_DB.parent), prefix=SQLITE_DB.name + '.', suffix='.upload')
+    os.close(fd)
+    staging_path = Path(staging_name)
     try:
-        # 기존 DB 백업
-        if SQLITE_DB.exists():
-            backup_path = SQLITE_DB.with_suffix('.db.backup')
-            shutil.copy(str(SQLITE_DB), str(backup_path))
-            print(f"[DB] 기존 DB 백업: {backup_path}")
-
-        # 새 DB 저장
-        file.save(str(SQLITE_DB))
-        print(f"[DB] 새 DB 업로드 완료: {SQLITE_DB}")
-
-        # DB 검증 - 테이블 및 행 수 확인
-        import sqlite3
-        conn = sqlite3.connect(str(SQLITE_DB))
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
-
-        table_info = {}
-        for table in tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            table_info[table] = count
+        # 업로드는 스테이징 파일에 저장 (서비스 중인 DB는 건드리지 않음)
+        file.save(str(staging_path))
+        print(f"[DB] 업로드 수신: {staging_path}")
 
-        conn.close()
+        # 구 스키마(raw_data JSON) DB면 타입 컬럼 스키마로 변환 후 검증
+        init_sqlite_db(staging_path)
+        table_info = validate_db_file(staging_path)
 
-        # 캐시 초기화
-        global DATA_CACHE, CACHE_TIME, AI_SUMMARY_CACHE, FILE_MTIME
-        DATA_CACHE = {}
-        CACHE_TIME = {}
-        AI_SUMMARY_CACHE = {}
-        FILE_MTIME = {}
-        print("[DB] 캐시 초기화 완료")
+        # 교체/캐시 준비는 백그라운드에서 (스테이징 파일은 스레드가 정리)
+        threading.Thread(target=publish_uploaded_db, args=(staging_path,), name='db-upload-publish',
+                         daemon=True).start()
+        staging_path = None
 
         return jsonify({
             'status': 'ok',
-            'message': 'DB 업로드 성공',
+            'message': 'DB 업로드 성공 (교체와 캐시 준비는 백그라운드에서 진행)',
             'tables': table_info
         })
 
+    except (ValueError, sqlite3.DatabaseError) as e:
+        print(f"[DB ERROR] 업로드 DB 검증 실패: {e}")
+        return jsonify({'error': f'DB 검증 실패: {e}'}), 400
     except Exception as e:
         print(f"[DB ERROR] 업로드 실패: {e}")
         return jsonify({'error': str(e)}), 500
+    finally:
+        if staging_path is not None and staging_path.exists():
+            staging_path.unlink()
+
+
+@app.route('/api/upload-db/manifest', methods=['POST'])
+def upload_db_manifest():
+    """부분 업로드 1단계: 클라이언트 파티션 매니페스트를 받아 업로드할/지울 파티션 반환
+
+    요청 JSON: {'years': [...], 'partitions': [{'table', 'year', 'source_file', 'content_hash'}, ...]}
+    """
+    if not _check_upload_key():
+        return jsonify({'error': '인증 실패'}), 401
+
+    payload = request.get_json(silent=True) or {}
+    partitions = payload.get('partitions', [])
+    years = payload.get('years') or sorted({str(p['year']) for p in partitions})
+    try:
+        changed, removed = diff_partition_manifest(partitions, years)
+    except (KeyError, TypeError) as e:
+        return jsonify({'error': f'매니페스트 형식 오류: {e}'}), 400
+
+    print(f"[DB] 매니페스트 비교: 파티션 {len(partitions)}개 중 {len(changed)}개 변경, {len(removed)}개 삭제")
+    return jsonify({'status': 'ok', 'changed': changed, 'removed': removed})
+
+
+@app.route('/api/upload-db/delta', methods=['POST'])
+def upload_db_delta():
+    """부분 업로드 2단계: 변경 파티션만 담은 DB(gzip 압축 가능)를 받아 서버 DB에 병합
+
+    폼 필드 removed: 삭제할 파티션 JSON 목록 (manifest 응답의 removed)
+    """
+    import gzip
+    import shutil
+    import tempfile
+
+    if not _check_upload_key():
+        return jsonify({'error': '인증 실패'}), 401
+
+    if 'file' not in request.files:
+        return jsonify({'error': '파일이 없습니다'}), 400
+
+    try:
+        removed = json.loads(request.form.get('removed') or '[]')
+    except ValueError:
+        return jsonify({'error': 'removed 형식 오류'}), 400
+
+    file = request.files['file']
+    fd, staging_name = tempfile.mkstemp(dir=str(SQLITE_DB.parent), prefix=SQLITE_DB.name + '.', suffix='.delta')
+    staging_path = Path(staging_name)
+    try:
+        # gzip이면 풀어서 스테이징 파일로 저장
+        with os.fdopen(fd, 'wb') as out:
+            head = file.stream.read(2)
+            file.stream.seek(0)
+            if head == b'\x1f\x8b':
+                with gzip.GzipFile(fileobj=file.stream) as gz:
+                    shutil.copyfileobj(gz, out)
+            else:
+                shutil.copyfileobj(file.stream, out)
+
+        init_sqlite_db(staging_path)
+        validate_db_file(staging_path, require_rows=False)
+
+        with INGEST_LOCK:
+            if not SQLITE_DB.exists():
+                init_sqlite_db()
+            changed = merge_delta_db(staging_path, removed)
+            # 바뀐 (테이블, 연도) 캐시만 새로 읽어 교체
+            refresh_changed_caches(changed)
+
+        return jsonify({
+            'status': 'ok',
+            'message': 'DB 부분 업로드 성공',
+            'changed': [{'table': table, 'year': year} for table, year in changed]
+        })
+
+    except (ValueError, sqlite3.DatabaseError, OSError) as e:
+        print(f"[DB ERROR] 부분 업로드 검증/병합 실패: {e}")
+        return jsonify({'error': f'부분 업로드 실패: {e}'}), 400
+    except Exception as e:
+        print(f"[DB ERROR] 부분 업로드 실패: {e}")
+        return jsonify({'error': str(e)}), 500
+    finally:
+        if staging_path.exists():
+            staging_path.unlink()
 
 
 @app.route('/api/cache/refresh')
 def refresh_cache():
-    """캐시 새로고침"""
-    global DATA_CACHE, CACHE_TIME, AI_SUMMARY_CACHE, FILE_MTIME
-    DATA_CACHE = {}
-    CACHE_TIME = {}
-    AI_SUMMARY_CACHE = {}
-    FILE_MTIME = {}
-    print("[CACHE] 모든 캐시 초기화됨")
-    # 데이터 미리 로드
-    for year in ['2024', '2025']:
-        load_excel_data(year, use_cache=False)
+    """캐시 새로고침 (새로 읽는 동안 요청은 이전 캐시로 응답하고, 다 읽으면 한 번에 교체)"""
+    global DATA_CACHE, AI_SUMMARY_CACHE, AI_SUMMARY_PARTIALS, FILE_MTIME
+    with INGEST_LOCK:
+        update_data_generations()
+        build_client_indexes()
+        DATA_CACHE = load_cache_snapshot({str(year) for year in ['2024', '2025']})
+        AI_SUMMARY_CACHE = {}
+        AI_SUMMARY_PARTIALS = {}
+        FILE_MTIME = {}
+        CLIENT_INDEX_CACHE.clear()
+    clear_result_cache()
+    print("[CACHE] 모든 캐시 새로 읽어 교체됨")
     # AI 요약 캐시도 미리 생성
     get_ai_data_summary(force_refresh=True)
     return jsonify({'status': 'ok', 'message': '캐시가 새로고침되었습니다.'})
 
 
+@app.route('/api/cache/stats')
+def cache_stats():
+    """API 결과 캐시 현황 (적중률/메모리 사용량)"""
+    return jsonify(result_cache_stats())
+
+
+@app.route('/healthz')
+def healthz():
+    """프로세스 생존 확인 (워밍업 여부와 무관하게 항상 200)"""
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/readyz')
+def readyz():
+    """워밍업 진행 상황 (진행 중이면 503, 완료/실패/워밍업 없음이면 200)"""
+    state = dict(WARMUP_STATE, completed=list(WARMUP_STATE['completed']),
+                 loaded=sorted(DATA_CACHE), ready=WARMUP_STATE['status'] != 'running')
+    return jsonify(state), 200 if state['ready'] else 503
+
+
 @app.route('/api/debug/urgent')
 def debug_urgent():
     """긴급여부 필드 값 확인용 디버그 API"""
@@ -28068,15 +30135,23 @@ def ai_analyze():
         months_active = len(data.get('months', []))
         client_analysis.append(f"{name}: {data['fee']/100000000:.2f}억({data['count']}건, {months_active}개월 거래, 전년비 {growth:+.1f}%)")
 
-    # 신규/이탈 고객 분석
-    clients_2024_set = set(stats_2024.get('by_client', {}).keys())
-    clients_2025_set = set(stats_2025.get('by_client', {}).keys())
+    # 신규/이탈 고객 분석 (거래처 인덱스 - 요약의 상위 100개가 아닌 전체 거래처 기준)
+    try:
+        client_index_2024 = load_client_index('food_item_data', '2024')
+        client_index_2025 = load_client_index('food_item_data', '2025')
+    except (sqlite3.Error, OSError) as e:
+        # 인덱스를 읽지 못하면 요약의 상위 거래처로 계산 (분석 요청은 계속 처리)
+        print(f"[AI] 거래처 인덱스 로드 실패 - 요약의 상위 거래처 사용: {e}")
+        client_index_2024 = stats_2024.get('by_client', {})
+        client_index_2025 = stats_2025.get('by_client', {})
+    clients_2024_set = set(client_index_2024) - {'미지정'}
+    clients_2025_set = set(client_index_2025) - {'미지정'}
     new_clients = clients_2025_set - clients_2024_set
     lost_clients = clients_2024_set - clients_2025_set
     retained_clients = clients_2024_set & clients_2025_set
 
-    new_client_revenue = sum(stats_2025.get('by_client', {}).get(c, {}).get('fee', 0) for c in new_clients)
-    lost_client_revenue = sum(stats_2024.get('by_client', {}).get(c, {}).get('fee', 0) for c in lost_clients)
+    new_client_revenue = sum(client_index_2025[c]['fee'] for c in new_clients)
+    lost_client_revenue = sum(client_index_2024[c]['fee'] for c in lost_clients)
     retention_rate = (len(retained_clients) / len(clients_2024_set) * 100) if clients_2024_set else 0
 
     avg_revenue_per_client_2025 = (stats_2025['total_fee'] / len(clients_2025_set)) if clients_2025_set else 0
@@ -28467,18 +30542,12 @@ def execute_analysis(params, food_2024, food_2025, data_2024, data_2025):
     description = params.get('description', '')
 
     def get_sales(row):
-        """공급가액 추출 (대시보드와 동일)"""
-        sales = row.get('공급가액', 0) or 0
-        if isinstance(sales, str):
-            sales = float(sales.replace(',', '').replace('원', '')) if sales else 0
-        return sales
+        """공급가액 (대시보드와 동일, 수집 시 숫자로 정규화됨)"""
+        return row['공급가액']
 
     def get_month(row):
-        """월 추출"""
-        date = row.get('접수일자')
-        if date and hasattr(date, 'month'):
-            return date.month
-        return 0
+        """접수월 (수집 시 분리 저장, 없으면 0)"""
+        return row['recv_month']
 
     def filter_data(data, month_filter=None, purpose_filter=None, sample_type_filter=None, manager_filter=None):
         """데이터 필터링"""
@@ -28488,11 +30557,11 @@ def execute_analysis(params, food_2024, food_2025, data_2024, data_2025):
                 row_month = get_month(row)
                 if row_month != int(month_filter):
                     continue
-            if purpose_filter and str(row.get('검사목적', '')).strip() != purpose_filter:
+            if purpose_filter and row['검사목적'] != purpose_filter:
                 continue
-            if sample_type_filter and str(row.get('검체유형', '')).strip() != sample_type_filter:
+            if sample_type_filter and row['검체유형'] != sample_type_filter:
                 continue
-            if manager_filter and str(row.get('영업담당', '')).strip() != manager_filter:
+            if manager_filter and row['영업담당'] != manager_filter:
                 continue
             filtered.append(row)
         return filtered
@@ -28581,7 +30650,7 @@ def execute_analysis(params, food_2024, food_2025, data_2024, data_2025):
         # 영업담당별 TOP N
         manager_stats = {}
         for row in filtered:
-            mgr = str(row.get('영업담당', '미지정')).strip()
+            mgr = row['영업담당']
             if mgr not in manager_stats:
                 manager_stats[mgr] = {'count': 0, 'sales': 0}
             manager_stats[mgr]['count'] += 1
@@ -28599,7 +30668,7 @@ def execute_analysis(params, food_2024, food_2025, data_2024, data_2025):
         # 검사목적별 TOP N
         purpose_stats = {}
         for row in filtered:
-            p = str(row.get('검사목적', '미지정')).strip()
+            p = row['검사목적']
             if p not in purpose_stats:
                 purpose_stats[p] = {'count': 0, 'sales': 0}
             purpose_stats[p]['count'] += 1
@@ -28648,36 +30717,30 @@ def goal_analysis():
         data_2025 = load_excel_data('2025')
 
         def get_fee(row):
-            """공급가액 추출"""
-            fee = row.get('공급가액', 0) or 0
-            if isinstance(fee, str):
-                fee = float(fee.replace(',', '').replace('원', '')) if fee else 0
-            return float(fee)
+            """공급가액 (수집 시 숫자로 정규화됨)"""
+            return row['공급가액']
 
         def match_filter(row, managers, teams, months, purposes, regions, sample_types, items, analyzers):
-            """필터 조건 매칭"""
+            """필터 조건 매칭 (수집 시 정규화된 값 그대로 비교)"""
             # 빈 배열이면 전체 선택으로 처리
-            if managers and str(row.get('영업담당', '')).strip() not in managers:
+            if managers and row['영업담당'] not in managers:
                 return False
             if teams:
-                manager = str(row.get('영업담당', '')).strip()
-                team = MANAGER_TO_BRANCH.get(manager, '기타')
-                if team not in teams:
+                if row['branch'] not in teams:
                     return False
             if months:
-                date = row.get('접수일자')
-                if date and hasattr(date, 'month'):
-                    if date.month not in months:
-                        return False
-            if purposes and str(row.get('검사목적', '')).strip() not in purposes:
+                month = row['recv_month']
+                if month and month not in months:
+                    return False
+            if purposes and row['검사목적'] not in purposes:
                 return False
-            if regions and str(row.get('지역', '')).strip() not in regions:
+            if regions and row['지역'] not in regions:
                 return False
-            if sample_types and str(row.get('검체유형', '')).strip() not in sample_types:
+            if sample_types and row['검체유형'] not in sample_types:
                 return False
-            if items and str(row.get('항목명', '')).strip() not in items:
+            if items and row['항목명'] not in items:
                 return False
-            if analyzers and str(row.get('결과입력자', '')).strip() not in analyzers:
+            if analyzers and row['결과입력자'] not in analyzers:
                 return False
             return True
 
@@ -28717,7 +30780,7 @@ def goal_analysis():
             if not match_filter(row, [], selected_teams, selected_months, selected_purposes,
                                selected_regions, selected_sample_types, selected_items, selected_analyzers):
                 continue
-            manager = str(row.get('영업담당', '') or '').strip() or '미지정'
+            manager = row['영업담당'] or DEFAULT_MANAGER
             revenue = get_fee(row)
             if manager not in by_manager:
                 by_manager[manager] = {'revenue_2025': 0, 'count_2025': 0, 'revenue_2024': 0, 'count_2024': 0}
@@ -28728,7 +30791,7 @@ def goal_analysis():
             if not match_filter(row, [], selected_teams, selected_months, selected_purposes,
                                selected_regions, selected_sample_types, selected_items, selected_analyzers):
                 continue
-            manager = str(row.get('영업담당', '') or '').strip() or '미지정'
+            manager = row['영업담당'] or DEFAULT_MANAGER
             revenue = get_fee(row)
             if manager not in by_manager:
                 by_manager[manager] = {'revenue_2025': 0, 'count_2025': 0, 'revenue_2024': 0, 'count_2024': 0}
@@ -28767,7 +30830,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, [],
                                selected_regions, selected_sample_types, selected_items, selected_analyzers):
                 continue
-            purpose = str(row.get('검사목적', '') or '').strip() or '미지정'
+            purpose = row['검사목적'] or '미지정'
             revenue = get_fee(row)
             if purpose not in by_purpose:
                 by_purpose[purpose] = {'revenue_2025': 0, 'count_2025': 0, 'revenue_2024': 0, 'count_2024': 0}
@@ -28778,7 +30841,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, [],
                                selected_regions, selected_sample_types, selected_items, selected_analyzers):
                 continue
-            purpose = str(row.get('검사목적', '') or '').strip() or '미지정'
+            purpose = row['검사목적'] or '미지정'
             revenue = get_fee(row)
             if purpose not in by_purpose:
                 by_purpose[purpose] = {'revenue_2025': 0, 'count_2025': 0, 'revenue_2024': 0, 'count_2024': 0}
@@ -28809,7 +30872,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, selected_purposes,
                                selected_regions, [], selected_items, selected_analyzers):
                 continue
-            sample_type = str(row.get('검체유형', '') or '').strip() or '미지정'
+            sample_type = row['검체유형'] or '미지정'
             revenue = get_fee(row)
             if sample_type not in by_sample_type:
                 by_sample_type[sample_type] = {'revenue_2025': 0, 'revenue_2024': 0}
@@ -28819,7 +30882,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, selected_purposes,
                                selected_regions, [], selected_items, selected_analyzers):
                 continue
-            sample_type = str(row.get('검체유형', '') or '').strip() or '미지정'
+            sample_type = row['검체유형'] or '미지정'
             revenue = get_fee(row)
             if sample_type not in by_sample_type:
                 by_sample_type[sample_type] = {'revenue_2025': 0, 'revenue_2024': 0}
@@ -28847,7 +30910,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, selected_purposes,
                                [], selected_sample_types, selected_items, selected_analyzers):
                 continue
-            address = str(row.get('업체주소', '') or '').strip()
+            address = row['업체주소']
             region = extract_sido(address)
             if not region:
                 region = '미지정'
@@ -28861,7 +30924,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, selected_purposes,
                                [], selected_sample_types, selected_items, selected_analyzers):
                 continue
-            address = str(row.get('업체주소', '') or '').strip()
+            address = row['업체주소']
             region = extract_sido(address)
             if not region:
                 region = '미지정'
@@ -28893,7 +30956,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, selected_purposes,
                                selected_regions, selected_sample_types, [], selected_analyzers):
                 continue
-            item = str(row.get('항목명', '') or '').strip()
+            item = row['항목명']
             if not item:
                 continue
             fee = get_fee(row)
@@ -28906,7 +30969,7 @@ def goal_analysis():
             if not match_filter(row, selected_managers, selected_teams, selected_months, selected_purposes,
                                selected_regions, selected_sample_types, [], selected_analyzers):
                 continue
-            item = str(row.get('항목명', '') or '').strip()
+            item = row['항목명']
             if not item:
                 continue
             fee = get_fee(row)
@@ -29105,12 +31168,12 @@ def goal_analysis():
         all_regions = set()
 
         for row in data_2025:
-            if row.get('영업담당'): all_managers.add(str(row.get('영업담당')).strip())
-            if row.get('검사목적'): all_purposes.add(str(row.get('검사목적')).strip())
-            if row.get('검체유형'): all_sample_types.add(str(row.get('검체유형')).strip())
-            if row.get('항목명'): all_items.add(str(row.get('항목명')).strip())
-            if row.get('결과입력자'): all_analyzers.add(str(row.get('결과입력자')).strip())
-            address = str(row.get('업체주소', '') or '').strip()
+            if row['영업담당']: all_managers.add(row['영업담당'])
+            if row['검사목적']: all_purposes.add(row['검사목적'])
+            if row['검체유형']: all_sample_types.add(row['검체유형'])
+            if row['항목명']: all_items.add(row['항목명'])
+            if row['결과입력자']: all_analyzers.add(row['결과입력자'])
+            address = row['업체주소']
             region = extract_sido(address)
             if region: all_regions.add(region)
 
@@ -29178,6 +31241,54 @@ def extract_sido(address):
     return None
 
 
+def _warmup_step(step):
+    """워밍업 진행 단계 기록 (/readyz 진행 상황)"""
+    if WARMUP_STATE['step']:
+        WARMUP_STATE['completed'].append(WARMUP_STATE['step'])
+    WARMUP_STATE['step'] = step
+
+
+def warm_up_data():
+    """백그라운드 워밍업: 데이터 로드 → AI 요약 → 자주 쓰는 API 응답 미리 생성
+
+    진행 중에 들어온 요청은 이미 캐시된 키는 바로 쓰고, 로드 중인 키만 그 로드를 기다린다.
+    """
+    start_time = time.time()
+    try:
+        preload_data()
+        _warmup_step('AI 요약 생성')
+        get_ai_data_summary()
+        save_cache_to_file()  # 파일별 부분합 보존 - 다음 시작 때 바뀐 파일만 다시 집계
+        client = app.test_client()
+        for path in WARMUP_PRERENDER:
+            _warmup_step(f'응답 미리 생성: {path}')
+            response = client.get(path)
+            if response.status_code != 200:
+                print(f"[WARMUP] {path} 응답 {response.status_code} - 건너뜀")
+        _warmup_step(None)
+        WARMUP_STATE['status'] = 'ready'
+        print(f"[WARMUP] 완료 ({time.time() - start_time:.1f}초)")
+    except Exception as e:
+        # 실패해도 서버는 계속 응답 (요청마다 필요한 데이터를 직접 로드)
+        WARMUP_STATE.update(status='failed', error=str(e))
+        print(f"[WARMUP ERROR] {WARMUP_STATE['step']}: {e}")
+    finally:
+        WARMUP_STATE['finished_at'] = datetime.now().isoformat(timespec='seconds')
+        WARMUP_DONE.set()
+
+
+def start_warmup():
+    """워밍업 스레드 시작 (포트는 바로 열고 데이터는 백그라운드에서 로드)"""
+    global WARMUP_THREAD
+    WARMUP_STATE.update(status='running', step=None, completed=[], error=None, finished_at=None,
+                        started_at=datetime.now().isoformat(timespec='seconds'))
+    WARMUP_DONE.clear()
+    WARMUP_THREAD = threading.Thread(target=warm_up_data, name='warmup', daemon=True)
+    WARMUP_THREAD.start()
+    print("[WARMUP] 백그라운드 워밍업 시작 (/readyz에서 진행 상황 확인)")
+    return WARMUP_THREAD
+
+
 def preload_data():
     """서버 시작 시 데이터 미리 로드 (SQLite 우선)"""
     import time
@@ -29188,25 +31299,30 @@ def preload_data():
         print("[PRELOAD] SQLite 모드로 시작...")
 
         # SQLite DB 업데이트 필요 여부 확인
-        if check_sqlite_needs_update():
-            print("[PRELOAD] SQLite DB 업데이트 필요 - Excel 변환 시작...")
-            convert_excel_to_sqlite()
-        else:
-            print("[PRELOAD] SQLite DB 최신 상태 유지")
+        _warmup_step('SQLite 최신 여부 확인')
+        with INGEST_LOCK:
+            migrate_sqlite_schema()  # 구 스키마 DB 변환은 여기서 한 번만 (요청 경로의 로더는 읽기만)
+            if check_sqlite_needs_update():
+                print("[PRELOAD] SQLite DB 업데이트 필요 - Excel 변환 시작...")
+                convert_excel_to_sqlite()
+            else:
+                print("[PRELOAD] SQLite DB 최신 상태 유지")
+            update_data_generations()
+            build_client_indexes()
+        load_cache_from_file()  # AI 요약 파일별 부분합 등 작은 상태 복원 (스냅샷이 있으면 바로 매핑)
 
-        # SQLite에서 빠르게 로드 (기본 데이터만, food_item은 필요시 로드)
+        # SQLite에서 빠르게 로드 (컬럼 테이블이라 food_item도 함께 미리 로드)
         for year in ['2024', '2025']:
+            _warmup_step(f'{year}년 데이터 로드')
             load_excel_data(year)
-            # load_food_item_data(year)  # 메모리 절약: 필요시 로드
-
-        # AI 요약 캐시 생성 (스킵 - 메모리 절약)
-        # get_ai_data_summary(force_refresh=True)
+            load_food_item_data(year)
 
         elapsed = time.time() - start_time
         print(f"[PRELOAD] SQLite 로드 완료! ({elapsed:.1f}초)")
         return
 
     # 2. 기존 방식: 파일 캐시에서 로드 시도
+    _warmup_step('파일 캐시 확인')
     if load_cache_from_file():
         elapsed = time.time() - start_time
         print(f"[PRELOAD] 파일 캐시에서 로드 완료! ({elapsed:.1f}초)")
@@ -29215,10 +31331,12 @@ def preload_data():
     # 3. 파일 캐시가 없거나 무효 -> Excel에서 로드
     print("[PRELOAD] Excel에서 데이터 로드 시작...")
     for year in ['2024', '2025']:
+        _warmup_step(f'{year}년 데이터 로드')
         load_excel_data(year)
         load_food_item_data(year)
 
     # 4. AI 요약 캐시도 미리 생성
+    _warmup_step('AI 요약 생성')
     get_ai_data_summary(force_refresh=True)
 
     # 5. 파일로 캐시 저장
@@ -29228,6 +31346,83 @@ def preload_data():
     print(f"[PRELOAD] 완료! ({elapsed:.1f}초)")
 
 
+def _data_files_snapshot():
+    """감시 대상 파일의 (mtime, size) 스냅샷 (data/<연도>, data/food_item/<연도>)"""
+    snapshot = {}
+    for f in _iter_data_files():
+        try:
+            st = f.stat()
+        except OSError:
+            continue  # 감시 중 삭제/이동된 파일
+        snapshot[str(f)] = (st.st_mtime, st.st_size)
+    return snapshot
+
+
+def apply_data_changes():
+    """변경된 Excel 파일을 증분 변환하고 해당 캐시만 새 데이터로 교체
+
+    새 데이터를 모두 읽은 뒤 캐시 항목을 한 번에 바꾸므로,
+    변환 중에도 요청은 이전 데이터로 계속 응답한다.
+    """
+    with INGEST_LOCK:
+        if USE_SQLITE:
+            changed = convert_excel_to_sqlite()
+        else:
+            # Excel 직접 로드 모드: 연도 단위로 다시 읽음
+            changed = [(table, year) for year in ['2024', '2025'] if check_data_changed(year)
+                       for table in ('excel_data', 'food_item_data')]
+        if not changed:
+            print("[WATCH] 변경된 데이터 없음")
+            return []
+
+        refresh_changed_caches(changed)
+        print(f"[WATCH] 캐시 교체 완료: {', '.join(f'{table} {year}' for table, year in changed)}")
+        return changed
+
+
+def _watch_data_files():
+    """데이터 폴더 폴링 루프 (디바운스 후 apply_data_changes 실행)
+
+    다른 프로세스가 DB를 직접 바꾼 경우(DB 파일 변경)에는 데이터 세대만 다시 계산해
+    바뀐 연도의 캐시가 다음 요청에서 새로 로드되게 한다.
+    """
+    last_snapshot = _data_files_snapshot()
+    pending_since = None
+    while True:
+        time.sleep(WATCH_INTERVAL if pending_since is None else min(WATCH_INTERVAL, WATCH_DEBOUNCE))
+        try:
+            if USE_SQLITE and SQLITE_DB.exists() and _db_identity() != _DB_IDENTITY:
+                with INGEST_LOCK:
+                    migrate_sqlite_schema()  # 다른 프로세스가 구 스키마 DB로 바꿔 놓은 경우
+                    changed = update_data_generations()
+                    if changed:
+                        build_client_indexes()
+                if changed:
+                    print(f"[WATCH] DB 외부 변경 감지 - 세대 갱신: {', '.join(changed)}")
+            snapshot = _data_files_snapshot()
+            if snapshot != last_snapshot:
+                last_snapshot = snapshot
+                pending_since = time.time()
+                print("[WATCH] 데이터 파일 변경 감지 - 안정될 때까지 대기")
+                continue
+            if pending_since is not None and time.time() - pending_since >= WATCH_DEBOUNCE:
+                pending_since = None
+                apply_data_changes()
+        except Exception as e:
+            print(f"[WATCH ERROR] {e}")
+
+
+def start_data_watcher():
+    """데이터 폴더 감시 스레드 시작 (서버 재시작 없이 새 월별 파일 반영)"""
+    if WATCH_INTERVAL <= 0:
+        print("[WATCH] 데이터 폴더 감시 꺼짐 (WATCH_INTERVAL=0)")
+        return None
+    thread = threading.Thread(target=_watch_data_files, name='data-watcher', daemon=True)
+    thread.start()
+    print(f"[WATCH] 데이터 폴더 감시 시작 ({WATCH_INTERVAL:g}초 간격, 디바운스 {WATCH_DEBOUNCE:g}초)")
+    return thread
+
+
 # ========== 웹 터미널 API ==========
 @app.route('/api/terminal/auth', methods=['POST'])
 def terminal_auth():
@@ -29302,7 +31497,8 @@ def terminal_exec():
 
 
 if __name__ == '__main__':
-    # 서버 시작 시 데이터 미리 로드
-    preload_data()
+    # 포트를 먼저 열고 데이터는 백그라운드에서 미리 로드 (/readyz로 진행 확인)
+    start_warmup()
+    start_data_watcher()
     port = int(os.environ.get('PORT', 6001))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,105 @@
+"""process_data 집계 엔진 벤치마크 (python 행 루프 vs numpy group-by) - pytest 수집 대상 아님
+
+사용법: python tests/benchmark_aggregation.py [--rows 100000] [--clients 300] [--repeat 3]
+
+임시 폴더에 합성 excel_data 행으로 SQLite DB를 만들고 2025년 집계 큐브(SharedTable)에서
+group-by 단계(run_aggregations / _CubeColumns.aggregate)와 process_data 전체 시간을 잰다 (각각 최소값).
+두 엔진 결과가 같은지도 확인한다. 셀이 행 수만큼 생기도록 차원 값을 고르므로 --rows가 큐브 크기이고,
+--clients는 거래처별 그룹 수 (공유 마무리 단계 비용이 여기에 비례).
+
+참고 측정 (큐브 셀 10만 개, 최소값):
+    거래처 300개   group-by 11.8배, process_data 8.3배
+    거래처 3000개  group-by 7.9배,  process_data 3.4배
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR.parent))
+
+import flask_dashboard as fd  # noqa: E402
+
+MANAGERS = ['오세중', '장동욱', '이강현', '마케팅', 'IBK', ''] + [f'담당{i}' for i in range(20)]
+PURPOSES = ['자가품질', '수거', '참고용', '']
+ADDRESSES = ['', '서울특별시 강남구 1', '경기도 수원시 2', '부산광역시 해운대구 3', '제주특별자치도 제주시 4']
+
+
+def synthetic_rows(year, count, clients, rng):
+    """합성 Excel 행 dict 목록"""
+    client_names = ['IBK', 'IGC', ''] + [f'거래처{i}' for i in range(clients)]
+    return [{
+        '접수일자': date(year, rng.randint(1, 12), rng.randint(1, 28)) if rng.random() > 0.05 else None,
+        '공급가액': rng.choice([10000, 25000, 33000, 55000, 120000]),
+        '거래처': rng.choice(client_names), '영업담당': rng.choice(MANAGERS), '검사목적': rng.choice(PURPOSES),
+        '부적합항목': rng.choice(['', '', '대장균', '세균수']), '검체유형': rng.choice(['과자', '음료', '']),
+        '긴급여부': rng.choice(['', '일반', '긴급']), '시험분야': rng.choice(['식품', '축산', '']),
+        '업체분류': rng.choice(['식품', '축산', '']), '거래처 주소': rng.choice(ADDRESSES),
+    } for _ in range(count)]
+
+
+def build_db(data_dir, rows, clients):
+    """합성 행으로 2025년 excel_data/집계 큐브 생성"""
+    fd.DATA_DIR = data_dir
+    fd.SQLITE_DB = data_dir / 'business_data.db'
+    fd.SHARED_DATA_DIR = data_dir / 'shared'
+    fd.init_sqlite_db()
+    rng = random.Random(2)
+    conn = sqlite3.connect(str(fd.SQLITE_DB))
+    with conn:
+        records = [fd.excel_row_to_record('2025', row, 'bench.xlsx') for row in synthetic_rows(2025, rows, clients, rng)]
+        conn.executemany(fd.EXCEL_DATA_INSERT_SQL, records)
+        fd._refresh_cube(conn, '2025', 'bench.xlsx')
+    conn.close()
+
+
+def best_of(repeat, fn):
+    """repeat번 실행 중 최소 시간과 마지막 결과"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--clients', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    if not fd.NUMPY_AVAILABLE:
+        sys.exit('numpy가 없어 numpy 엔진을 잴 수 없음')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_db(Path(tmp), args.rows, args.clients)
+        fd.update_data_generations()
+        cube = fd.load_excel_cube('2025')
+        specs = (fd.DASHBOARD_AGGREGATIONS, fd.DASHBOARD_DIMENSIONS, fd.DASHBOARD_FLAGS, fd.DASHBOARD_MEASURES, None)
+        prev_year_clients = {'거래처1', '거래처2'}
+
+        python_groupby, python_groups = best_of(args.repeat, lambda: fd.run_aggregations(cube, *specs))
+        numpy_groupby, numpy_groups = best_of(args.repeat, lambda: fd._CubeColumns(cube).aggregate(*specs))
+        timings = {}
+        results = {}
+        for engine in ('python', 'numpy'):
+            fd.AGGREGATION_ENGINE = engine
+            timings[engine], results[engine] = best_of(
+                args.repeat, lambda: fd.process_data(cube, None, prev_year_clients))
+
+    print(f"행 {args.rows:,}개, 거래처 {args.clients:,}개 → 큐브 셀 {len(cube):,}개")
+    print(f"group-by     python {python_groupby:.3f}초  numpy {numpy_groupby:.3f}초  "
+          f"({python_groupby / numpy_groupby:.1f}배)")
+    print(f"process_data python {timings['python']:.3f}초  numpy {timings['numpy']:.3f}초  "
+          f"({timings['python'] / timings['numpy']:.1f}배)")
+    print(f"결과 동일: group-by {python_groups == numpy_groups}, process_data {results['python'] == results['numpy']}")
+
+
+if __name__ == '__main__':
+    main()
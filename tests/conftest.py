@@ -0,0 +1,102 @@
+"""flask_dashboard 테스트 공용 픽스처
+
+모든 경로(DATA_DIR, SQLITE_DB, 공유 스냅샷, 파일 캐시)를 임시 폴더로 돌리고 모듈 전역 캐시를 비운 뒤
+fixture_data.py의 결정적 Excel 원본으로 만든 SQLite DB를 쓴다.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR))
+sys.path.insert(0, str(TESTS_DIR.parent))
+
+from fixture_data import write_data_dir  # noqa: E402
+
+import flask_dashboard as fd  # noqa: E402
+
+
+def build_data_dir(data_dir):
+    """픽스처 Excel 기록 후 현재 구현으로 SQLite 변환"""
+    write_data_dir(data_dir)
+    point_at(data_dir)
+    fd.init_sqlite_db()
+    fd.convert_excel_to_sqlite()
+
+
+def point_at(data_dir):
+    """모듈 경로 전역을 data_dir 기준으로 바꿈"""
+    fd.DATA_DIR = data_dir
+    fd.SQLITE_DB = data_dir / 'business_data.db'
+    fd.CACHE_FILE = data_dir / 'data_cache.json'
+    fd.SHARED_DATA_DIR = data_dir / 'shared'
+
+
+def reset_caches():
+    """모듈 전역 캐시/세대 초기화"""
+    fd.DATA_CACHE = {}
+    fd.DATA_GENERATIONS = {}
+    fd._DB_IDENTITY = None
+    fd.FILE_MTIME = {}
+    fd.FILE_SIGNATURES.clear()
+    fd.AI_SUMMARY_CACHE = {}
+    fd.AI_SUMMARY_PARTIALS.clear()
+    fd.CLIENT_INDEX_CACHE.clear()
+    fd.clear_result_cache()
+
+
+@pytest.fixture(scope='session')
+def built_data_dir(tmp_path_factory):
+    """읽기 전용 테스트가 같이 쓰는 픽스처 데이터 폴더 (Excel + SQLite)"""
+    data_dir = tmp_path_factory.mktemp('data')
+    fd.INGEST_WORKERS = 1
+    build_data_dir(data_dir)
+    return data_dir
+
+
+@pytest.fixture
+def dashboard(built_data_dir, tmp_path, monkeypatch):
+    """공용 픽스처 DB를 가리키는 flask_dashboard 모듈 (테스트마다 캐시 초기화, 공유 스냅샷은 테스트별 폴더)"""
+    for name in ('DATA_DIR', 'SQLITE_DB', 'CACHE_FILE', 'SHARED_DATA_DIR', 'USE_SQLITE', 'INGEST_WORKERS',
+                 'AGGREGATION_ENGINE', 'FOOD_ITEM_ENGINE'):
+        monkeypatch.setattr(fd, name, getattr(fd, name))
+    point_at(built_data_dir)
+    fd.SHARED_DATA_DIR = tmp_path / 'shared'
+    fd.INGEST_WORKERS = 1
+    reset_caches()
+    with fd.INGEST_LOCK:
+        fd.update_data_generations()
+        fd.build_client_indexes()
+    yield fd
+    reset_caches()
+
+
+@pytest.fixture
+def fresh_dashboard(tmp_path, monkeypatch):
+    """테스트 전용 데이터 폴더를 새로 만든 flask_dashboard 모듈 (DB를 바꾸는 테스트용)"""
+    for name in ('DATA_DIR', 'SQLITE_DB', 'CACHE_FILE', 'SHARED_DATA_DIR', 'USE_SQLITE', 'INGEST_WORKERS',
+                 'AGGREGATION_ENGINE', 'FOOD_ITEM_ENGINE'):
+        monkeypatch.setattr(fd, name, getattr(fd, name))
+    fd.INGEST_WORKERS = 1
+    reset_caches()
+    build_data_dir(tmp_path / 'data')
+    with fd.INGEST_LOCK:
+        fd.update_data_generations()
+        fd.build_client_indexes()
+    yield fd
+    reset_caches()
+
+
+@pytest.fixture
+def client(dashboard):
+    """로그인 세션 쿠키를 가진 테스트 클라이언트"""
+    dashboard.USER_SESSIONS['test-session'] = {
+        'user_id': 1, 'username': 'tester', 'name': 'tester', 'role': 'admin',
+        'login_time': datetime.now(), 'last_activity': datetime.now(),
+    }
+    test_client = dashboard.app.test_client()
+    test_client.set_cookie('session_id', 'test-session')
+    yield test_client
+    dashboard.USER_SESSIONS.pop('test-session', None)
@@ -0,0 +1,112 @@
+"""테스트용 결정적 Excel 원본 데이터 (기준 출력 생성 스크립트와 테스트가 같이 씀)"""
+import random
+from datetime import datetime
+
+EXCEL_HEADERS = ['접수번호', '접수일자', '발행일', '검체유형', '업체명', '의뢰인명', '거래처', '영업담당', '검사목적',
+                 '시험분야', '업체분류', '검사구분', '부적합항목', '긴급여부', '총금액', '공급가액', '수수료',
+                 '입금여부', '입금일', '거래처 주소', '주소']
+
+FOOD_ITEM_HEADERS = ['접수일자', '발행일', '검체유형', '업체명', '의뢰인명', '업체주소', '항목명', '규격', '항목담당',
+                     '결과입력자', '입력일', '분석일', '항목단위', '시험결과', '시험치', '성적서결과', '판정', '검사목적',
+                     '긴급여부', '항목수수료', '영업담당']
+
+MANAGERS = ['오세중', '장동욱', '이강현', '마케팅', '본사접수', '엄은정', 'IBK', '미지정', '신규담당']
+PURPOSES = ['자가품질', '수거', '참고용', '유통기한설정', '']
+CLIENTS = ['가나식품', '다라유업', '마바제과', '사아수산', '자차농산', 'IBK', 'IGC', ''] + [f'거래처{i}' for i in range(25)]
+SAMPLE_TYPES = ['과자', '음료', '축산물', '수산물', '']
+DEFECTS = ['', '', '', '대장균', '세균수', '이물']
+ADDRESSES = ['', '서울특별시 강남구 테헤란로 1', '경기도 수원시 팔달구 2', '부산광역시 해운대구 3',
+             '제주특별자치도 제주시 4', '충청북도 청주시 상당구 5']
+AMOUNTS = [10000, 25000, 33000, 55000, 120000, 8800]
+
+FOOD_PURPOSES = ['자가품질', '잔류농약(참고용)', '항생물질(참고용)', '수거', '']
+FOOD_SAMPLE_TYPES = ['과자', '음료', '잔류농약(곡류)', '항생물질(우유)', '']
+FOOD_ITEMS = ['대장균', '세균수', '납', '카드뮴', ''] + [f'항목{i}' for i in range(12)]
+ANALYZERS = ['홍길동', '김분석', '이시험', '미지정', '']
+FOOD_CLIENTS = ['가나식품', '다라유업', '마바제과', '사아수산', '']
+
+
+def _date(rng, year):
+    """접수일자 셀 값 (일부는 비어 있음)"""
+    if rng.random() < 0.04:
+        return None
+    return datetime(year, rng.randint(1, 12), rng.randint(1, 28))
+
+
+def excel_rows(year, count=400, seed=None):
+    """연도별 메인 Excel 행 목록 (EXCEL_HEADERS 순서의 셀 값 튜플)
+
+    영업담당은 항상 채운다 - 기준 구현은 빈 영업담당(None)을 그대로 키로 써서 JSON 직렬화에 실패한다.
+    """
+    rng = random.Random(seed if seed is not None else year)
+    rows = []
+    for i in range(count):
+        recv = _date(rng, year)
+        amount = rng.choice(AMOUNTS)
+        rows.append((
+            f'{year}-{i:05d}', recv, recv, rng.choice(SAMPLE_TYPES), rng.choice(CLIENTS), '의뢰인',
+            rng.choice(CLIENTS), rng.choice(MANAGERS), rng.choice(PURPOSES),
+            rng.choice(['식품', '축산', '']), rng.choice(['식품', '축산', '']), '일반',
+            rng.choice(DEFECTS), rng.choice(['', '일반', '긴급', '초긴급']),
+            amount * 1.1, amount, amount // 10,
+            rng.choice(['입금', '미입금', '']), recv if rng.random() < 0.5 else None,
+            rng.choice(ADDRESSES), rng.choice(ADDRESSES),
+        ))
+    return rows
+
+
+def food_item_rows(year, count=500, seed=None):
+    """연도별 food_item Excel 행 목록 (FOOD_ITEM_HEADERS 순서의 셀 값 튜플)"""
+    rng = random.Random(seed if seed is not None else year * 7)
+    rows = []
+    for _ in range(count):
+        recv = _date(rng, year)
+        # 같은 (접수일자, 업체명, 검체유형) 샘플이 여러 항목 행으로 나오게 작은 범위에서 고른다
+        rows.append((
+            recv, recv, rng.choice(FOOD_SAMPLE_TYPES), rng.choice(FOOD_CLIENTS), '의뢰인',
+            rng.choice(ADDRESSES), rng.choice(FOOD_ITEMS), '', '', rng.choice(ANALYZERS), None, None,
+            '', '', '', '', rng.choice(['적합', '부적합', '']), rng.choice(FOOD_PURPOSES),
+            rng.choice(['', '일반', '긴급']), rng.choice([3000, 12000, 25000, 0]),
+            rng.choice(MANAGERS[:-1] + ['']),
+        ))
+    return rows
+
+
+def write_workbook(path, headers, rows):
+    """헤더 + 행을 xlsx 파일로 기록"""
+    from openpyxl import Workbook
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb = Workbook()
+    ws = wb.active
+    ws.append(headers)
+    for row in rows:
+        ws.append(list(row))
+    wb.save(str(path))
+
+
+def write_data_dir(data_dir, years=('2024', '2025')):
+    """data/<연도>/*.xlsx, data/food_item/<연도>/*.xlsx 구조로 픽스처 Excel 기록 (연도마다 파일 2개)"""
+    for year in years:
+        rows = excel_rows(int(year))
+        half = len(rows) // 2
+        write_workbook(data_dir / year / f'{year}_01.xlsx', EXCEL_HEADERS, rows[:half])
+        write_workbook(data_dir / year / f'{year}_02.xlsx', EXCEL_HEADERS, rows[half:])
+        food = food_item_rows(int(year))
+        half = len(food) // 2
+        write_workbook(data_dir / 'food_item' / year / f'{year}_01.xlsx', FOOD_ITEM_HEADERS, food[:half])
+        write_workbook(data_dir / 'food_item' / year / f'{year}_02.xlsx', FOOD_ITEM_HEADERS, food[half:])
+
+
+def normalize_response(body):
+    """/api/data 응답에서 순서가 정해지지 않은 값 정리
+
+    기준 구현은 by_branch managers, by_client testFields/companyTypes를 문자열 set을 list로 바꿔 만든다
+    (순서가 PYTHONHASHSEED에 따라 바뀜).
+    """
+    for _, stats in body.get('by_branch', []):
+        stats['managers'] = sorted(stats['managers'])
+    for _, stats in body.get('by_client', []):
+        stats['testFields'] = sorted(stats['testFields'])
+        stats['companyTypes'] = sorted(stats['companyTypes'])
+    return body
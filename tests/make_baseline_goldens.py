@@ -0,0 +1,67 @@
+"""기준(최적화 이전) 구현의 API 응답을 픽스처 데이터로 기록 - tests/fixtures/baseline_api.json
+
+사용법: python tests/make_baseline_goldens.py <기준 리비전>
+
+기준 리비전의 flask_dashboard.py를 임시 폴더에 꺼내 픽스처 Excel로 (SQLite 없이 Excel 직접 로드 모드)
+BASELINE_QUERIES 응답을 받아 저장한다. test_baseline_regression.py가 현재 구현의 응답과 비교한다.
+"""
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR))
+
+from fixture_data import normalize_response, write_data_dir  # noqa: E402
+
+# 기준 응답을 기록하는 요청 (연도가 둘인 범위 요청은 기준 구현의 연도 순서가 set 순서라 제외)
+BASELINE_QUERIES = [
+    '/api/data?year=2025',
+    '/api/data?year=2024',
+    '/api/data?year=2025&purpose=자가품질',
+    '/api/data?year=2025&month=3',
+    '/api/data?year=2025&month=6&day=14',
+    '/api/data?year=2025&day=7',
+    '/api/food_item?year=2025',
+    '/api/food_item?year=2024',
+    '/api/food_item?year=2025&purpose=잔류농약(참고용)',
+    '/api/food_item?year=2025&sample_type=과자',
+    '/api/food_item?year=2025&item=대장균',
+    '/api/food_item?year=2025&manager=오세중',
+    '/api/food_item?year=2025&purpose=자가품질&sample_type=음료&manager=장동욱',
+]
+GOLDEN_FILE = TESTS_DIR / 'fixtures' / 'baseline_api.json'
+
+
+def main(revision):
+    source = subprocess.run(['git', 'show', f'{revision}:flask_dashboard.py'], cwd=str(TESTS_DIR.parent),
+                            check=True, capture_output=True, text=True).stdout
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / 'data').mkdir()
+        write_data_dir(tmp / 'data')
+        module_path = tmp / 'baseline_dashboard.py'
+        module_path.write_text(source, encoding='utf-8')
+        spec = importlib.util.spec_from_file_location('baseline_dashboard', str(module_path))
+        baseline = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(baseline)
+        baseline.USE_SQLITE = False
+
+        client = baseline.app.test_client()
+        goldens = {}
+        for query in BASELINE_QUERIES:
+            response = client.get(query)
+            assert response.status_code == 200, (query, response.status_code)
+            goldens[query] = normalize_response(response.get_json())
+
+    GOLDEN_FILE.parent.mkdir(exist_ok=True)
+    with open(GOLDEN_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'revision': revision, 'responses': goldens}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    print(f"{GOLDEN_FILE}: {len(goldens)}개 응답 기록")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else 'HEAD')
@@ -0,0 +1,59 @@
+"""numpy group-by(_CubeColumns.aggregate)와 python 실행(run_aggregations)의 결과 동일성
+
+픽스처 DB의 2025년 집계 큐브(SharedTable)와 날짜 필터링된 SharedRow 목록에서
+DASHBOARD_AGGREGATIONS 명세마다, 검사목적 필터 유무/구역별로 비교한다.
+"""
+import pytest
+
+import flask_dashboard
+
+PURPOSES = [None, '자가품질', '수거', '없는목적']
+
+
+def cube_inputs(dashboard):
+    cube = dashboard.load_excel_cube('2025')
+    assert isinstance(cube, dashboard.SharedTable)
+    return {'table': cube, 'month_rows': dashboard.filter_data_by_date(cube, '2025', '6')}
+
+
+def selected_for(purpose):
+    return None if purpose is None else (('purpose',), lambda value: value == purpose)
+
+
+def both_engines(dashboard, data, specs, purpose):
+    args = (specs, dashboard.DASHBOARD_DIMENSIONS, dashboard.DASHBOARD_FLAGS, dashboard.DASHBOARD_MEASURES,
+            selected_for(purpose))
+    assert dashboard._CubeColumns.accepts(data)
+    return dashboard._CubeColumns(data).aggregate(*args), dashboard.run_aggregations(data, *args)
+
+
+@pytest.mark.parametrize('purpose', PURPOSES)
+@pytest.mark.parametrize('source', ['table', 'month_rows'])
+def test_every_spec_matches(dashboard, source, purpose):
+    data = cube_inputs(dashboard)[source]
+    numpy_groups, python_groups = both_engines(dashboard, data, dashboard.DASHBOARD_AGGREGATIONS, purpose)
+    assert sorted(numpy_groups) == sorted(dashboard.DASHBOARD_AGGREGATIONS)
+    for name in dashboard.DASHBOARD_AGGREGATIONS:
+        assert numpy_groups[name] == python_groups[name], name
+
+
+@pytest.mark.parametrize('purpose', [None, '자가품질'])
+@pytest.mark.parametrize('section', sorted(flask_dashboard.DASHBOARD_SECTIONS))
+def test_sections_match(dashboard, section, purpose):
+    data = cube_inputs(dashboard)['table']
+    results = {}
+    for engine in ('python', 'numpy'):
+        dashboard.AGGREGATION_ENGINE = engine
+        results[engine] = dashboard.process_data(data, purpose, section=section)
+    assert results['numpy'] == results['python']
+    assert sorted(results['python']) == sorted(dashboard.DASHBOARD_SECTIONS[section])
+
+
+def test_check_mode_without_numpy_keeps_setting(dashboard, monkeypatch):
+    data = cube_inputs(dashboard)['table']
+    dashboard.AGGREGATION_ENGINE = 'python'
+    expected = dashboard.process_data(data)
+    monkeypatch.setattr(dashboard, 'NUMPY_AVAILABLE', False)
+    dashboard.AGGREGATION_ENGINE = 'check'
+    assert dashboard.process_data(data) == expected
+    assert dashboard.AGGREGATION_ENGINE == 'check'
@@ -0,0 +1,49 @@
+"""/api/data, /api/food_item 응답을 최적화 이전 구현의 기록(fixtures/baseline_api.json)과 비교
+
+기록은 make_baseline_goldens.py로 같은 픽스처 Excel에서 만든다.
+"""
+import json
+
+import pytest
+
+from conftest import TESTS_DIR
+from fixture_data import normalize_response
+
+with open(TESTS_DIR / 'fixtures' / 'baseline_api.json', encoding='utf-8') as _f:
+    GOLDENS = json.load(_f)['responses']
+
+
+def assert_same(actual, expected, path='$'):
+    """JSON 값 비교 (실수는 반올림 오차 허용) - 다른 첫 위치를 알려줌"""
+    if isinstance(expected, float) or isinstance(actual, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-6), path
+    elif isinstance(expected, dict):
+        assert isinstance(actual, dict), path
+        assert sorted(actual) == sorted(expected), path
+        for key in expected:
+            assert_same(actual[key], expected[key], f'{path}.{key}')
+    elif isinstance(expected, list):
+        assert isinstance(actual, list), path
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            assert_same(a, e, f'{path}[{i}]')
+    else:
+        assert actual == expected, path
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+@pytest.mark.parametrize('query', [q for q in GOLDENS if q.startswith('/api/data')])
+def test_dashboard_matches_baseline(dashboard, client, query, engine):
+    dashboard.AGGREGATION_ENGINE = engine
+    response = client.get(query)
+    assert response.status_code == 200
+    assert_same(normalize_response(response.get_json()), GOLDENS[query])
+
+
+@pytest.mark.parametrize('engine', ['python', 'sql'])
+@pytest.mark.parametrize('query', [q for q in GOLDENS if q.startswith('/api/food_item')])
+def test_food_item_matches_baseline(dashboard, client, query, engine):
+    dashboard.FOOD_ITEM_ENGINE = engine
+    response = client.get(query)
+    assert response.status_code == 200
+    assert_same(response.get_json(), GOLDENS[query])
@@ -0,0 +1,42 @@
+"""집계 큐브(셀마다 공급가액을 SQL에서 미리 합산)와 행 단위 집계의 process_data 결과 동일성
+
+공급가액에 원 단위 미만이 있으면 셀 합산 순서가 행 루프와 달라 float 합계가 어긋날 수 있다 -
+금액 합계는 DASHBOARD_MEASURE_DECIMALS 자릿수로 반올림해 두 경로가 같은 값을 낸다.
+"""
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def fractional_dashboard(fresh_dashboard):
+    fd = fresh_dashboard
+    conn = sqlite3.connect(str(fd.SQLITE_DB))
+    columns = ', '.join(f'"{r[1]}"' for r in conn.execute('PRAGMA table_info(excel_data)') if r[1] != 'id')
+    with conn:
+        # 같은 셀에 여러 행이 모이도록 행을 두 번 더 복제 (원본 뒤에 붙어 행 순서와 셀 순서가 달라짐)
+        for _ in range(2):
+            conn.execute(f'INSERT INTO excel_data ({columns}) SELECT {columns} FROM excel_data ORDER BY id')
+        conn.execute('UPDATE excel_data SET 공급가액 = ROUND(공급가액 / 3.0 + (id % 7) * 0.01, 2)')
+        fd._refresh_cube(conn)
+    conn.close()
+    with fd.INGEST_LOCK:
+        fd.update_data_generations()
+    return fd
+
+
+def row_cells(fd, year):
+    """행마다 셀 하나 (건수 1, 그 행의 공급가액) - 큐브 이전의 행 루프와 같은 입력"""
+    return [fd.build_cube_cells([row])[0] for row in fd.load_excel_data(year)]
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy'])
+@pytest.mark.parametrize('purpose', [None, '자가품질'])
+@pytest.mark.parametrize('year', ['2024', '2025'])
+def test_cube_matches_row_based(fractional_dashboard, year, purpose, engine):
+    fd = fractional_dashboard
+    prev_year_clients = {'거래처1', '거래처2'}
+    fd.AGGREGATION_ENGINE = 'python'
+    expected = fd.process_data(row_cells(fd, year), purpose, prev_year_clients)
+    fd.AGGREGATION_ENGINE = engine
+    assert fd.process_data(fd.load_excel_cube(year), purpose, prev_year_clients) == expected
@@ -0,0 +1,78 @@
+"""/api/data/<section> 구역 분할 - 구역 키 합집합이 전체 /api/data 응답과 같고, 화면이 받은 구역의 키만 읽는지"""
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+GOLDENS = Path(__file__).resolve().parent / 'fixtures' / 'baseline_api.json'
+QUERIES = ['year=2025', 'year=2024', 'year=2025&month=3', 'year=2025&purpose=자가품질']
+
+# HTML_TEMPLATE의 탭 → 구역 (TAB_SECTIONS), 구역 없는 탭은 /api/data 대신 다른 API를 쓴다
+TAB_RENDERERS = {
+    'personal': ['updatePersonalTab', 'updateManagerChart', 'updateManagerTable'],
+    'team': ['updateTeamTab', 'updateBranchChart', 'updateBranchTable'],
+    'monthly': ['updateMonthlyTab'],
+    'client': ['updateClientTab'],
+    'region': ['updateRegionTab'],
+    'purpose': ['updatePurposeTab'],
+    'sample_type': ['updateSampleTypeTab'],
+    'defect': ['updateDefectTab'],
+    'summary': ['updateSummary', 'updatePurposeGrid', 'updateDepartmentCards'],
+    None: ['updateFoodItemTab', 'updateCollectionTab'],
+}
+
+
+def section_keys(dashboard):
+    return {key for keys in dashboard.DASHBOARD_SECTIONS.values() for key in keys}
+
+
+def test_sections_cover_every_data_key(dashboard):
+    goldens = json.loads(GOLDENS.read_text(encoding='utf-8'))['responses']
+    baseline_keys = {key for query, body in goldens.items() if query.startswith('/api/data?') for key in body}
+    assert baseline_keys
+    assert section_keys(dashboard) == set(dashboard.DASHBOARD_OUTPUTS) == baseline_keys
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_sections_merge_to_full_payload(dashboard, client, query):
+    full = client.get(f'/api/data?{query}').get_json()
+    assert set(full) == section_keys(dashboard)
+    merged = {}
+    for section, keys in dashboard.DASHBOARD_SECTIONS.items():
+        part = client.get(f'/api/data/{section}?{query}').get_json()
+        assert set(part) == set(keys), section
+        merged.update(part)
+    assert merged == full
+
+
+def template_functions(dashboard):
+    """HTML_TEMPLATE의 JS 함수 이름 → 본문 (다음 함수 정의 전까지)"""
+    source = dashboard.HTML_TEMPLATE
+    starts = [(m.start(), m.group(1)) for m in re.finditer(r'\bfunction\s+(\w+)\s*\(', source)]
+    bodies = {}
+    for (start, name), (end, _) in zip(starts, starts[1:] + [(len(source), None)]):
+        bodies[name] = bodies.get(name, '') + source[start:end]
+    return bodies
+
+
+def data_keys_read(bodies, roots):
+    """roots 함수와 거기서 부르는 함수들이 읽는 currentData/compareData 키"""
+    seen, stack = set(), list(roots)
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        stack.extend(called for called in re.findall(r'\b(\w+)\s*\(', bodies[name]) if called in bodies)
+    return {key for name in seen
+            for key in re.findall(r'\b(?:currentData|compareData)\.(\w+)', bodies[name])} - {'year'}
+
+
+@pytest.mark.parametrize('section', list(TAB_RENDERERS), ids=str)
+def test_tabs_read_only_loaded_sections(dashboard, section):
+    bodies = template_functions(dashboard)
+    loaded = set(dashboard.DASHBOARD_SECTIONS['summary'])
+    if section is not None:
+        loaded |= set(dashboard.DASHBOARD_SECTIONS[section])
+    assert data_keys_read(bodies, TAB_RENDERERS[section]) <= loaded
@@ -0,0 +1,67 @@
+"""filter_data_by_date - SharedTable 날짜 인덱스와 dict 행 순차 비교가 경계 조건에서 같은 행을 원래 순서로 고르는지"""
+import calendar
+import random
+from datetime import date
+
+import pytest
+
+CASES = [
+    # (year, month, day, end_year, end_month, end_day)
+    ('2024', '', '', '', '', ''),
+    ('2024', '2', '', '', '', ''),
+    ('2024', '2', '29', '', '', ''),
+    ('2024', '12', '31', '', '', ''),
+    ('2025', '', '15', '', '', ''),
+    ('2024', '1', '31', '2024', '2', '1'),
+    ('2024', '2', '', '2024', '2', ''),
+    ('2024', '12', '15', '2025', '1', '10'),
+    ('2024', '11', '', '2025', '2', ''),
+    ('2024', '12', '31', '2025', '1', '1'),
+    ('2024', '', '', '2025', '', ''),
+    ('2023', '', '', '2026', '', ''),
+    ('2025', '12', '', '2025', '', ''),
+]
+
+
+@pytest.fixture(scope='module')
+def rows():
+    """2023~2026년 날짜가 섞인 순서로 들어 있는 행 (날짜 없는 행 포함)"""
+    rng = random.Random(5)
+    result = []
+    for position in range(3000):
+        if rng.random() < 0.05:
+            result.append({'recv_year': 0, 'recv_month': 0, 'recv_day': 0, 'position': position})
+            continue
+        year, month = rng.randint(2023, 2026), rng.randint(1, 12)
+        day = rng.randint(1, calendar.monthrange(year, month)[1])
+        result.append({'recv_year': year, 'recv_month': month, 'recv_day': day, 'position': position})
+    return result
+
+
+def expected_positions(rows, year, month, day, end_year, end_month, end_day):
+    """조건을 날짜로 직접 비교한 기준 결과"""
+    year = int(year)
+    if end_year:
+        end_year = int(end_year)
+        start = date(year, int(month or 1), int(day) if month and day else 1)
+        if end_month:
+            last = int(end_day) if end_day else calendar.monthrange(end_year, int(end_month))[1]
+            end = date(end_year, int(end_month), last)
+        else:
+            end = date(end_year, 12, 31)
+        match = lambda d: start <= d <= end
+    elif month:
+        match = lambda d: (d.year, d.month) == (year, int(month)) and (not day or d.day == int(day))
+    else:
+        match = lambda d: d.year == year and (not day or d.day == int(day))
+    return [row['position'] for row in rows
+            if row['recv_year'] and match(date(row['recv_year'], row['recv_month'], row['recv_day']))]
+
+
+@pytest.mark.parametrize('case', CASES, ids=['-'.join(value or '_' for value in case) for case in CASES])
+def test_both_paths_match_date_comparison(dashboard, rows, case):
+    expected = expected_positions(rows, *case)
+    assert expected
+    table = dashboard.SharedTable.from_rows(rows)
+    assert [row['position'] for row in dashboard.filter_data_by_date(table, *case)] == expected
+    assert [row['position'] for row in dashboard.filter_data_by_date(rows, *case)] == expected
@@ -0,0 +1,72 @@
+"""DB 업로드 교체 - 새 스냅샷을 다 읽을 때까지 이전 캐시로 응답하고 세대와 함께 게시"""
+import shutil
+import sqlite3
+
+import pytest
+
+
+def drop_partition(dashboard, db_path, year, source_file):
+    """db_path에서 excel_data 파티션 하나를 지움 (Colab이 파일 하나를 뺀 DB를 올린 경우)"""
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.execute('DELETE FROM excel_data WHERE year = ? AND source_file = ?', (year, source_file))
+        conn.execute("DELETE FROM file_metadata WHERE table_name = 'excel_data' AND source_file = ?", (source_file,))
+        dashboard._refresh_cube(conn, year, source_file)
+    conn.close()
+
+
+@pytest.fixture
+def staged_upload(fresh_dashboard, tmp_path):
+    staging = tmp_path / 'upload.db'
+    shutil.copy(str(fresh_dashboard.SQLITE_DB), str(staging))
+    drop_partition(fresh_dashboard, staging, '2025', '2025_02.xlsx')
+    return staging
+
+
+def test_old_cache_serves_until_snapshot_is_published(fresh_dashboard, staged_upload, monkeypatch):
+    fd = fresh_dashboard
+    client = fd.app.test_client()
+    old_total = client.get('/api/data?year=2025').get_json()['total_count']
+    assert len(fd.load_excel_data('2025')) == 400
+    old_cache = fd.DATA_CACHE
+    old_generations = dict(fd.DATA_GENERATIONS)
+
+    real_snapshot = fd.load_cache_snapshot
+    seen = {}
+
+    def snapshot_while_serving(keys, generations=None):
+        # 새 파일로 스냅샷을 읽는 동안: 세대/캐시는 이전 그대로, 요청도 이전 결과
+        assert fd.DATA_CACHE is old_cache
+        assert fd.DATA_GENERATIONS == old_generations
+        assert generations['2025'] != old_generations['2025']
+        seen['total'] = client.get('/api/data?year=2025').get_json()['total_count']
+        seen['keys'] = set(keys)
+        return real_snapshot(keys, generations)
+
+    monkeypatch.setattr(fd, 'load_cache_snapshot', snapshot_while_serving)
+    fd.publish_uploaded_db(staged_upload)
+
+    assert seen['total'] == old_total
+    assert {'2024', '2025', 'cube_2025'} <= seen['keys']
+    assert fd.DATA_GENERATIONS['2025'] != old_generations['2025']
+    assert len(fd.DATA_CACHE['2025'][1]) == 200
+    assert fd.DATA_CACHE['cube_2025'][0] == fd.DATA_GENERATIONS['2025']
+    assert client.get('/api/data?year=2025').get_json()['total_count'] < old_total
+    assert not staged_upload.exists()
+    assert fd.SQLITE_DB.with_suffix('.db.backup').exists()
+
+
+def test_upload_endpoint_swaps_in_background(fresh_dashboard, staged_upload):
+    fd = fresh_dashboard
+    old_generation = fd.data_generation('2025')
+    client = fd.app.test_client()
+    with open(staged_upload, 'rb') as f:
+        response = client.post('/api/upload-db', data={'file': (f, 'business_data.db')},
+                               headers={'X-API-Key': 'biofl1411-upload-key'})
+    assert response.status_code == 200
+    for thread in fd.threading.enumerate():
+        if thread.name == 'db-upload-publish':
+            thread.join(30)
+    assert fd.data_generation('2025') != old_generation
+    assert len(fd.load_excel_data('2025')) == 200
+    assert not list(fd.SQLITE_DB.parent.glob('*.upload'))
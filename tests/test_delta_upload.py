@@ -0,0 +1,153 @@
+"""부분 업로드 - 매니페스트 비교와 파티션(테이블/연도/원본 파일) 추가/교체/삭제 병합"""
+import gzip
+import io
+import json
+import sqlite3
+
+import pytest
+
+from fixture_data import EXCEL_HEADERS, excel_rows
+
+UPLOAD_KEY = {'X-API-Key': 'biofl1411-upload-key'}
+
+
+def make_delta(fd, path, partitions):
+    """Colab 부분 업로드 DB 생성 - partitions: [(연도, 원본 파일, 행 수, 시드, 내용 해시)] (excel_data)"""
+    fd.init_sqlite_db(path)
+    conn = sqlite3.connect(str(path))
+    with conn:
+        for year, source_file, count, seed, content_hash in partitions:
+            rows = [dict(zip(EXCEL_HEADERS, row)) for row in excel_rows(int(year), count, seed)]
+            records = [fd.excel_row_to_record(year, row, source_file) for row in rows]
+            conn.executemany(fd.EXCEL_DATA_INSERT_SQL, records)
+            conn.execute('''
+                INSERT INTO file_metadata (file_path, mtime, row_count, table_name, year, source_file, size, content_hash)
+                VALUES (?, 0, ?, 'excel_data', ?, ?, 0, ?)
+            ''', (f'/content/drive/{year}/{source_file}', count, year, source_file, content_hash))
+    conn.close()
+    return path
+
+
+def server_state(fd, year='2025'):
+    """(파티션별 행 수, 큐브 건수 합계, 파티션 메타데이터) - 병합 전후 비교용"""
+    conn = sqlite3.connect(str(fd.SQLITE_DB))
+    try:
+        counts = dict(conn.execute('SELECT source_file, COUNT(*) FROM excel_data WHERE year = ? GROUP BY source_file',
+                                   (year,)).fetchall())
+        cube_total = conn.execute('SELECT TOTAL(row_count) FROM excel_cube WHERE year = ?', (year,)).fetchone()[0]
+        metadata = conn.execute('''
+            SELECT file_path, row_count, content_hash FROM file_metadata
+            WHERE table_name = 'excel_data' AND year = ? ORDER BY file_path
+        ''', (year,)).fetchall()
+    finally:
+        conn.close()
+    return counts, int(cube_total), metadata
+
+
+def receipt_numbers(fd, source_file):
+    conn = sqlite3.connect(str(fd.SQLITE_DB))
+    try:
+        return [r[0] for r in conn.execute('SELECT 접수번호 FROM excel_data WHERE source_file = ? ORDER BY id',
+                                           (source_file,))]
+    finally:
+        conn.close()
+
+
+def test_merge_adds_partition(fresh_dashboard, tmp_path):
+    fd = fresh_dashboard
+    delta = make_delta(fd, tmp_path / 'delta.db', [('2025', 'colab_03.xlsx', 50, 31, 'hash-a')])
+    with fd.INGEST_LOCK:
+        assert fd.merge_delta_db(delta, []) == [('excel_data', '2025')]
+    counts, cube_total, metadata = server_state(fd)
+    assert counts['colab_03.xlsx'] == 50
+    assert cube_total == sum(counts.values()) == 450
+    assert ('upload:excel_data/2025/colab_03.xlsx', 50, 'hash-a') in metadata
+    assert receipt_numbers(fd, 'colab_03.xlsx') == [row[0] for row in excel_rows(2025, 50, 31)]
+
+
+def test_merge_replaces_partition(fresh_dashboard, tmp_path):
+    fd = fresh_dashboard
+    with fd.INGEST_LOCK:
+        fd.merge_delta_db(make_delta(fd, tmp_path / 'a.db', [('2025', 'colab_03.xlsx', 50, 31, 'hash-a')]), [])
+        before_local = {k: v for k, v in server_state(fd)[0].items() if k != 'colab_03.xlsx'}
+        fd.merge_delta_db(make_delta(fd, tmp_path / 'b.db', [('2025', 'colab_03.xlsx', 30, 32, 'hash-b')]), [])
+    counts, cube_total, metadata = server_state(fd)
+    assert counts.pop('colab_03.xlsx') == 30
+    assert counts == before_local
+    assert cube_total == 430
+    assert ('upload:excel_data/2025/colab_03.xlsx', 30, 'hash-b') in metadata
+    assert receipt_numbers(fd, 'colab_03.xlsx') == [row[0] for row in excel_rows(2025, 30, 32)]
+
+
+def test_merge_removes_partition(fresh_dashboard, tmp_path):
+    fd = fresh_dashboard
+    before = server_state(fd)
+    with fd.INGEST_LOCK:
+        fd.merge_delta_db(make_delta(fd, tmp_path / 'a.db', [('2025', 'colab_03.xlsx', 50, 31, 'hash-a')]), [])
+        changed = fd.merge_delta_db(make_delta(fd, tmp_path / 'empty.db', []),
+                                    [{'table': 'excel_data', 'year': 2025, 'source_file': 'colab_03.xlsx'}])
+    assert changed == [('excel_data', '2025')]
+    assert server_state(fd) == before
+
+
+def test_merge_is_one_transaction(fresh_dashboard, tmp_path, monkeypatch):
+    fd = fresh_dashboard
+    before = server_state(fd)
+    delta = make_delta(fd, tmp_path / 'delta.db', [('2025', 'colab_03.xlsx', 50, 31, 'hash-a'),
+                                                  ('2025', 'colab_04.xlsx', 20, 41, 'hash-c')])
+    real_refresh = fd._refresh_cube
+    calls = []
+
+    def failing_refresh(conn, year=None, source_file=None):
+        calls.append(source_file)
+        if len(calls) == 2:
+            raise sqlite3.OperationalError('병합 중 실패')
+        return real_refresh(conn, year, source_file)
+
+    monkeypatch.setattr(fd, '_refresh_cube', failing_refresh)
+    with fd.INGEST_LOCK, pytest.raises(sqlite3.OperationalError):
+        fd.merge_delta_db(delta, [{'table': 'excel_data', 'year': '2025', 'source_file': '2025_01.xlsx'}])
+    assert server_state(fd) == before
+
+
+def test_delta_endpoint_merges_under_ingest_lock(fresh_dashboard, tmp_path, monkeypatch):
+    fd = fresh_dashboard
+    old_generation = fd.data_generation('2025')
+    delta = make_delta(fd, tmp_path / 'delta.db', [('2025', 'colab_03.xlsx', 50, 31, 'hash-a')])
+    real_merge = fd.merge_delta_db
+    lock_held = []
+
+    def merge_checking_lock(delta_path, removed):
+        lock_held.append(fd.INGEST_LOCK.locked())
+        return real_merge(delta_path, removed)
+
+    monkeypatch.setattr(fd, 'merge_delta_db', merge_checking_lock)
+    body = io.BytesIO(gzip.compress(delta.read_bytes()))
+    response = fd.app.test_client().post('/api/upload-db/delta', headers=UPLOAD_KEY, data={
+        'file': (body, 'delta.db.gz'), 'removed': json.dumps([])})
+    assert response.status_code == 200
+    assert response.get_json()['changed'] == [{'table': 'excel_data', 'year': '2025'}]
+    assert lock_held == [True]
+    assert fd.data_generation('2025') != old_generation
+    assert len(fd.load_excel_data('2025')) == 450
+
+
+def test_manifest_endpoint(fresh_dashboard, tmp_path):
+    fd = fresh_dashboard
+    with fd.INGEST_LOCK:
+        fd.merge_delta_db(make_delta(fd, tmp_path / 'a.db', [('2025', 'colab_03.xlsx', 50, 31, 'hash-a'),
+                                                           ('2025', 'colab_04.xlsx', 20, 41, 'hash-c')]), [])
+    local = {(p['table'], p['year'], p['source_file']): p for p in fd.get_partition_manifest()}
+    partitions = [
+        {'table': 'excel_data', 'year': '2025', 'source_file': '2025_01.xlsx',
+         'content_hash': local['excel_data', '2025', '2025_01.xlsx']['content_hash']},
+        {'table': 'excel_data', 'year': '2025', 'source_file': 'colab_03.xlsx', 'content_hash': 'hash-new'},
+        {'table': 'excel_data', 'year': '2025', 'source_file': 'colab_05.xlsx', 'content_hash': 'hash-d'},
+    ]
+    response = fd.app.test_client().post('/api/upload-db/manifest', headers=UPLOAD_KEY,
+                                         json={'years': ['2025'], 'partitions': partitions})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['changed'] == [{'table': 'excel_data', 'year': '2025', 'source_file': 'colab_03.xlsx'},
+                               {'table': 'excel_data', 'year': '2025', 'source_file': 'colab_05.xlsx'}]
+    assert body['removed'] == [{'table': 'excel_data', 'year': '2025', 'source_file': 'colab_04.xlsx'}]
@@ -0,0 +1,23 @@
+"""/api/food_item SQL 집계(process_food_item_data_sqlite)와 python 집계(process_food_item_data)의 결과 동일성"""
+import itertools
+
+import pytest
+
+PURPOSES = [None, '자가품질', '잔류농약(참고용)', '없는목적']
+SAMPLE_TYPES = [None, '과자', '잔류농약(곡류)']
+ITEMS = [None, '대장균', '항목3']
+MANAGERS = [None, '오세중', '미지정']
+
+
+@pytest.mark.parametrize('year', ['2024', '2025'])
+def test_sql_matches_python_for_every_filter_combination(dashboard, year):
+    rows = dashboard.load_food_item_data(year)
+    for purpose, sample_type, item, manager in itertools.product(PURPOSES, SAMPLE_TYPES, ITEMS, MANAGERS):
+        filters = {'purpose_filter': purpose, 'sample_type_filter': sample_type,
+                   'item_filter': item, 'manager_filter': manager}
+        expected = dashboard.process_food_item_data(rows, **filters)
+        assert dashboard.process_food_item_data_sqlite(year, **filters) == expected, filters
+
+
+def test_sql_for_year_without_rows(dashboard):
+    assert dashboard.process_food_item_data_sqlite('2023') == dashboard.process_food_item_data([])
@@ -0,0 +1,43 @@
+"""Excel → SQLite 변환 - 워크북 병렬 파싱(spawn 프로세스 풀), 파일 메타데이터 갱신"""
+import os
+import sqlite3
+
+
+def parsed(fd, jobs, workers):
+    results = []
+    for f, chunks, error in fd._parse_workbooks(jobs, workers):
+        assert error is None
+        results.append((f.name, [record for chunk in chunks for record in chunk]))
+    return results
+
+
+def test_parallel_parse_matches_sequential(dashboard):
+    jobs = [(f, table, f.name[:4]) for table, folder in (('excel_data', ''), ('food_item_data', 'food_item'))
+            for f in sorted((dashboard.DATA_DIR / folder).glob('*/*.xlsx'))]
+    assert len(jobs) == 8
+    assert parsed(dashboard, jobs, 2) == parsed(dashboard, jobs, 1)
+
+
+def file_metadata(fd, f):
+    conn = sqlite3.connect(str(fd.SQLITE_DB))
+    try:
+        return conn.execute('SELECT mtime, size, content_hash FROM file_metadata WHERE file_path = ?',
+                            (str(f),)).fetchone()
+    finally:
+        conn.close()
+
+
+def test_touched_file_refreshes_metadata_only_under_convert(fresh_dashboard):
+    fd = fresh_dashboard
+    f = fd.DATA_DIR / '2025' / '2025_01.xlsx'
+    before = file_metadata(fd, f)
+    os.utime(f, (before[0] + 60, before[0] + 60))
+
+    # 확인 경로는 DB를 바꾸지 않고 갱신이 필요하다고만 알림
+    assert fd.check_sqlite_needs_update()
+    assert file_metadata(fd, f) == before
+
+    with fd.INGEST_LOCK:
+        assert fd.convert_excel_to_sqlite() == []
+    assert file_metadata(fd, f) == (before[0] + 60, before[1], before[2])
+    assert not fd.check_sqlite_needs_update()
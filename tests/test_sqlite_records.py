@@ -0,0 +1,156 @@
+"""Excel 행 → 정규화 레코드 변환과 구 스키마(raw_data JSON) DB 변환
+
+구 구현은 Excel 행 dict를 json.dumps(default=str)로 raw_data에 저장하고 json.loads로 다시 읽었다.
+같은 행을 타입 컬럼 레코드로 저장해도 그 JSON 행과 같은 값이 나와야 한다.
+"""
+import json
+import sqlite3
+from datetime import date, datetime
+
+import pytest
+
+from conftest import point_at, reset_caches
+from fixture_data import EXCEL_HEADERS, excel_rows
+
+
+def json_row(row_dict):
+    """구 구현의 raw_data 저장/로드를 거친 행"""
+    return json.loads(json.dumps(row_dict, ensure_ascii=False, default=str))
+
+
+def fixture_dicts(year=2025, count=200):
+    return [dict(zip(EXCEL_HEADERS, row)) for row in excel_rows(year, count)]
+
+
+@pytest.mark.parametrize('value, expected', [
+    (datetime(2025, 3, 4, 15, 30), 20250304),
+    (date(2024, 12, 31), 20241231),
+    ('2025-03-04 00:00:00', 20250304),
+    ('2025-03-04', 20250304),
+    ('2025/3/4', 20250304),
+    ('2025.03.04', 20250304),
+    ('20250304', 20250304),
+    (' 2025-03-04 ', 20250304),
+    ('2025-02-30', None),
+    ('미정', None),
+    ('', None),
+    (None, None),
+])
+def test_to_date_int(dashboard, value, expected):
+    assert dashboard._to_date_int(value) == expected
+
+
+@pytest.mark.parametrize('value, expected', [
+    (55000, 55000.0),
+    (60500.00000000001, 60500.00000000001),
+    ('1,000', 1000.0),
+    ('12,500원', 12500.0),
+    ('', 0.0),
+    (None, 0.0),
+    ('없음', 0.0),
+])
+def test_to_amount(dashboard, value, expected):
+    assert dashboard._to_amount(value) == expected
+
+
+def test_date_and_amount_round_trip_json_rows(dashboard):
+    for row_dict in fixture_dicts():
+        old = json_row(row_dict)
+        for name in dashboard.EXCEL_DATE_COLUMNS:
+            value = row_dict.get(name)
+            date_int = dashboard._to_date_int(old.get(name))
+            assert date_int == dashboard._to_date_int(value)
+            assert dashboard._date_from_int(date_int) == (value.date() if value else None)
+        for name in dashboard.EXCEL_AMOUNT_COLUMNS:
+            assert dashboard._to_amount(old.get(name)) == float(row_dict.get(name) or 0)
+
+
+def test_excel_row_to_record_matches_json_rows(dashboard):
+    for row_dict in fixture_dicts():
+        old = json_row(row_dict)
+        record = dashboard.excel_row_to_record('2025', row_dict, 'a.xlsx')
+        assert record == dashboard.excel_row_to_record('2025', old, 'a.xlsx')
+        row = dict(zip(dashboard.EXCEL_DATA_COLUMN_NAMES, record[2:]))
+        recv = row_dict['접수일자']
+        assert (row['recv_year'], row['recv_month'], row['recv_day']) == (
+            (recv.year, recv.month, recv.day) if recv else (0, 0, 0))
+        for name in EXCEL_HEADERS:
+            value = old[name]
+            if name in dashboard.EXCEL_DATE_COLUMNS or name in dashboard.EXCEL_AMOUNT_COLUMNS:
+                continue
+            assert row[name] == ('' if value is None else str(value).strip()), name
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch, dashboard):
+    """구 구현 스키마(raw_data JSON)의 2025년 excel_data DB"""
+    for name in ('DATA_DIR', 'SQLITE_DB', 'CACHE_FILE', 'SHARED_DATA_DIR'):
+        monkeypatch.setattr(dashboard, name, getattr(dashboard, name))
+    point_at(tmp_path)
+    reset_caches()
+    rows = fixture_dicts()
+    conn = sqlite3.connect(str(dashboard.SQLITE_DB))
+    conn.execute('''
+        CREATE TABLE excel_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, year TEXT, 접수번호 TEXT, 접수일자 TEXT, 발행일 TEXT,
+            검체유형 TEXT, 업체명 TEXT, 의뢰인명 TEXT, 업체주소 TEXT, 영업담당 TEXT, 검사목적 TEXT, 총금액 REAL,
+            시험분야 TEXT, 입금일 TEXT, 입금여부 TEXT, 검사구분 TEXT, 입금구분 TEXT, 업체분류 TEXT, raw_data TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE food_item_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, year TEXT, 접수일자 TEXT, 발행일 TEXT, 검체유형 TEXT, 업체명 TEXT,
+            의뢰인명 TEXT, 업체주소 TEXT, 항목명 TEXT, 규격 TEXT, 항목담당 TEXT, 결과입력자 TEXT, 입력일 TEXT,
+            분석일 TEXT, 항목단위 TEXT, 시험결과 TEXT, 시험치 TEXT, 성적서결과 TEXT, 판정 TEXT, 검사목적 TEXT,
+            긴급여부 TEXT, 항목수수료 REAL, 영업담당 TEXT
+        )
+    ''')
+    conn.executemany('INSERT INTO excel_data (year, 접수번호, 접수일자, 영업담당, raw_data) VALUES (?, ?, ?, ?, ?)',
+                     [('2025', str(r['접수번호']), str(r['접수일자']), str(r['영업담당']),
+                       json.dumps(r, ensure_ascii=False, default=str)) for r in rows])
+    conn.commit()
+    conn.close()
+    return rows
+
+
+def test_loaders_reject_legacy_schema_without_migrating(dashboard, legacy_db):
+    for loader in (dashboard.load_excel_data_sqlite, dashboard.load_excel_cube_sqlite,
+                   dashboard.load_food_item_data_sqlite):
+        with pytest.raises(sqlite3.DatabaseError):
+            loader('2025')
+    with pytest.raises(sqlite3.DatabaseError):
+        dashboard.process_food_item_data_sqlite('2025')
+    conn = sqlite3.connect(str(dashboard.SQLITE_DB))
+    columns = [col[1] for col in conn.execute('PRAGMA table_info(excel_data)')]
+    conn.close()
+    assert 'raw_data' in columns
+
+
+def test_startup_migration_matches_json_rows(dashboard, legacy_db):
+    with dashboard.INGEST_LOCK:
+        assert dashboard.migrate_sqlite_schema()
+        assert not dashboard.migrate_sqlite_schema()
+    loaded = dashboard.load_excel_data_sqlite('2025')
+    expected = [dashboard.canonicalize_excel_row(json_row(r)) for r in legacy_db]
+    assert loaded == expected
+    assert sum(cell['row_count'] for cell in dashboard.load_excel_cube_sqlite('2025')) == len(legacy_db)
+
+
+@pytest.mark.parametrize('value, expected', [(None, ''), ('  ', ''), (' 오세중 ', '오세중'), ('미지정', '미지정')])
+def test_manager_is_stored_as_given(dashboard, value, expected):
+    excel = dict(zip(dashboard.EXCEL_DATA_COLUMN_NAMES, dashboard.excel_row_to_record('2025', {'영업담당': value})[2:]))
+    food = dict(zip(dashboard.FOOD_ITEM_COLUMN_NAMES, dashboard.food_item_row_to_record('2025', {'영업담당': value})[2:]))
+    assert excel['영업담당'] == food['영업담당'] == expected
+
+
+@pytest.mark.parametrize('engine', ['python', 'sql'])
+def test_food_item_counts_blank_managers_as_unassigned(dashboard, engine):
+    rows = dashboard.load_food_item_data('2025')
+    blank_fee = sum(row['항목수수료'] for row in rows if row['영업담당'] == '')
+    unassigned_fee = sum(row['항목수수료'] for row in rows if row['영업담당'] in ('', '미지정'))
+    assert blank_fee and unassigned_fee > blank_fee
+    if engine == 'sql':
+        result = dashboard.process_food_item_data_sqlite('2025', manager_filter='미지정')
+    else:
+        result = dashboard.process_food_item_data(rows, manager_filter='미지정')
+    assert result['total_fee'] == pytest.approx(unassigned_fee)